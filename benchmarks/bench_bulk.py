@@ -0,0 +1,57 @@
+"""Compare per-call add_node/add_edge with add_nodes_from/add_edges_from.
+
+Usage: python benchmarks/bench_bulk.py [num_nodes] [edges_per_node]
+"""
+
+import random
+import sys
+import time
+
+from llb_doc import create_graph
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = random.Random(0)
+    node_ids = [f"n{i}" for i in range(num_nodes)]
+    pairs = [
+        (node_ids[rng.randrange(num_nodes)], node_ids[rng.randrange(num_nodes)])
+        for _ in range(num_nodes * degree)
+    ]
+    print(f"{num_nodes} nodes, {len(pairs)} edges")
+
+    g = create_graph()
+    start = time.perf_counter()
+    for id_ in node_ids:
+        g.add_node("entity", "text", id_=id_, kind="x")
+    for a, b in pairs:
+        g.add_edge(a, b, "rel")
+    per_call = time.perf_counter() - start
+    print(f"per-call:        {per_call:6.2f}s")
+
+    g = create_graph()
+    start = time.perf_counter()
+    g.add_nodes_from((id_, "entity", "text", {"kind": "x"}) for id_ in node_ids)
+    g.add_edges_from((a, b, "rel") for a, b in pairs)
+    rows = time.perf_counter() - start
+    print(f"bulk (tuples):   {rows:6.2f}s  ({per_call / rows:4.1f}x)")
+
+    g = create_graph()
+    start = time.perf_counter()
+    g.add_nodes_from(
+        {"id": node_ids, "type": ["entity"] * num_nodes, "content": ["text"] * num_nodes}
+    )
+    g.add_edges_from(
+        {
+            "from_id": [a for a, _ in pairs],
+            "to_id": [b for _, b in pairs],
+            "rel": ["rel"] * len(pairs),
+        }
+    )
+    columns = time.perf_counter() - start
+    print(f"bulk (columns):  {columns:6.2f}s  ({per_call / columns:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare deduplicated edge ingestion against a scan of existing edges.
+
+Half of the incoming (from_id, to_id, rel) triples already exist. The scan
+baseline checks get_edges_from() before each add, as callers had to before
+has_edge()/on_duplicate; the indexed runs use on_duplicate="skip".
+
+Usage: python benchmarks/bench_dedup.py [num_nodes] [num_edges]
+"""
+
+import random
+import sys
+import time
+
+from llb_doc import create_graph
+
+
+def build(num_nodes: int):
+    g = create_graph()
+    g.add_nodes_from((f"n{i}", "entity") for i in range(num_nodes))
+    return g
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    num_edges = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    rng = random.Random(0)
+    rels = ["owns", "cites", "blocks"]
+    triples = [
+        (f"n{rng.randrange(num_nodes)}", f"n{rng.randrange(num_nodes)}", rng.choice(rels))
+        for _ in range(num_edges // 2)
+    ]
+    triples += rng.sample(triples, len(triples))
+
+    def scan(g):
+        for a, b, rel in triples:
+            if not any(e.to_id == b and e.rel == rel for e in g.get_edges_from(a)):
+                g.add_edge(a, b, rel)
+
+    def per_call(g):
+        for a, b, rel in triples:
+            g.add_edge(a, b, rel, on_duplicate="skip")
+
+    def bulk(g):
+        g.add_edges_from(triples, on_duplicate="skip")
+
+    print(f"{num_nodes} nodes, {len(triples)} upserts")
+    counts = set()
+    for label, fn in (
+        ("scan get_edges_from", scan),
+        ("add_edge(skip)", per_call),
+        ("add_edges_from(skip)", bulk),
+    ):
+        g = build(num_nodes)
+        start = time.perf_counter()
+        fn(g)
+        elapsed = time.perf_counter() - start
+        counts.add(len(g.edges))
+        print(f"{label:22s} {elapsed * 1e3:8.1f} ms  {len(triples) / elapsed / 1e3:8.1f}k/s")
+    assert len(counts) == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare GraphDocument and FrozenGraph memory use and BFS speed.
+
+Usage: python benchmarks/bench_freeze.py [num_nodes] [avg_degree]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from llb_doc import create_graph
+
+
+def build(num_nodes: int, degree: int):
+    rng = random.Random(0)
+    g = create_graph()
+    for i in range(num_nodes):
+        g.add_node("entity", f"node {i}", id_=f"n{i}")
+    for _ in range(num_nodes * degree):
+        a, b = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        g.add_edge(f"n{a}", f"n{b}", rng.choice(("rel_a", "rel_b", "rel_c")))
+    return g
+
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    num_edges = num_nodes * degree
+
+    tracemalloc.start()
+    g = build(num_nodes, degree)
+    graph_bytes = tracemalloc.get_traced_memory()[0]
+    f = g.freeze()
+    frozen_bytes = tracemalloc.get_traced_memory()[0] - graph_bytes
+    tracemalloc.stop()
+
+    print(f"nodes={num_nodes} edges={num_edges}")
+    print(f"GraphDocument: {graph_bytes / num_edges:8.1f} bytes/edge (incl. nodes)")
+    print(f"FrozenGraph:   {frozen_bytes / num_edges:8.1f} bytes/edge (incl. nodes)")
+
+    rng = random.Random(1)
+    focuses = [f"n{rng.randrange(num_nodes)}" for _ in range(200)]
+    for name, doc in (("GraphDocument", g), ("FrozenGraph", f)):
+        start = time.perf_counter()
+        for focus in focuses:
+            doc._compute_tiers(focus, 2)
+        bfs = time.perf_counter() - start
+        print(f"{name}: radius-2 BFS {bfs / len(focuses) * 1e3:.3f} ms/focus")
+
+
+if __name__ == "__main__":
+    main()
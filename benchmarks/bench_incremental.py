@@ -0,0 +1,48 @@
+"""Agent-loop rendering: full render() vs IncrementalRenderer per turn.
+
+Each turn appends a few message blocks, updates the suffix and renders
+the whole conversation.
+
+Usage: python benchmarks/bench_incremental.py [blocks] [blocks_per_turn]
+"""
+
+import sys
+import time
+
+from llb_doc import MetaRefreshMode, create_llb
+
+
+def run(blocks: int, per_turn: int, incremental: bool, refresh: MetaRefreshMode) -> tuple[float, str]:
+    doc = create_llb()
+    doc.prefix = "# Conversation"
+    render = doc.incremental().render if incremental else doc.render
+    elapsed = 0.0
+    text = ""
+    for turn in range(blocks // per_turn):
+        for k in range(per_turn):
+            doc.add_block("msg", f"message {turn}.{k} " * 10, role="user" if k % 2 else "agent")
+        doc.suffix = f"Turn {turn}: answer the last message."
+        start = time.perf_counter()
+        text = render(meta_refresh=refresh)
+        elapsed += time.perf_counter() - start
+    return elapsed, text
+
+
+def main() -> None:
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    per_turn = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    turns = blocks // per_turn
+    print(f"blocks={blocks} turns={turns}")
+    for refresh in (MetaRefreshMode.NONE, MetaRefreshMode.NORMAL):
+        full, expected = run(blocks, per_turn, False, refresh)
+        inc, text = run(blocks, per_turn, True, refresh)
+        assert text == expected
+        print(
+            f"meta_refresh={refresh.name:<6}  render(): {full:7.2f} s total"
+            f" ({full / turns * 1e3:6.2f} ms/turn)   incremental: {inc:6.3f} s total"
+            f" ({inc / turns * 1e3:6.3f} ms/turn)   {full / inc:5.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare peak memory and time of parse_llb and iter_parse on a large file.
+
+Usage: python benchmarks/bench_iter_parse.py [num_blocks] [content_lines]
+"""
+
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from llb_doc import create_llb, iter_parse, parse_llb
+
+
+def measure(label: str, fn) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:30s} peak {peak / 2**20:8.1f} MiB  {elapsed * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    content_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(0)
+    doc = create_llb()
+    doc.prefix = "# Archive"
+    for i in range(num_blocks):
+        body = "\n".join(f"line {j} {rng.random():.6f}" for j in range(content_lines))
+        doc.add_block("record", body, lang="txt", source="archive", seq=str(i))
+    fd, path = tempfile.mkstemp(suffix=".llb")
+    os.close(fd)
+    try:
+        with open(path, "w", encoding="utf-8") as fp:
+            size = doc.render_to(fp)
+        del doc
+        print(f"{num_blocks} blocks, {size / 2**20:.1f} MiB file")
+
+        def read_and_parse():
+            with open(path, encoding="utf-8") as fp:
+                return parse_llb(fp.read())
+
+        def count_blocks():
+            return sum(1 for _ in iter_parse(path))
+
+        measure("parse_llb(read())", read_and_parse)
+        measure("iter_parse(path).to_document()", lambda: iter_parse(path).to_document())
+        measure("iterate iter_parse(path)", count_blocks)
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare eager and lazy parse_llb when only a few blocks are read.
+
+Usage: python benchmarks/bench_lazy.py [num_blocks] [content_lines] [reads]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from llb_doc import create_llb, parse_llb
+
+
+def measure(label: str, fn) -> None:
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:36s} {size / 2**20:8.1f} MiB  {elapsed * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    content_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    reads = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    rng = random.Random(0)
+    doc = create_llb()
+    for i in range(num_blocks):
+        body = "\n".join(f"line {j} {rng.random():.6f}" for j in range(content_lines))
+        doc.add_block("record", body, lang="txt", source="archive", seq=str(i))
+    text = doc.render()
+    wanted = rng.sample([block.id for block in doc], reads)
+    del doc
+    print(f"{num_blocks} blocks, {len(text) / 2**20:.1f} MiB text, {reads} reads")
+
+    def read(lazy):
+        def run():
+            doc = parse_llb(text, lazy=lazy)
+            for id_ in wanted:
+                block = doc.get_block(id_)
+                block.content, block.meta
+            return doc
+
+        return run
+
+    measure("parse_llb + reads", read(False))
+    measure("parse_llb(lazy=True) + reads", read(True))
+    measure("parse_llb + render", lambda: parse_llb(text).render())
+    measure("parse_llb(lazy=True) + render", lambda: parse_llb(text, lazy=True).render())
+
+
+if __name__ == "__main__":
+    main()
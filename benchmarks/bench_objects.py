@@ -0,0 +1,77 @@
+"""Measure per-object memory and construction throughput of nodes and edges.
+
+Bytes are the tracemalloc growth per object, including its indexes in the
+graph (node index, edge index, sequence and adjacency entries).
+
+Usage: python benchmarks/bench_objects.py [num_nodes] [edges_per_node]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from llb_doc import create_graph
+
+
+def measure(label: str, count: int, fn) -> None:
+    gc.collect()
+    start = time.perf_counter()
+    keep = fn()
+    elapsed = time.perf_counter() - start
+    del keep
+    gc.collect()
+    tracemalloc.start()
+    keep = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    print(
+        f"{label:26s} {size / count:7.1f} B/obj  "
+        f"{count / elapsed / 1e3:8.1f}k obj/s"
+    )
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = random.Random(0)
+    node_ids = [f"n{i}" for i in range(num_nodes)]
+    pairs = [
+        (node_ids[rng.randrange(num_nodes)], node_ids[rng.randrange(num_nodes)])
+        for _ in range(num_nodes * degree)
+    ]
+
+    def nodes():
+        g = create_graph()
+        for id_ in node_ids:
+            g.add_node("entity", "text", id_=id_)
+        return g
+
+    def nodes_with_meta():
+        g = create_graph()
+        for id_ in node_ids:
+            g.add_node("entity", "text", id_=id_, kind="x")
+        return g
+
+    def edges():
+        g = create_graph()
+        for a, b in pairs:
+            g.add_edge(a, b, "rel")
+        return g
+
+    def bulk_edges():
+        g = create_graph()
+        g.add_edges_from((a, b, "rel") for a, b in pairs)
+        return g
+
+    print(f"{num_nodes} nodes, {len(pairs)} edges")
+    measure("add_node", num_nodes, nodes)
+    measure("add_node (1 meta key)", num_nodes, nodes_with_meta)
+    measure("add_edge", len(pairs), edges)
+    measure("add_edges_from", len(pairs), bulk_edges)
+
+
+if __name__ == "__main__":
+    main()
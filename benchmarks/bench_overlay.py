@@ -0,0 +1,63 @@
+"""Per-request ephemeral nodes: deep copy vs overlay over a shared graph.
+
+Each request adds a question node, a few snippet nodes and edges into the
+base graph, renders around the question and is thrown away.
+
+Usage: python benchmarks/bench_overlay.py [num_nodes] [avg_degree] [requests]
+"""
+
+import copy
+import random
+import sys
+import time
+
+from llb_doc import create_graph
+
+
+def build(num_nodes: int, degree: int):
+    rng = random.Random(0)
+    g = create_graph()
+    g.add_nodes_from((f"n{i}", "entity", f"node {i}") for i in range(num_nodes))
+    g.add_edges_from(
+        (f"n{rng.randrange(num_nodes)}", f"n{rng.randrange(num_nodes)}", "rel")
+        for _ in range(num_nodes * degree)
+    )
+    return g
+
+
+def request(doc, rng: random.Random, num_nodes: int) -> str:
+    doc.add_node("question", "How does X relate to Y?", id_="q")
+    for k in range(3):
+        doc.add_node("snippet", f"retrieved text {k}", id_=f"s{k}")
+        doc.add_edge("q", f"s{k}", "retrieved")
+        doc.add_edge(f"s{k}", f"n{rng.randrange(num_nodes)}", "mentions")
+    return doc.render(focus="q", radius=2)
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    g = build(num_nodes, degree)
+    f = g.freeze()
+    print(f"nodes={num_nodes} edges={num_nodes * degree}")
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(3):
+        request(copy.deepcopy(g), rng, num_nodes)
+    deep = (time.perf_counter() - start) / 3
+    print(f"deepcopy + render:        {deep * 1e3:9.2f} ms/request")
+
+    for name, base in (("GraphDocument", g), ("FrozenGraph", f)):
+        rng = random.Random(1)
+        start = time.perf_counter()
+        for _ in range(requests):
+            with base.overlay() as ov:
+                request(ov, rng, num_nodes)
+        elapsed = (time.perf_counter() - start) / requests
+        print(f"overlay ({name}): {elapsed * 1e3:9.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
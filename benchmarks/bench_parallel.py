@@ -0,0 +1,68 @@
+"""Compare parse_llb with parse_llb_parallel and parse_many on large inputs.
+
+Usage: python benchmarks/bench_parallel.py [num_blocks] [content_lines] [workers]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from llb_doc import create_llb, parse_llb, parse_llb_parallel, parse_many
+
+
+def timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    del result
+    print(f"{label:34s} {elapsed * 1e3:9.1f} ms")
+    return elapsed
+
+
+def main() -> None:
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    content_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    rng = random.Random(0)
+    doc = create_llb()
+    for i in range(num_blocks):
+        body = "\n".join(f"line {j} {rng.random():.6f}" for j in range(content_lines))
+        doc.add_block("record", body, lang="txt", source="archive", seq=str(i))
+    text = doc.render()
+    del doc
+    print(f"{num_blocks} blocks, {len(text) / 2**20:.1f} MiB, {workers} workers")
+
+    serial = timed("parse_llb", lambda: parse_llb(text))
+    parallel = timed(
+        "parse_llb_parallel", lambda: parse_llb_parallel(text, workers=workers)
+    )
+    print(f"  speedup {serial / parallel:.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        step = max(1, num_blocks // 100)
+        blocks = text.split("\n\n@block ")
+        paths = []
+        for n, at in enumerate(range(0, len(blocks), step)):
+            path = os.path.join(tmp, f"doc{n}.llb")
+            with open(path, "w", encoding="utf-8") as fp:
+                part = "\n\n@block ".join(blocks[at : at + step])
+                fp.write(part if at == 0 else "@block " + part)
+            paths.append(path)
+
+        def read_all():
+            docs = []
+            for path in paths:
+                with open(path, encoding="utf-8") as fp:
+                    docs.append(parse_llb(fp.read()))
+            return docs
+
+        print(f"{len(paths)} files")
+        serial = timed("parse_llb per file", read_all)
+        batch = timed("parse_many", lambda: list(parse_many(paths, workers=workers)))
+        print(f"  speedup {serial / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
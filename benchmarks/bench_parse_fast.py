@@ -0,0 +1,51 @@
+"""Compare parse_llb's offset-based fast path with the line-based parser.
+
+Content-heavy documents gain the most: content is sliced out of the text
+instead of being split into lines and joined again.
+
+Usage: python benchmarks/bench_parse_fast.py [num_blocks] [content_lines]
+"""
+
+import gc
+import random
+import sys
+import time
+
+from llb_doc import Document, create_llb
+from llb_doc.parser.parser import _parse_fast, _parse_lines
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    content_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(0)
+    for lines in (0, 5, content_lines):
+        doc = create_llb()
+        for i in range(num_blocks):
+            body = "\n".join(f"line {j} {rng.random():.6f}" for j in range(lines))
+            doc.add_block("record", body, lang="txt", source="archive", seq=str(i))
+        text = doc.render()
+        assert _parse_fast(text, Document())
+
+        slow = best_of(lambda: _parse_lines(text, Document()))
+        fast = best_of(lambda: _parse_fast(text, Document()))
+        mib = len(text) / 2**20
+        print(
+            f"{lines:3d} content lines, {mib:6.1f} MiB: "
+            f"lines {mib / slow:7.1f} MB/s  fast {mib / fast:7.1f} MB/s  "
+            f"{slow / fast:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
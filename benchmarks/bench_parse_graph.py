@@ -0,0 +1,50 @@
+"""Measure parse_graph throughput in MB/s on rendered graph contexts.
+
+Usage: python benchmarks/bench_parse_graph.py [num_nodes] [edges_per_node]
+"""
+
+import random
+import sys
+import time
+
+from llb_doc import create_graph, parse_graph
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rng = random.Random(0)
+    g = create_graph()
+    g.add_nodes_from(
+        (f"n{i}", "entity", f"Node {i}\n" + "lorem ipsum " * rng.randrange(20), {"kind": "k"})
+        for i in range(num_nodes)
+    )
+    g.add_edges_from(
+        (f"n{rng.randrange(num_nodes)}", f"n{rng.randrange(num_nodes)}", "rel")
+        for _ in range(num_nodes * degree)
+    )
+    for label, text in (
+        ("focused render", g.render(focus="n0", radius=50)),
+        ("full render", g.render()),
+    ):
+        size = len(text.encode())
+        elapsed = best_of(lambda: parse_graph(text))
+        parsed = parse_graph(text)
+        print(
+            f"{label:16s} {size / 2**20:6.1f} MiB  {len(parsed.nodes):6d} nodes "
+            f"{len(parsed.edges):6d} edges  {elapsed * 1e3:8.1f} ms  "
+            f"{size / 2**20 / elapsed:6.1f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare a render() loop with render_many() sequentially and in a process pool.
+
+Usage: python benchmarks/bench_render_many.py [num_nodes] [num_focuses]
+"""
+
+import os
+import random
+import sys
+import time
+
+from llb_doc import MetaRefreshMode, create_graph
+
+
+def build(num_nodes: int, degree: int = 8):
+    rng = random.Random(0)
+    g = create_graph()
+    for i in range(num_nodes):
+        g.add_node("entity", f"description of node {i} " * 8, id_=f"n{i}", kind="x")
+    for _ in range(num_nodes * degree):
+        a, b = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        g.add_edge(f"n{a}", f"n{b}", "rel", weight="1")
+    return g
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_focuses = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    g = build(num_nodes)
+    rng = random.Random(1)
+    focuses = [f"n{rng.randrange(num_nodes)}" for _ in range(num_focuses)]
+    none = MetaRefreshMode.NONE
+
+    start = time.perf_counter()
+    for focus in focuses:
+        g.render(focus=focus, radius=1, meta_refresh=none)
+    baseline = time.perf_counter() - start
+    print(f"render() loop:          {baseline:7.2f}s")
+
+    start = time.perf_counter()
+    for _ in g.render_many(focuses, radius=1, meta_refresh=none):
+        pass
+    print(f"render_many sequential: {time.perf_counter() - start:7.2f}s")
+
+    cpus = os.cpu_count() or 1
+    for workers in sorted({2, 4, cpus} - {1}):
+        start = time.perf_counter()
+        for _ in g.render_many(
+            focuses, radius=1, meta_refresh=none, workers=workers, chunksize=128
+        ):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"render_many workers={workers:<3} {elapsed:7.2f}s ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
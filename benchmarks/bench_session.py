@@ -0,0 +1,58 @@
+"""Multi-turn graph context: full render() vs RenderSession deltas.
+
+Each turn edits a few nodes inside the focused neighbourhood, attaches a
+new node to it, and re-renders the same focus.
+
+Usage: python benchmarks/bench_session.py [num_nodes] [turns]
+"""
+
+import random
+import sys
+import time
+
+from llb_doc import MetaRefreshMode, create_graph
+
+NONE = MetaRefreshMode.NONE
+RADIUS = 3
+
+
+def build(num_nodes: int):
+    rng = random.Random(0)
+    g = create_graph()
+    g.add_nodes_from((None, "entity", f"node {i} " * 8) for i in range(num_nodes))
+    g.add_edges_from(
+        (f"N{rng.randrange(1, num_nodes + 1):X}", f"N{rng.randrange(1, num_nodes + 1):X}", "rel")
+        for _ in range(num_nodes * 3)
+    )
+    return g
+
+
+def run(num_nodes: int, turns: int, delta: bool) -> tuple[float, int]:
+    g = build(num_nodes)
+    rng = random.Random(1)
+    render = g.session().render if delta else g.render
+    render(focus="N1", radius=RADIUS, meta_refresh=NONE)
+    elapsed = 0.0
+    size = 0
+    for turn in range(turns):
+        scope = sorted(g._compute_tiers("N1", RADIUS))
+        for node_id in rng.sample(scope, 3):
+            g.get_node(node_id).content = f"revised {turn}"
+        g.add_edge(rng.choice(scope), g.add_node("entity", "new fact").id, "rel")
+        start = time.perf_counter()
+        text = render(focus="N1", radius=RADIUS, meta_refresh=NONE)
+        elapsed += time.perf_counter() - start
+        size += len(text)
+    return elapsed / turns, size // turns
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    for name, delta in (("render()", False), ("session", True)):
+        per_turn, size = run(num_nodes, turns, delta)
+        print(f"{name:>9}: {size / 1024:7.1f} KiB/turn  {per_turn * 1e3:6.2f} ms/turn")
+
+
+if __name__ == "__main__":
+    main()
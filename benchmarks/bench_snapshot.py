@@ -0,0 +1,69 @@
+"""Compare cold-start times: rebuilding a graph vs loading a snapshot.
+
+Usage: python benchmarks/bench_snapshot.py [num_nodes] [edges_per_node]
+"""
+
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from llb_doc import create_graph, load_snapshot, parse_graph
+
+
+def timed(label: str, fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:36s} {(time.perf_counter() - start) * 1e3:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = random.Random(0)
+    types = ["person", "company", "ticket", "document"]
+    rels = ["owns", "cites", "works_at", "blocks"]
+    nodes = [
+        {
+            "id": f"n{i}",
+            "type": rng.choice(types),
+            "content": f"node {i} " + "lorem ipsum " * 10,
+            "status": rng.choice(["open", "closed"]),
+        }
+        for i in range(num_nodes)
+    ]
+    edges = [
+        [f"n{rng.randrange(num_nodes)}", f"n{rng.randrange(num_nodes)}", rng.choice(rels)]
+        for _ in range(num_nodes * degree)
+    ]
+    node_json, edge_json = json.dumps(nodes), json.dumps(edges)
+    del nodes, edges
+
+    def from_json():
+        g = create_graph()
+        g.add_nodes_from(json.loads(node_json))
+        g.add_edges_from(json.loads(edge_json))
+        return g.freeze()
+
+    frozen = timed("JSON -> GraphDocument -> freeze()", from_json)
+    text = frozen.render()
+    print(f"{num_nodes} nodes, {num_nodes * degree} edges, {len(text) / 2**20:.1f} MiB text")
+    timed("parse_graph(text)", lambda: parse_graph(text))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.snap")
+        size = timed("save_snapshot", lambda: frozen.save_snapshot(path))
+        print(f"  {size / 2**20:.1f} MiB snapshot")
+        del frozen
+        loaded = timed("load_snapshot (mmap)", lambda: load_snapshot(path))
+        timed("  first focused render", lambda: loaded.render(focus="n1", radius=2))
+        del loaded
+        timed("load_snapshot (read)", lambda: load_snapshot(path, mmap=False))
+
+
+if __name__ == "__main__":
+    main()
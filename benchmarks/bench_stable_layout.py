@@ -0,0 +1,57 @@
+"""Shared prefix of consecutive renders: default vs "stable" order.
+
+A session renders the same focus every turn while the graph grows by one
+node attached somewhere in the neighbourhood. Reports how much of each
+render a prompt cache warmed by the previous one could reuse.
+
+Usage: python benchmarks/bench_stable_layout.py [num_nodes] [turns]
+"""
+
+import random
+import sys
+import time
+
+from llb_doc import MetaRefreshMode, create_graph, shared_prefix
+
+NONE = MetaRefreshMode.NONE
+
+
+def build(num_nodes: int):
+    rng = random.Random(0)
+    g = create_graph()
+    g.add_nodes_from((None, "entity", f"node {i} " * 8) for i in range(num_nodes))
+    g.add_edges_from(
+        (f"N{rng.randrange(1, num_nodes + 1):X}", f"N{rng.randrange(1, num_nodes + 1):X}", "rel")
+        for _ in range(num_nodes * 3)
+    )
+    return g
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    for order in ("focus_last", "stable"):
+        g = build(num_nodes)
+        rng = random.Random(1)
+        focus = "N1"
+        prev = g.render(focus=focus, radius=2, order=order, meta_refresh=NONE)
+        shared = total = 0
+        elapsed = 0.0
+        for _ in range(turns):
+            tiers = g._compute_tiers(focus, 2)
+            anchor = rng.choice(sorted(tiers))
+            g.add_edge(anchor, g.add_node("entity", "new fact").id, "rel")
+            start = time.perf_counter()
+            text = g.render(focus=focus, radius=2, order=order, meta_refresh=NONE)
+            elapsed += time.perf_counter() - start
+            shared += shared_prefix(prev, text)
+            total += len(text)
+            prev = text
+        print(
+            f"{order:>10}: {shared / total:6.1%} of each render shared with the previous"
+            f" ({total / turns / 1024:.0f} KiB/render, {elapsed / turns * 1e3:.2f} ms/render)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare peak memory of render() with render_to() for a whole-graph export.
+
+Usage: python benchmarks/bench_streaming.py [num_nodes]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from llb_doc import MetaRefreshMode, create_graph
+
+
+def build(num_nodes: int, degree: int = 4):
+    rng = random.Random(0)
+    g = create_graph()
+    for i in range(num_nodes):
+        g.add_node("entity", f"description of node {i} " * 8, id_=f"n{i}", kind="x")
+    for _ in range(num_nodes * degree):
+        a, b = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        g.add_edge(f"n{a}", f"n{b}", "rel", weight="1")
+    return g
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:12s} {elapsed:6.2f}s  peak {peak / 2**20:7.1f} MiB  ({size / 2**20:.1f} MiB out)")
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    g = build(num_nodes)
+    none = MetaRefreshMode.NONE
+
+    def render() -> int:
+        with open(os.devnull, "w", encoding="utf-8") as fp:
+            text = g.render(meta_refresh=none)
+            fp.write(text)
+        return len(text)
+
+    def render_to() -> int:
+        with open(os.devnull, "w", encoding="utf-8") as fp:
+            return g.render_to(fp, meta_refresh=none)
+
+    measure("render()", render)
+    measure("render_to()", render_to)
+
+
+if __name__ == "__main__":
+    main()
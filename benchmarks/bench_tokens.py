@@ -0,0 +1,51 @@
+"""Token accounting per turn: tokenizing render() output vs cached counts.
+
+Each turn appends a few blocks to a large document, then needs the token
+count (and token IDs) of the full render.
+
+Usage: python benchmarks/bench_tokens.py [blocks] [turns]
+"""
+
+import sys
+import time
+
+from llb_doc import MetaRefreshMode, create_llb
+
+NONE = MetaRefreshMode.NONE
+
+
+def build(blocks: int):
+    doc = create_llb()
+    doc.add_blocks_from(
+        (None, "msg", f"Message {i}: the agent looked at file_{i}.py and found 3 issues. " * 4)
+        for i in range(blocks)
+    )
+    return doc
+
+
+def main() -> None:
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"blocks={blocks} turns={turns} tokenizer=ApproxTokenizer")
+
+    for name in ("encode(render())", "count_tokens()", "render_tokens()"):
+        doc = build(blocks)
+        tok = doc.tokenizer
+        doc.count_tokens(meta_refresh=NONE)  # warm the per-fragment cache
+        elapsed = 0.0
+        for turn in range(turns):
+            for k in range(5):
+                doc.add_block("msg", f"turn {turn} reply {k}: done.")
+            start = time.perf_counter()
+            if name == "encode(render())":
+                total = len(tok.encode(doc.render(meta_refresh=NONE)))
+            elif name == "count_tokens()":
+                total = doc.count_tokens(meta_refresh=NONE).total
+            else:
+                total = len(doc.render_tokens(meta_refresh=NONE))
+            elapsed += time.perf_counter() - start
+        print(f"{name:>17}: {elapsed / turns * 1e3:8.2f} ms/turn  ({total} tokens)")
+
+
+if __name__ == "__main__":
+    main()
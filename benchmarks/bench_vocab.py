@@ -0,0 +1,99 @@
+"""Measure the memory saved by interning repeated strings into a Vocabulary.
+
+Rows come from json.loads and documents from parse_llb, so every type, rel,
+meta key and endpoint starts out as a separate string object, as it does
+when loading real data.
+
+Usage: python benchmarks/bench_vocab.py [num_nodes] [edges_per_node]
+"""
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from llb_doc import Vocabulary, create_graph, create_llb, parse_llb
+
+
+def measure(label: str, fn) -> int:
+    gc.collect()
+    start = time.perf_counter()
+    keep = fn()
+    elapsed = time.perf_counter() - start
+    del keep
+    gc.collect()
+    tracemalloc.start()
+    keep = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    print(f"{label:34s} {size / 2**20:8.1f} MiB  {elapsed * 1e3:8.1f} ms")
+    return size
+
+
+def main() -> None:
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = random.Random(0)
+    types = ["person", "company", "ticket", "document"]
+    rels = ["owns", "cites", "works_at", "blocks"]
+    statuses = ["open", "closed", "pending"]
+    node_json = json.dumps(
+        [
+            {
+                "id": f"n{i}",
+                "type": rng.choice(types),
+                "content": f"node {i}",
+                "status": rng.choice(statuses),
+                "source": "crm",
+            }
+            for i in range(num_nodes)
+        ]
+    )
+    edge_json = json.dumps(
+        [
+            [f"n{rng.randrange(num_nodes)}", f"n{rng.randrange(num_nodes)}", rng.choice(rels)]
+            for _ in range(num_nodes * degree)
+        ]
+    )
+    blocks = create_llb()
+    for i in range(num_nodes):
+        blocks.add_block(rng.choice(types), f"block {i}", status=rng.choice(statuses))
+    text = blocks.render()
+
+    def graph(vocab):
+        def build():
+            nodes = json.loads(node_json)
+            edges = json.loads(edge_json)
+            g = create_graph(vocab=vocab() if vocab else False)
+            g.add_nodes_from(nodes)
+            g.add_edges_from(edges)
+            del nodes, edges
+            return g
+
+        return build
+
+    def parsed(vocab):
+        return lambda: parse_llb(text, vocab=vocab() if vocab else False)
+
+    print(f"{num_nodes} nodes, {num_nodes * degree} edges, {len(text) / 2**20:.1f} MiB text")
+    plain = measure("graph from JSON, vocab=False", graph(None))
+    keys = measure("graph from JSON, vocab", graph(Vocabulary))
+    values = measure(
+        "graph from JSON, vocab + values",
+        graph(lambda: Vocabulary(value_keys=["status", "source"])),
+    )
+    print(f"  saved {1 - keys / plain:.0%} / {1 - values / plain:.0%}")
+    plain = measure("parse_llb, vocab=False", parsed(None))
+    keys = measure("parse_llb, vocab", parsed(Vocabulary))
+    values = measure(
+        "parse_llb, vocab + values",
+        parsed(lambda: Vocabulary(value_keys=["status"])),
+    )
+    print(f"  saved {1 - keys / plain:.0%} / {1 - values / plain:.0%}")
+
+
+if __name__ == "__main__":
+    main()
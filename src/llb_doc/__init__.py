@@ -1,45 +1,85 @@
-from .cache import GeneratorCache, get_default_cache
+from .cache import GeneratorCache, RenderCache, get_default_cache
 from .core import (
+    ApproxTokenizer,
     Block,
     BlockNotFoundError,
     BriefRenderer,
     Ctx,
     DEFAULT_DOC_PREFIX,
     Document,
+    DuplicateEdgeError,
     DuplicateIDError,
     Edge,
+    FrozenGraph,
     GraphDocument,
+    IncrementalRenderer,
     ItemSpec,
     MetaRefreshMode,
     Node,
     NodeNotFoundError,
+    OverlayGraph,
+    RenderSession,
+    SnapshotError,
+    TokenCounts,
+    Tokenizer,
+    Vocabulary,
     create_graph,
     create_llb,
+    load_snapshot,
+    shared_prefix,
 )
 from .generators import meta_generator
-from .parser import ParseError, parse_llb
+from .parser import (
+    BlockStream,
+    LazyBlock,
+    ParseError,
+    iter_parse,
+    parse_graph,
+    parse_llb,
+    parse_llb_parallel,
+    parse_many,
+)
 from .sorters import block_sorter
 
 __all__ = [
+    "ApproxTokenizer",
     "Block",
     "BlockNotFoundError",
+    "BlockStream",
     "BriefRenderer",
     "Ctx",
     "DEFAULT_DOC_PREFIX",
     "Document",
+    "DuplicateEdgeError",
     "DuplicateIDError",
     "Edge",
+    "FrozenGraph",
     "GeneratorCache",
     "GraphDocument",
+    "IncrementalRenderer",
     "ItemSpec",
+    "LazyBlock",
     "MetaRefreshMode",
     "Node",
     "NodeNotFoundError",
+    "OverlayGraph",
     "ParseError",
+    "RenderCache",
+    "RenderSession",
+    "SnapshotError",
+    "TokenCounts",
+    "Tokenizer",
+    "Vocabulary",
     "block_sorter",
     "create_graph",
     "create_llb",
     "get_default_cache",
+    "iter_parse",
+    "load_snapshot",
     "meta_generator",
+    "parse_graph",
     "parse_llb",
+    "parse_llb_parallel",
+    "parse_many",
+    "shared_prefix",
 ]
@@ -1,3 +1,4 @@
 from .cache import GeneratorCache, get_default_cache
+from .render_cache import RenderCache
 
-__all__ = ["GeneratorCache", "get_default_cache"]
+__all__ = ["GeneratorCache", "RenderCache", "get_default_cache"]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+TiersKey = tuple[tuple[str, ...], int, str]
+TextKey = tuple[Hashable, ...]
+
+_TIERS = 0
+_TEXT = 1
+
+
+class RenderCache:
+    """LRU cache of computed tiers and rendered text for focused graph renders.
+
+    Every entry remembers the node IDs its neighbourhood covers, so a change
+    to one node or edge only drops the entries that include it. All
+    operations hold an internal lock, so one cache can serve renders running
+    in several threads.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._tiers: OrderedDict[TiersKey, dict[str, int]] = OrderedDict()
+        self._texts: OrderedDict[TextKey, tuple[str, int, dict[str, int]]] = (
+            OrderedDict()
+        )
+        self._by_node: dict[str, set[tuple[int, Hashable]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict[str, object]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get_tiers(self, key: TiersKey) -> dict[str, int] | None:
+        with self._lock:
+            tiers = self._tiers.get(key)
+            if tiers is not None:
+                self._tiers.move_to_end(key)
+            return tiers
+
+    def put_tiers(self, key: TiersKey, tiers: dict[str, int]) -> None:
+        with self._lock:
+            self._store(_TIERS, key, tiers, tiers)
+
+    def get_text(self, key: TextKey) -> str | None:
+        with self._lock:
+            entry = self._texts.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._texts.move_to_end(key)
+            return entry[0]
+
+    def put_text(
+        self, key: TextKey, text: str, tiers: dict[str, int], version: int
+    ) -> None:
+        with self._lock:
+            self._store(_TEXT, key, (text, version, tiers), tiers)
+
+    def version_of(self, key: TextKey) -> int | None:
+        """Return the document version a cached text was rendered at."""
+        with self._lock:
+            entry = self._texts.get(key)
+            return None if entry is None else entry[1]
+
+    def _table(self, kind: int) -> OrderedDict:
+        return self._tiers if kind == _TIERS else self._texts
+
+    def _store(
+        self, kind: int, key: Hashable, value: object, nodes: Iterable[str]
+    ) -> None:
+        table = self._table(kind)
+        if key in table:
+            self._drop(kind, key)
+        table[key] = value
+        for node_id in nodes:
+            self._by_node.setdefault(node_id, set()).add((kind, key))
+        if len(table) > self.maxsize:
+            self._drop(kind, next(iter(table)))
+
+    def _drop(self, kind: int, key: Hashable) -> None:
+        value = self._table(kind).pop(key)
+        nodes = value if kind == _TIERS else value[2]
+        for node_id in nodes:
+            keys = self._by_node.get(node_id)
+            if keys is not None:
+                keys.discard((kind, key))
+                if not keys:
+                    del self._by_node[node_id]
+
+    def invalidate_nodes(self, node_ids: Iterable[str]) -> int:
+        """Drop every entry whose neighbourhood includes one of ``node_ids``."""
+        dropped = 0
+        with self._lock:
+            for node_id in node_ids:
+                for kind, key in list(self._by_node.get(node_id, ())):
+                    self._drop(kind, key)
+                    dropped += 1
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiers.clear()
+            self._texts.clear()
+            self._by_node.clear()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __bool__(self) -> bool:
+        return True
@@ -9,20 +9,33 @@ from .document import (
     IDGenerator,
     MetaRefreshMode,
     create_llb,
+    shared_prefix,
 )
 from .edge import Edge
+from .frozen_graph import FrozenGraph
 from .graph_document import (
     BriefRenderer,
+    DuplicateEdgeError,
     EdgeBuilder,
     GraphDocument,
     ItemSpec,
     NodeBuilder,
     NodeNotFoundError,
+    OnDuplicate,
     create_graph,
 )
+from .incremental import IncrementalRenderer
 from .node import Node
+from .order import IDOrder
+from .overlay import OverlayGraph
+from .render_state import RenderState
+from .session import RenderSession
+from .snapshot import SnapshotError, load_snapshot, save_snapshot
+from .tokens import ApproxTokenizer, TokenCounts, Tokenizer
+from .vocab import Vocabulary
 
 __all__ = [
+    "ApproxTokenizer",
     "Block",
     "BlockBuilder",
     "BlockNotFoundError",
@@ -30,16 +43,31 @@ __all__ = [
     "Ctx",
     "DEFAULT_DOC_PREFIX",
     "Document",
+    "DuplicateEdgeError",
     "DuplicateIDError",
     "Edge",
     "EdgeBuilder",
+    "FrozenGraph",
     "GraphDocument",
     "IDGenerator",
+    "IDOrder",
+    "IncrementalRenderer",
     "ItemSpec",
     "MetaRefreshMode",
     "Node",
     "NodeBuilder",
     "NodeNotFoundError",
+    "OnDuplicate",
+    "OverlayGraph",
+    "RenderSession",
+    "RenderState",
+    "SnapshotError",
+    "TokenCounts",
+    "Tokenizer",
+    "Vocabulary",
     "create_graph",
     "create_llb",
+    "load_snapshot",
+    "save_snapshot",
+    "shared_prefix",
 ]
@@ -1,13 +1,157 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from .document import Document
+    from .vocab import Vocabulary
+
+
+class MetaDict(dict):
+    """Meta dict that reports writes to its owning block.
+
+    Keys written to the meta of a block in a document are interned in the
+    document's vocabulary, like the keys the block was created with.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, data: Any = (), owner: Block | None = None) -> None:
+        super().__init__(data)
+        self._owner = owner
+
+    @classmethod
+    def _owned(
+        cls, data: Any, owner: Block, vocab: Vocabulary | None = None
+    ) -> MetaDict:
+        """Construct without going through the Python-level __init__.
+
+        With ``vocab``, keys are interned while ``data`` is copied in.
+        """
+        meta = dict.__new__(cls)
+        if data:
+            if vocab is not None:
+                vocab.intern_meta(data, meta)
+            else:
+                dict.update(meta, data)
+        meta._owner = owner
+        return meta
+
+    def _write_vocab(self) -> Vocabulary | None:
+        """Check that the owner's document allows writes; return its vocab."""
+        owner = self._owner
+        if owner is None:
+            return None
+        doc = owner._doc
+        if doc is None:
+            return None
+        _check_writable(doc)
+        return doc._vocab
+
+    def _changed(self) -> None:
+        if self._owner is not None:
+            self._owner._changed("meta")
+
+    def __setitem__(self, key: str, value: str) -> None:
+        vocab = self._write_vocab()
+        if vocab is not None:
+            key, value = vocab.intern_item(key, value)
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key: str) -> None:
+        self._write_vocab()
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other: Any) -> MetaDict:
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: str) -> None:
+        vocab = self._write_vocab()
+        if vocab is not None:
+            vocab.intern_meta(dict(*args, **kwargs), self)
+        else:
+            super().update(*args, **kwargs)
+        if args or kwargs:
+            self._changed()
+
+    def setdefault(self, key: str, default: str | None = None) -> str | None:
+        if key in self:
+            return self[key]
+        self[key] = default  # type: ignore[assignment]
+        return default
+
+    def pop(self, key: str, *default: Any) -> Any:
+        self._write_vocab()
+        had = key in self
+        value = super().pop(key, *default)
+        if had:
+            self._changed()
+        return value
+
+    def popitem(self) -> tuple[str, str]:
+        self._write_vocab()
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self) -> None:
+        self._write_vocab()
+        had = bool(self)
+        super().clear()
+        if had:
+            self._changed()
+
+    def __reduce__(self) -> tuple:
+        return (MetaDict, (dict(self), self._owner))
+
+
+_set = object.__setattr__
+
+
+def _check_writable(doc: Document | None) -> None:
+    """Raise TypeError if ``doc`` does not allow changes to its blocks."""
+    if doc is not None and doc._read_only:
+        raise TypeError(f"{type(doc).__name__} is immutable")
+
+# Fields whose values are drawn from the document vocabulary
+_INTERNED = frozenset({"type", "lang", "rel"})
+
+
+@cache
+def _slot_names(cls: type) -> tuple[str, ...]:
+    """All slots of ``cls`` that carry state worth pickling."""
+    names: list[str] = []
+    for klass in reversed(cls.__mro__):
+        for name in klass.__dict__.get("__slots__", ()):
+            if name not in ("_memo", "_brief_memo", "_token_memo", "__dict__", "__weakref__"):
+                names.append(name)
+    return tuple(names)
 
 
 class Block:
+    """Block of the LLB format.
+
+    Fields live in ``__slots__``, so reads are plain slot loads; writes to
+    rendered fields go through ``__setattr__`` to drop memoized fragments
+    and notify the owning document. Unknown attribute names read and write
+    ``meta`` entries. ``meta`` itself is created on first access, so blocks
+    without meta carry no dict. Blocks created for a document take their
+    type, lang and meta keys from the document's vocabulary.
+    """
+
+    __slots__ = (
+        "id", "type", "lang", "content", "_meta", "_doc", "_memo", "_brief_memo", "_token_memo"
+    )
+
+    # Attributes stored on the block itself; other names are meta entries
     _fields = frozenset({"id", "type", "lang", "meta", "content", "_doc"})
+    # Fields whose changes alter the rendered block
+    _tracked = frozenset({"id", "type", "lang", "meta", "content"})
 
     def __init__(
         self,
@@ -19,13 +163,59 @@ class Block:
         _doc: Document | None = None,
         **kwargs: str,
     ) -> None:
-        self.id = id
-        self.type = type
-        self.lang = lang
-        self.meta = meta if meta is not None else {}
-        self.content = content
-        self._doc = _doc
-        self.meta.update(kwargs)
+        vocab = _doc._vocab if _doc is not None else None
+        if vocab is not None:
+            type = vocab.intern(type)
+            if lang:
+                lang = vocab.intern(lang)
+        _set(self, "id", id)
+        _set(self, "type", type)
+        _set(self, "lang", lang)
+        _set(self, "content", content)
+        if meta or kwargs:
+            owned = MetaDict._owned(meta, self, vocab)
+            if kwargs:
+                if vocab is not None:
+                    vocab.intern_meta(kwargs, owned)
+                else:
+                    dict.update(owned, kwargs)
+            _set(self, "_meta", owned)
+        else:
+            _set(self, "_meta", None)
+        _set(self, "_doc", _doc)
+        _set(self, "_memo", None)
+        _set(self, "_brief_memo", None)
+        # (tokenizer, fragment, tokens) of the last tokenized fragment
+        _set(self, "_token_memo", None)
+
+    @property
+    def meta(self) -> MetaDict:
+        meta = self._meta
+        if meta is None:
+            meta = MetaDict._owned(None, self)
+            _set(self, "_meta", meta)
+        return meta
+
+    @meta.setter
+    def meta(self, value: dict[str, str]) -> None:
+        if type(value) is not MetaDict or value._owner is not self:
+            doc = self._doc
+            value = MetaDict._owned(value, self, doc._vocab if doc is not None else None)
+        _set(self, "_meta", value)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = {name: getattr(self, name) for name in _slot_names(type(self))}
+        extra = getattr(self, "__dict__", None)
+        if extra:
+            state.update(extra)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            _set(self, name, value)
+        _set(self, "_memo", None)
+        _set(self, "_brief_memo", None)
+        _set(self, "_token_memo", None)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Block):
@@ -34,7 +224,7 @@ class Block:
             self.id == other.id
             and self.type == other.type
             and self.lang == other.lang
-            and self.meta == other.meta
+            and (self._meta or {}) == (other._meta or {})
             and self.content == other.content
         )
 
@@ -44,24 +234,46 @@ class Block:
     def __getattr__(self, name: str) -> str | None:
         if name.startswith("_"):
             raise AttributeError(name)
-        return self.meta.get(name)
+        meta = self._meta
+        return meta.get(name) if meta else None
 
-    def __setattr__(self, name: str, value: str) -> None:
+    def __setattr__(self, name: str, value: Any) -> None:
         if name in self._fields:
-            object.__setattr__(self, name, value)
+            tracked = name in self._tracked
+            if tracked:
+                _check_writable(self._doc)
+            if name in _INTERNED and type(value) is str and self._doc is not None:
+                vocab = self._doc._vocab
+                if vocab is not None:
+                    value = vocab.intern(value)
+            _set(self, name, value)
+            if tracked:
+                self._changed(name)
         else:
             self.meta[name] = value
 
     def __delattr__(self, name: str) -> None:
+        _check_writable(self._doc)
         if name == "lang":
-            object.__setattr__(self, "lang", None)
+            _set(self, "lang", None)
+            self._changed(name)
         elif name == "content":
-            object.__setattr__(self, "content", "")
-        elif name in self.meta:
-            del self.meta[name]
+            _set(self, "content", "")
+            self._changed(name)
+        elif self._meta and name in self._meta:
+            del self._meta[name]
         else:
             raise AttributeError(name)
 
+    def _changed(self, name: str) -> None:
+        """Drop memoized fragments and notify the owning document."""
+        _set(self, "_memo", None)
+        _set(self, "_brief_memo", None)
+        _set(self, "_token_memo", None)
+        doc = self._doc
+        if doc is not None:
+            doc._block_changed(self, name)
+
     def render_header(self) -> str:
         """Return header line, subclass can override to generate different marker."""
         parts = ["@block", self.id, self.type]
@@ -78,25 +290,63 @@ class Block:
         return []
 
     def render(self) -> str:
-        """Render block to LLB format string."""
+        """Render block to LLB format string.
+
+        The result is memoized for blocks without render-time meta lines;
+        blocks with render_meta() (nodes, ctx) memoize only their tail.
+        """
+        static = type(self).render_meta is Block.render_meta
+        if static:
+            cached = self._memo
+            if cached is not None:
+                return cached
+
         extra_meta = self.render_meta()
-        has_meta = bool(self.meta) or bool(extra_meta)
+        has_meta = bool(self._meta) or bool(extra_meta)
         has_content = bool(self.content)
 
         if not has_meta and not has_content:
-            return f"{self.render_header()} @end"
+            text = f"{self.render_header()} @end"
+        else:
+            lines: list[str] = [self.render_header()]
+            lines.extend(extra_meta)
+            lines.append(self._build_tail() if static else self.render_tail())
+            text = "\n".join(lines)
 
-        lines: list[str] = [self.render_header()]
+        if static:
+            _set(self, "_memo", text)
+        return text
 
-        lines.extend(extra_meta)
+    def render_tail(self) -> str:
+        """Render the part after render_meta(): meta, content and end marker.
 
-        for key, value in self.meta.items():
+        The tail does not depend on render-time state, so it is memoized
+        until a rendered field changes.
+        """
+        if type(self).render_meta is Block.render_meta:
+            # _memo holds the whole fragment for these blocks
+            return self._build_tail()
+        cached = self._memo
+        if cached is None:
+            cached = self._build_tail()
+            _set(self, "_memo", cached)
+        return cached
+
+    def _meta_lines(self) -> list[str]:
+        lines: list[str] = []
+        if not self._meta:
+            return lines
+        for key, value in self._meta.items():
             if "\n" in str(value):
                 lines.append(f'{key}="""{value}"""')
             else:
                 lines.append(f"{key}={value}")
+        return lines
+
+    def _build_tail(self) -> str:
+        lines = self._meta_lines()
 
-        if has_content:
+        if self.content:
             lines.append("")
             lines.append(self.content)
             lines.append("")
@@ -107,22 +357,92 @@ class Block:
 
     def render_brief(self) -> str:
         """Render block in brief mode (meta only, no content)."""
+        static = type(self).render_meta is Block.render_meta
+        if static:
+            cached = self._brief_memo
+            if cached is not None:
+                return cached
+
         extra_meta = self.render_meta()
-        has_meta = bool(self.meta) or bool(extra_meta)
+        has_meta = bool(self._meta) or bool(extra_meta)
 
         if not has_meta:
-            return f"{self.render_header()} @end"
+            text = f"{self.render_header()} @end"
+        elif static:
+            text = "\n".join([self.render_header(), *self._meta_lines(), self.render_end()])
+        else:
+            brief_tail = self._brief_memo
+            if brief_tail is None:
+                brief_tail = "\n".join([*self._meta_lines(), self.render_end()])
+                _set(self, "_brief_memo", brief_tail)
+            text = "\n".join([self.render_header(), *extra_meta, brief_tail])
 
-        lines: list[str] = [self.render_header()]
+        if static:
+            _set(self, "_brief_memo", text)
+        return text
 
-        lines.extend(extra_meta)
 
-        for key, value in self.meta.items():
-            if "\n" in str(value):
-                lines.append(f'{key}="""{value}"""')
-            else:
-                lines.append(f"{key}={value}")
+# Slot descriptors of Block, shadowed by the properties of LazyFields
+_content_slot = Block.__dict__["content"]
+_meta_slot = Block.__dict__["_meta"]
 
-        lines.append(self.render_end())
 
-        return "\n".join(lines)
+class LazyFields(ABC):
+    """Mixin for blocks whose meta and content are read on first use.
+
+    Subclasses define a ``_source`` slot that is None once the fields are
+    loaded, and ``_read()`` returning ``(content, meta)`` from it. Until
+    then, reads and writes of ``content`` and meta load the fields first,
+    so the block behaves as a plain one and drops ``_source`` afterwards.
+    Subclasses must set ``_source`` to None before calling Block.__init__.
+    """
+
+    __slots__ = ()
+
+    _source: Any
+
+    @abstractmethod
+    def _read(self) -> tuple[str, dict[str, str] | None]:
+        """Return ``(content, meta)`` read from ``_source``."""
+
+    def _load(self) -> None:
+        if self._source is None:
+            return
+        content, meta = self._read()
+        _set(self, "_source", None)
+        _content_slot.__set__(self, content)
+        if meta:
+            doc = self._doc  # type: ignore[attr-defined]
+            vocab = doc._vocab if doc is not None else None
+            _meta_slot.__set__(self, MetaDict._owned(meta, self, vocab))  # type: ignore[arg-type]
+
+    def _get_content(self) -> str:
+        if self._source is not None:
+            self._load()
+        return _content_slot.__get__(self)
+
+    def _set_content(self, value: str) -> None:
+        if self._source is not None:
+            self._load()
+        _content_slot.__set__(self, value)
+
+    def _get_meta(self) -> MetaDict | None:
+        if self._source is not None:
+            self._load()
+        return _meta_slot.__get__(self)
+
+    def _set_meta(self, value: MetaDict | None) -> None:
+        if self._source is not None:
+            self._load()
+        _meta_slot.__set__(self, value)
+
+    content = property(_get_content, _set_content)
+    _meta = property(_get_meta, _set_meta)
+
+    def __getstate__(self) -> dict[str, Any]:
+        self._load()
+        return super().__getstate__()  # type: ignore[misc]
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        _set(self, "_source", None)
+        super().__setstate__(state)  # type: ignore[misc]
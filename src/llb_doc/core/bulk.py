@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import gc
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Sequence, Union
+
+# A row is a positional tuple or a field mapping; a batch is an iterable of
+# rows or a column mapping of equal-length sequences.
+Row = Union[Sequence[Any], Mapping[str, Any]]
+Rows = Union[Iterable[Row], Mapping[str, Sequence[Any]]]
+
+
+def normalize_rows(
+    data: Rows,
+    positional: tuple[str, ...],
+    required: int,
+    fields: frozenset[str],
+) -> list[dict[str, Any]]:
+    """Turn tuples, dicts or columns into one field dict per row.
+
+    ``positional`` names the tuple slots, the first ``required`` of which
+    must be present. Keys outside ``fields`` are collected into the row's
+    ``meta`` dict, like the ``**meta`` keywords of the single-item methods.
+    """
+    if isinstance(data, Mapping):
+        return _from_columns(data, fields)
+    rows: list[dict[str, Any]] = []
+    width = len(positional)
+    for row in data:
+        if isinstance(row, Mapping):
+            rows.append(_from_mapping(row, fields))
+        elif isinstance(row, (tuple, list)):
+            if not required <= len(row) <= width:
+                raise ValueError(
+                    f"Expected {required} to {width} values "
+                    f"({', '.join(positional)}), got {len(row)}: {row!r}"
+                )
+            rows.append(dict(zip(positional, row)))
+        else:
+            raise TypeError(f"Unsupported row type: {type(row).__name__}")
+    return rows
+
+
+def _from_mapping(row: Mapping[str, Any], fields: frozenset[str]) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    extra: dict[str, Any] = {}
+    for key, value in row.items():
+        if key in fields:
+            out[key] = value
+        else:
+            extra[key] = value
+    if extra:
+        out["meta"] = {**(out.get("meta") or {}), **extra}
+    return out
+
+
+def _from_columns(
+    columns: Mapping[str, Sequence[Any]], fields: frozenset[str]
+) -> list[dict[str, Any]]:
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 0
+    names = [key for key in columns if key in fields]
+    rows = [dict(zip(names, values)) for values in zip(*(columns[k] for k in names))]
+    if not names:
+        rows = [{} for _ in range(n)]
+    meta_names = [key for key in columns if key not in fields]
+    if meta_names:
+        for row, values in zip(rows, zip(*(columns[k] for k in meta_names))):
+            extra = dict(zip(meta_names, values))
+            row["meta"] = {**(row.get("meta") or {}), **extra}
+    return rows
+
+
+def assign_ids(
+    rows: list[dict[str, Any]],
+    existing: Mapping[str, Any],
+    generate: Any,
+) -> list[str]:
+    """Return the ID of every row, generating the missing ones in bulk.
+
+    Explicit IDs are checked against each other and ``existing`` with set
+    operations; ``generate(count, *taken)`` supplies IDs for the rest.
+    Raises DuplicateIDError before anything is inserted.
+    """
+    from .document import DuplicateIDError
+
+    ids: list[str | None] = [row.get("id") or None for row in rows]
+    explicit = [id_ for id_ in ids if id_ is not None]
+    seen = set(explicit)
+    if len(seen) != len(explicit):
+        dup = set()
+        for id_ in explicit:
+            if id_ in dup:
+                raise DuplicateIDError(id_)
+            dup.add(id_)
+    if not seen.isdisjoint(existing):
+        raise DuplicateIDError(next(id_ for id_ in explicit if id_ in existing))
+    missing = len(ids) - len(explicit)
+    if missing:
+        taken = [c for c in (existing, seen) if c]
+        fresh = iter(generate(missing, *taken))
+        ids = [id_ if id_ is not None else next(fresh) for id_ in ids]
+    return ids  # type: ignore[return-value]
+
+
+_gc_lock = threading.Lock()
+_gc_depth = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Suspend cyclic GC while many container objects are allocated.
+
+    Collections triggered mid-load rescan every block created so far,
+    making large loads superlinear. Nested and concurrent uses share one
+    pause: GC is re-enabled when the last one exits, and only if it was
+    enabled when the first one entered.
+    """
+    global _gc_depth, _gc_was_enabled
+    with _gc_lock:
+        if _gc_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_depth -= 1
+            if _gc_depth == 0 and _gc_was_enabled:
+                gc.enable()
@@ -2,16 +2,26 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .block import Block
+from .block import Block, _set
 
 if TYPE_CHECKING:
     from .document import Document
 
 
 class Ctx(Block):
-    """Graph context block, renders as @ctx."""
+    """Graph context block, renders as @ctx.
 
-    _fields = Block._fields | frozenset({"focus", "radius", "strategy", "tiers"})
+    For budgeted renders ``budget`` holds the size limit and ``cut`` records
+    where expansion stopped as ``<tier>:<kept>/<total>``, e.g. ``2:17/120``.
+    Render sessions list the IDs that left the scope since the previous
+    turn in ``removed``.
+    """
+
+    __slots__ = ("focus", "radius", "strategy", "tiers", "budget", "cut", "removed")
+
+    _fields = Block._fields | frozenset(
+        {"focus", "radius", "strategy", "tiers", "budget", "cut", "removed"}
+    )
 
     def __init__(
         self,
@@ -24,21 +34,27 @@ class Ctx(Block):
         radius: int | None = None,
         strategy: str | None = None,
         tiers: str | None = None,
+        budget: int | None = None,
+        cut: str | None = None,
+        removed: str | None = None,
         _doc: Document | None = None,
         **kwargs: str,
     ) -> None:
         super().__init__(id, type, lang, meta, content, _doc, **kwargs)
-        self.focus = focus
-        self.radius = radius
-        self.strategy = strategy
-        self.tiers = tiers
+        _set(self, "focus", focus)
+        _set(self, "radius", radius)
+        _set(self, "strategy", strategy)
+        _set(self, "tiers", tiers)
+        _set(self, "budget", budget)
+        _set(self, "cut", cut)
+        _set(self, "removed", removed)
 
     def render_header(self) -> str:
         """Return @ctx header line."""
         return f"@ctx {self.id}"
 
     def render_meta(self) -> list[str]:
-        """Return focus, radius, strategy and tiers meta lines."""
+        """Return focus, radius, strategy, tiers, budget and removed meta lines."""
         lines: list[str] = []
         if self.focus is not None:
             lines.append(f"focus={self.focus}")
@@ -51,6 +67,12 @@ class Ctx(Block):
                 lines.append(f'tiers="""\n{self.tiers}\n"""')
             else:
                 lines.append(f"tiers={self.tiers}")
+        if self.budget is not None:
+            lines.append(f"budget={self.budget}")
+        if self.cut is not None:
+            lines.append(f"cut={self.cut}")
+        if self.removed is not None:
+            lines.append(f"removed={self.removed}")
         return lines
 
     def __repr__(self) -> str:
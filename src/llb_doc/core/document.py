@@ -1,14 +1,35 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import os
+import threading
 from enum import Enum
-from typing import Self
+from itertools import chain
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Container,
+    Iterable,
+    Iterator,
+    Literal,
+    Self,
+    Sequence,
+)
 
 from .block import Block
+from .bulk import Rows, assign_ids, gc_paused, normalize_rows
+from .order import IDOrder
+from .tokens import DEFAULT_TOKENIZER, TokenCounts, Tokenizer, block_tokens
+from .vocab import Vocabulary
 
 from ..generators.registry import GeneratorRegistry, MetaGenerator, get_meta_key
 from ..sorters.registry import BlockSorter, SorterRegistry, get_sorter_name
 
+if TYPE_CHECKING:
+    from .incremental import IncrementalRenderer
+
 
 class MetaRefreshMode(Enum):
     NONE = "none"
@@ -29,6 +50,10 @@ key2=value2
 ```"""
 
 
+_BLOCK_COLUMNS = ("id", "type", "content", "meta")
+_BLOCK_FIELDS = frozenset({"id", "type", "lang", "content", "meta"})
+
+
 class DuplicateIDError(ValueError):
     """Raised when attempting to add a block with a duplicate ID."""
 
@@ -48,11 +73,58 @@ class BlockNotFoundError(KeyError):
 class IDGenerator:
     def __init__(self, prefix: str = "B") -> None:
         self._prefix = prefix
+        self._lock = threading.Lock()
         self._counter = 0
 
     def next(self) -> str:
-        self._counter += 1
-        return f"{self._prefix}{self._counter:X}"
+        with self._lock:
+            self._counter += 1
+            n = self._counter
+        return f"{self._prefix}{n:X}"
+
+    def take(self, count: int, *taken: Container[str]) -> list[str]:
+        """Return ``count`` new IDs, skipping any found in ``taken``."""
+        ids: list[str] = []
+        prefix = self._prefix
+        with self._lock:
+            while len(ids) < count:
+                start = self._counter + 1
+                self._counter += count - len(ids)
+                batch = [f"{prefix}{n:X}" for n in range(start, self._counter + 1)]
+                for container in taken:
+                    batch = [id_ for id_ in batch if id_ not in container]
+                ids.extend(batch)
+        return ids
+
+    def copy(self) -> IDGenerator:
+        """Return a generator with the same prefix that continues from here."""
+        gen = IDGenerator(self._prefix)
+        gen._counter = self._counter
+        return gen
+
+    def set_next(self, id_: str) -> bool:
+        """Make next() return ``id_`` if it is one of this generator's IDs."""
+        digits = id_[len(self._prefix) :]
+        if not id_.startswith(self._prefix) or not digits:
+            return False
+        try:
+            n = int(digits, 16)
+        except ValueError:
+            return False
+        if f"{self._prefix}{n:X}" != id_:
+            return False
+        with self._lock:
+            self._counter = n - 1
+        return True
+
+    def __getstate__(self) -> dict[str, object]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
 
 class BlockBuilder:
@@ -89,6 +161,7 @@ class BlockBuilder:
         )
         self._doc._block_order.append(block_id)
         self._doc._id_index[block_id] = block
+        self._doc._touch()
         return block
 
     def __enter__(self) -> Block:
@@ -108,21 +181,39 @@ class BlockBuilder:
         if exc_type is None:
             self._doc._block_order.append(self._block.id)
             self._doc._id_index[self._block.id] = self._block
+            self._doc._touch()
 
 
 class Document:
+    # Set by documents whose blocks must not change (FrozenGraph)
+    _read_only = False
+
     def __init__(
         self,
         generators: list[MetaGenerator] | None = None,
         sorters: list[BlockSorter] | None = None,
+        *,
+        vocab: Vocabulary | Literal[False] | None = None,
     ) -> None:
-        self._block_order: list[str] = []
+        # Interns types, langs, rels and meta keys; False turns it off
+        self._vocab: Vocabulary | None = (
+            Vocabulary() if vocab is None else vocab or None
+        )
+        self._block_order: IDOrder = IDOrder()
         self._id_index: dict[str, Block] = {}
         self._id_gen = IDGenerator()
         self._generator_registry: GeneratorRegistry = GeneratorRegistry()
         self._sorter_registry: SorterRegistry = SorterRegistry()
         self._prefix: str = ""
         self._suffix: str = ""
+        self._version: int = 0
+        # Changes other than appends and suffix edits, and the block slots
+        # an IncrementalRenderer has output; see _block_changed()
+        self._rewrites: int = 0
+        self._sealed_slots: int = 0
+        self._tokenizer: Tokenizer | None = None
+        # Tokens of prefix, suffix and separators, keyed by text
+        self._frame_tokens: dict[str, Sequence[int]] = {}
         if generators:
             for gen in generators:
                 meta_key = get_meta_key(gen)
@@ -147,6 +238,8 @@ class Document:
     @prefix.setter
     def prefix(self, value: str) -> None:
         self._prefix = value
+        self._rewrites += 1
+        self._frame_changed()
 
     @property
     def suffix(self) -> str:
@@ -155,6 +248,50 @@ class Document:
     @suffix.setter
     def suffix(self, value: str) -> None:
         self._suffix = value
+        self._frame_changed()
+
+    @property
+    def vocab(self) -> Vocabulary | None:
+        return self._vocab
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        """Tokenizer for count_tokens() and render_tokens().
+
+        Defaults to a shared ApproxTokenizer; set any object with an
+        ``encode(text)`` method, e.g. a tiktoken encoding.
+        """
+        return self._tokenizer or DEFAULT_TOKENIZER
+
+    @tokenizer.setter
+    def tokenizer(self, value: Tokenizer | None) -> None:
+        self._tokenizer = value
+        self._frame_tokens = {}
+
+    @property
+    def version(self) -> int:
+        """Mutation counter, bumped by every change that affects rendering."""
+        return self._version
+
+    def _touch(self) -> None:
+        self._version += 1
+
+    def _frame_changed(self) -> None:
+        """Called when prefix or suffix changes."""
+        self._touch()
+
+    def _block_changed(self, block: Block, name: str) -> None:
+        """Called by a block when one of its rendered fields changes.
+
+        Only blocks an incremental renderer has already output count as
+        rewrites, so filling in the meta of appended blocks does not.
+        """
+        self._touch()
+        sealed = self._sealed_slots
+        if sealed:
+            order = self._block_order
+            if name == "id" or (block.id in order and order.position(block.id) < sealed):
+                self._rewrites += 1
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Document):
@@ -217,8 +354,32 @@ class Document:
         )
         self._block_order.append(block_id)
         self._id_index[block_id] = block
+        self._touch()
         return block
 
+    def add_blocks_from(self, blocks: Rows) -> list[Block]:
+        """Add many blocks at once.
+
+        ``blocks`` is an iterable of ``(id, type[, content[, meta]])`` tuples
+        (``id`` may be None) or of dicts with ``id``, ``type``, ``lang``,
+        ``content`` and ``meta`` keys, or a dict of equal-length columns
+        under the same names. Other keys become meta entries. IDs are checked
+        for duplicates before any block is added.
+        """
+        with gc_paused():
+            rows = normalize_rows(blocks, _BLOCK_COLUMNS, 2, _BLOCK_FIELDS)
+            ids = assign_ids(rows, self._id_index, self._id_gen.take)
+            created: list[Block] = []
+            for i, (row, id_) in enumerate(zip(rows, ids)):
+                if "type" not in row:
+                    raise ValueError(f"Block row {i} has no type")
+                row["id"] = id_
+                created.append(Block(_doc=self, **row))
+            self._block_order.extend(ids)
+            self._id_index.update(zip(ids, created))
+        self._touch()
+        return created
+
     def get_block(self, id_: str) -> Block | None:
         """Get a block by ID, returns None if not found."""
         return self._id_index.get(id_)
@@ -234,8 +395,16 @@ class Document:
         block = self._id_index.pop(id_)
         self._block_order.remove(id_)
         block._doc = None
+        self._rewrites += 1
+        self._touch()
         return block
 
+    def compact(self) -> None:
+        """Drop tombstones left by removals from the block order."""
+        self._block_order.compact()
+        # Slots are renumbered
+        self._rewrites += 1
+
     def replace_block(
         self,
         id_: str,
@@ -281,6 +450,8 @@ class Document:
             )
             self._id_index[id_] = new_block
             old_block._doc = None
+            self._rewrites += 1
+            self._touch()
             return new_block
         else:
             return self.add_block(type_, content, lang=lang, id_=id_, **meta)
@@ -289,8 +460,9 @@ class Document:
         """Move a block to a specific position (0-indexed)."""
         if id_ not in self._id_index:
             raise BlockNotFoundError(id_)
-        self._block_order.remove(id_)
-        self._block_order.insert(position, id_)
+        self._block_order.move(id_, position)
+        self._rewrites += 1
+        self._touch()
 
     def swap_blocks(self, id1: str, id2: str) -> None:
         """Swap positions of two blocks."""
@@ -298,9 +470,9 @@ class Document:
             raise BlockNotFoundError(id1)
         if id2 not in self._id_index:
             raise BlockNotFoundError(id2)
-        idx1 = self._block_order.index(id1)
-        idx2 = self._block_order.index(id2)
-        self._block_order[idx1], self._block_order[idx2] = id2, id1
+        self._block_order.swap(id1, id2)
+        self._rewrites += 1
+        self._touch()
 
     def reorder_blocks(self, ids: list[str]) -> None:
         """Reorder blocks according to the given ID list. All IDs must be present."""
@@ -311,17 +483,77 @@ class Document:
                 raise ValueError(f"Missing block IDs in reorder list: {missing}")
             if extra:
                 raise BlockNotFoundError(list(extra)[0])
-        self._block_order = list(ids)
+        self._block_order = IDOrder(ids)
+        self._rewrites += 1
+        self._touch()
 
-    def _render_body(self, *, order: str | None = None) -> str:
-        """Build rendered document body."""
+    def _iter_blocks(self, *, order: str | None = None) -> Iterator[str]:
+        """Yield rendered blocks in output order."""
         blocks = self.blocks
         if order is not None:
             blocks = self._sorter_registry.apply(blocks, order)
+        for b in blocks:
+            yield b.render()
 
-        rendered_blocks = [b.render() for b in blocks]
-        body = "\n\n".join(rendered_blocks)
+    def _iter_block_parts(
+        self, *, order: str | None = None
+    ) -> Iterator[tuple[Block | None, str]]:
+        """Like ``_iter_blocks`` but pairs each fragment with its block."""
+        blocks = self.blocks
+        if order is not None:
+            blocks = self._sorter_registry.apply(blocks, order)
+        for b in blocks:
+            yield b, b.render()
 
+    def _render_body(self, *, order: str | None = None) -> str:
+        """Build rendered document body."""
+        return self._wrap_body("\n\n".join(self._iter_blocks(order=order)))
+
+    def _iter_wrapped(self, fragments: Iterable[str]) -> Iterator[str]:
+        """Streaming counterpart of ``_wrap_body``.
+
+        Yields the prefix section, the fragments separated by blank lines,
+        and the suffix section; concatenated, the output equals
+        ``_wrap_body("\\n\\n".join(fragments))``.
+        """
+        for _, text in self._iter_wrapped_parts((None, f) for f in fragments):
+            yield text
+
+    def _iter_wrapped_parts(
+        self, parts: Iterable[tuple[Block | None, str]]
+    ) -> Iterator[tuple[Block | None, str]]:
+        """``_iter_wrapped`` over (block, fragment) pairs.
+
+        Prefix, suffix and separators are yielded with block None.
+        """
+        it = iter(parts)
+        first = next(it, None)
+        if first is not None and first[1] == "":
+            # A lone empty fragment is an empty body, which gets no section.
+            second = next(it, None)
+            if second is None:
+                first = None
+            else:
+                it = chain((second,), it)
+        started = False
+        if self._prefix:
+            yield None, self._prefix
+            started = True
+            yield None, "\n\n---"
+        if first is not None:
+            if started:
+                yield None, "\n\n"
+            started = True
+            yield first
+            for part in it:
+                yield None, "\n\n"
+                yield part
+        if self._suffix:
+            yield None, "\n\n---\n\n" if started else "---\n\n"
+            yield None, self._suffix
+
+    def _wrap_body(self, body: str) -> str:
+        """Surround a rendered body with prefix/suffix sections."""
         parts: list[str] = []
         if self._prefix:
             parts.append(self._prefix)
@@ -357,14 +589,160 @@ class Document:
             await self.ensure_meta(force=force)
         return self._render_body(order=order)
 
+    def iter_render(
+        self,
+        *,
+        order: str | None = None,
+        meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+    ) -> Iterator[str]:
+        """Yield the output of render() as consecutive fragments.
+
+        Only one block's text is held at a time, so very large documents can
+        be written out without building the whole string.
+        """
+        if meta_refresh != MetaRefreshMode.NONE:
+            force = meta_refresh == MetaRefreshMode.FORCE
+            asyncio.run(self.ensure_meta(force=force))
+        return self._iter_wrapped(self._iter_blocks(order=order))
+
+    def _iter_render_parts(
+        self,
+        *,
+        order: str | None = None,
+        meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+    ) -> Iterator[tuple[Block | None, str]]:
+        """iter_render() output paired with the block of each fragment."""
+        if meta_refresh != MetaRefreshMode.NONE:
+            force = meta_refresh == MetaRefreshMode.FORCE
+            asyncio.run(self.ensure_meta(force=force))
+        return self._iter_wrapped_parts(self._iter_block_parts(order=order))
+
+    def _iter_render_tokens(self, **kwargs) -> Iterator[tuple[Block | None, Sequence[int]]]:
+        """Yield the tokens of each render fragment with its block."""
+        tokenizer = self.tokenizer
+        frames = self._frame_tokens
+        for block, text in self._iter_render_parts(**kwargs):
+            if block is not None:
+                yield block, block_tokens(tokenizer, block, text)
+                continue
+            tokens = frames.get(text)
+            if tokens is None:
+                if len(frames) >= 64:
+                    frames.clear()
+                tokens = frames[text] = tokenizer.encode(text)
+            yield None, tokens
+
+    def count_tokens(self, **kwargs) -> TokenCounts:
+        """Count the tokens of render() output, in total and per block.
+
+        Takes the same keyword arguments as iter_render(). Each fragment is
+        tokenized on its own with ``tokenizer`` and the tokens are cached on
+        the block until it changes, so repeated renders only tokenize what
+        is new. Tokenizers may merge across the blank lines between blocks;
+        the per-fragment sum can then differ slightly from tokenizing the
+        whole text.
+        """
+        total = 0
+        blocks: dict[str, int] = {}
+        for block, tokens in self._iter_render_tokens(**kwargs):
+            total += len(tokens)
+            if block is not None:
+                blocks[block.id] = len(tokens)
+        return TokenCounts(total, blocks)
+
+    def render_tokens(self, **kwargs) -> list[int]:
+        """Return render() output as token IDs.
+
+        Takes the same keyword arguments as iter_render(). The IDs are the
+        cached per-fragment tokens of count_tokens(), concatenated.
+        """
+        ids: list[int] = []
+        for _, tokens in self._iter_render_tokens(**kwargs):
+            ids.extend(tokens)
+        return ids
+
+    def render_to(self, fp: IO, **kwargs) -> int:
+        """Write render() output to a text or binary stream.
+
+        Takes the same keyword arguments as iter_render(). Binary streams
+        receive UTF-8. Returns the number of characters (text) or bytes
+        (binary) written.
+        """
+        return _write_fragments(fp, self.iter_render(**kwargs))
+
+    def incremental(self) -> IncrementalRenderer:
+        """Return a renderer that re-renders this document by appending.
+
+        Suited to documents that mostly grow at the end; see
+        IncrementalRenderer.
+        """
+        from .incremental import IncrementalRenderer
+
+        return IncrementalRenderer(self)
+
+    def save_snapshot(self, path: str | os.PathLike[str]) -> int:
+        """Write a binary snapshot for fast reloading with load_snapshot().
+
+        Returns the number of bytes written.
+        """
+        from .snapshot import save_snapshot
+
+        return save_snapshot(self, path)
+
     async def ensure_meta(self, *, force: bool = False) -> None:
         """Apply generators to all blocks."""
         await self._generator_registry.apply_all(self, force=force)
 
 
+def _is_binary_stream(fp: IO) -> bool:
+    if isinstance(fp, io.TextIOBase):
+        return False
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    return "b" in getattr(fp, "mode", "")
+
+
+def _write_fragments(fp: IO, fragments: Iterable[str]) -> int:
+    """Write fragments to ``fp``, encoding to UTF-8 for binary streams."""
+    write = fp.write
+    written = 0
+    if _is_binary_stream(fp):
+        for fragment in fragments:
+            data = fragment.encode("utf-8")
+            write(data)
+            written += len(data)
+    else:
+        for fragment in fragments:
+            write(fragment)
+            written += len(fragment)
+    return written
+
+
+def shared_prefix(a: str, b: str, size_fn: Callable[[str], int] | None = None) -> int:
+    """Return the length of the common prefix of two renders.
+
+    The length is in characters, or measured by ``size_fn`` (e.g. a token
+    counter) when given. Prompt caches reuse work up to the first
+    difference, so this is the part of ``b`` a cache warmed by ``a`` can
+    serve. Slices are compared in halving steps, so the scan runs at
+    memory-compare speed.
+    """
+    lo, hi = 0, min(len(a), len(b))
+    if a[:hi] == b[:hi]:
+        lo = hi
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo if size_fn is None else size_fn(a[:lo])
+
+
 def create_llb(
     *,
     generators: list[MetaGenerator] | None = None,
     sorters: list[BlockSorter] | None = None,
+    vocab: Vocabulary | Literal[False] | None = None,
 ) -> Document:
-    return Document(generators, sorters)
+    return Document(generators, sorters, vocab=vocab)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .block import Block
+from .block import Block, _check_writable, _set
 
 if TYPE_CHECKING:
     from .document import Document
@@ -11,7 +11,10 @@ if TYPE_CHECKING:
 class Edge(Block):
     """Graph edge, renders as @edge."""
 
+    __slots__ = ("from_id", "to_id", "rel", "render_edge")
+
     _fields = Block._fields | frozenset({"from_id", "to_id", "rel", "render_edge"})
+    _tracked = Block._tracked | frozenset({"rel", "render_edge"})
 
     def __init__(
         self,
@@ -28,10 +31,25 @@ class Edge(Block):
         **kwargs: str,
     ) -> None:
         super().__init__(id, type, lang, meta, content, _doc, **kwargs)
-        self.from_id = from_id
-        self.to_id = to_id
-        self.rel = rel
-        self.render_edge = render_edge
+        if _doc is not None and _doc._vocab is not None:
+            rel = _doc._vocab.intern(rel)
+        _set(self, "from_id", from_id)
+        _set(self, "to_id", to_id)
+        _set(self, "rel", rel)
+        _set(self, "render_edge", render_edge)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == "from_id" or name == "to_id":
+            _check_writable(self._doc)
+            old = getattr(self, name)
+            _set(self, name, value)
+            if old != value:
+                doc = self._doc
+                if doc is not None:
+                    doc._edge_endpoint_changed(self, name, old)
+                self._changed(name)
+        else:
+            super().__setattr__(name, value)
 
     def render_header(self) -> str:
         """Return @edge header line."""
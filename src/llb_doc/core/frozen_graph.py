@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+from array import array
+from typing import AbstractSet, Iterable, Iterator, Mapping, NoReturn
+
+from .edge import Edge
+from .graph_document import GraphDocument
+from .node import Node
+
+
+def _int_typecode(limit: int) -> str:
+    return "i" if limit < 2**31 else "q"
+
+
+class _FrozenEdges(Mapping[str, Edge]):
+    """Edge ID -> edge view of a FrozenGraph, materializing edges on access."""
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: FrozenGraph) -> None:
+        self._graph = graph
+
+    def __getitem__(self, id_: str) -> Edge:
+        eid = self._graph._edge_numbers().get(id_)
+        if eid is None:
+            raise KeyError(id_)
+        return self._graph._materialize_edge(eid)
+
+    def __contains__(self, id_: object) -> bool:
+        return id_ in self._graph._edge_numbers()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graph._edge_ids)
+
+    def __len__(self) -> int:
+        return len(self._graph._edge_ids)
+
+    def values(self) -> Iterator[Edge]:  # type: ignore[override]
+        graph = self._graph
+        return map(graph._materialize_edge, range(len(graph._edge_ids)))
+
+
+class FrozenGraph(GraphDocument):
+    """Immutable, array-backed snapshot of a GraphDocument.
+
+    Node IDs (and any dangling edge endpoints) are interned to dense ints.
+    Topology is stored per direction in CSR form: ``offsets[u]`` to
+    ``offsets[u + 1]`` indexes into parallel ``neighbors`` / ``edge ids``
+    arrays. Edges without meta, content, lang or a custom type are kept only
+    as array entries and materialized as Edge blocks when rendered.
+
+    Nodes and edges returned by the snapshot are read-only as well:
+    changing their meta, content or other rendered fields raises TypeError.
+    Use overlay() for an editable view.
+    """
+
+    def __init__(self, source: GraphDocument) -> None:
+        super().__init__(source.graph_id, vocab=source._vocab or False)
+        self._sorter_registry = source._sorter_registry
+        self._generator_registry = source._generator_registry
+        self._prefix = source._prefix
+        self._suffix = source._suffix
+        self._ctx = source._ctx
+        self._tokenizer = source._tokenizer
+        # Unused here; overlays of the snapshot continue from them
+        self._node_id_gen = source._node_id_gen.copy()
+        self._edge_id_gen = source._edge_id_gen.copy()
+
+        for node in source._node_index.values():
+            copy = Node(
+                id=node.id,
+                type=node.type,
+                lang=node.lang,
+                meta=node._meta,
+                content=node.content,
+                _doc=self,
+            )
+            self._node_index[node.id] = copy
+
+        ids: list[str] = list(self._node_index)
+        num: dict[str, int] = {id_: i for i, id_ in enumerate(ids)}
+        self._num_nodes = len(ids)
+
+        rels: list[str] = []
+        rel_num: dict[str, int] = {}
+        edges = list(source._edge_index.values())
+        tc = _int_typecode(max(len(edges), len(ids)) + 1)
+        src = array(tc)
+        dst = array(tc)
+        rel = array(tc)
+        render = bytearray()
+        edge_ids: list[str] = []
+        extra: dict[int, Edge] = {}
+
+        for i, e in enumerate(edges):
+            for endpoint in (e.from_id, e.to_id):
+                if endpoint not in num:
+                    num[endpoint] = len(ids)
+                    ids.append(endpoint)
+            r = rel_num.get(e.rel)
+            if r is None:
+                r = rel_num[e.rel] = len(rels)
+                rels.append(e.rel)
+            src.append(num[e.from_id])
+            dst.append(num[e.to_id])
+            rel.append(r)
+            render.append(1 if e.render_edge else 0)
+            edge_ids.append(e.id)
+            if e._meta or e.content or e.lang or e.type != "edge":
+                extra[i] = Edge(
+                    id=e.id,
+                    from_id=e.from_id,
+                    to_id=e.to_id,
+                    rel=e.rel,
+                    type=e.type,
+                    lang=e.lang,
+                    meta=e._meta,
+                    content=e.content,
+                    render_edge=e.render_edge,
+                    _doc=self,
+                )
+
+        self._ids = ids
+        self._num = num
+        self._rels = rels
+        self._edge_src = src
+        self._edge_dst = dst
+        self._edge_rel = rel
+        self._edge_render = render
+        self._edge_ids = edge_ids
+        self._edge_extra = extra
+        self._edge_num: dict[str, int] | None = None
+        self._out_offsets, self._out_nbrs, self._out_eids = self._build_csr(src, dst, tc)
+        self._in_offsets, self._in_nbrs, self._in_eids = self._build_csr(dst, src, tc)
+
+    def _build_csr(
+        self, keys: array, values: array, tc: str
+    ) -> tuple[array, array, array]:
+        """Counting-sort edges by key; rows keep edge insertion order."""
+        n = len(self._ids)
+        offsets = array(tc, [0]) * (n + 1)
+        for k in keys:
+            offsets[k + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        cursor = array(tc, offsets[:-1])
+        nbrs = array(tc, [0]) * len(keys)
+        eids = array(tc, [0]) * len(keys)
+        for eid, k in enumerate(keys):
+            pos = cursor[k]
+            nbrs[pos] = values[eid]
+            eids[pos] = eid
+            cursor[k] = pos + 1
+        return offsets, nbrs, eids
+
+    def __getstate__(self) -> dict[str, object]:
+        # Arrays of a loaded snapshot are views of the mapped file
+        state = super().__getstate__()
+        for key, value in state.items():
+            if isinstance(value, memoryview):
+                state[key] = array(value.format, value) if value.format != "B" else bytearray(value)
+        return state
+
+    # ==================== Read access ====================
+
+    @property
+    def edges(self) -> list[Edge]:
+        return [self._materialize_edge(i) for i in range(len(self._edge_ids))]
+
+    def _materialize_edge(self, eid: int) -> Edge:
+        edge = self._edge_extra.get(eid)
+        if edge is not None:
+            return edge
+        return Edge(
+            id=self._edge_ids[eid],
+            from_id=self._ids[self._edge_src[eid]],
+            to_id=self._ids[self._edge_dst[eid]],
+            rel=self._rels[self._edge_rel[eid]],
+            render_edge=bool(self._edge_render[eid]),
+            _doc=self,
+        )
+
+    def _edge_numbers(self) -> dict[str, int]:
+        if self._edge_num is None:
+            self._edge_num = {e: i for i, e in enumerate(self._edge_ids)}
+        return self._edge_num
+
+    def get_edge(self, id_: str) -> Edge | None:
+        eid = self._edge_numbers().get(id_)
+        return None if eid is None else self._materialize_edge(eid)
+
+    def get_edges_from(self, node_id: str) -> list[Edge]:
+        u = self._num.get(node_id)
+        if u is None:
+            return []
+        eids = self._out_eids[self._out_offsets[u] : self._out_offsets[u + 1]]
+        return [self._materialize_edge(i) for i in eids]
+
+    def get_edges_to(self, node_id: str) -> list[Edge]:
+        u = self._num.get(node_id)
+        if u is None:
+            return []
+        eids = self._in_eids[self._in_offsets[u] : self._in_offsets[u + 1]]
+        return [self._materialize_edge(i) for i in eids]
+
+    def get_edges_between(
+        self, from_id: str, to_id: str, rel: str | None = None
+    ) -> list[Edge]:
+        return [self._materialize_edge(e) for e in self._eids_between(from_id, to_id, rel)]
+
+    def has_edge(self, from_id: str, to_id: str, rel: str | None = None) -> bool:
+        return next(iter(self._eids_between(from_id, to_id, rel)), None) is not None
+
+    def _edges_from(self, node_id: str) -> Iterable[Edge]:
+        return self.get_edges_from(node_id)
+
+    def _edges_to(self, node_id: str) -> Iterable[Edge]:
+        return self.get_edges_to(node_id)
+
+    def _pair_edges(self, from_id: str, to_id: str) -> list[Edge]:
+        return self.get_edges_between(from_id, to_id)
+
+    def _edge_position(self, id_: str) -> int:
+        return self._edge_numbers()[id_]
+
+    def _edge_map(self) -> Mapping[str, Edge]:
+        return _FrozenEdges(self)
+
+    def _eids_between(self, from_id: str, to_id: str, rel: str | None) -> Iterator[int]:
+        """Scan the CSR row of ``from_id`` for edges to ``to_id``."""
+        u = self._num.get(from_id)
+        v = self._num.get(to_id)
+        if u is None or v is None:
+            return
+        if rel is not None:
+            if rel not in self._rels:
+                return
+            r = self._rels.index(rel)
+        lo, hi = self._out_offsets[u], self._out_offsets[u + 1]
+        for w, e in zip(self._out_nbrs[lo:hi], self._out_eids[lo:hi]):
+            if w == v and (rel is None or self._edge_rel[e] == r):
+                yield e
+
+    def freeze(self) -> FrozenGraph:
+        return self
+
+    async def ensure_meta(self, *, force: bool = False) -> None:
+        """Frozen snapshots keep the meta they were built with."""
+
+    # ==================== Traversal ====================
+
+    def _bfs_levels(self, seeds: list[str], radius: int) -> Iterator[list[str]]:
+        """Yield node IDs tier by tier using a level-synchronous BFS on CSR."""
+        n = self._num_nodes
+        ids = self._ids
+        out_off, out_nbr = self._out_offsets, self._out_nbrs
+        in_off, in_nbr = self._in_offsets, self._in_nbrs
+        frontier = [self._num[seed] for seed in seeds]
+        visited: set[int] = set(frontier)
+        yield list(seeds)
+        for _ in range(radius):
+            nxt: list[int] = []
+            for u in frontier:
+                for v in out_nbr[out_off[u] : out_off[u + 1]]:
+                    if v < n and v not in visited:
+                        visited.add(v)
+                        nxt.append(v)
+                for v in in_nbr[in_off[u] : in_off[u + 1]]:
+                    if v < n and v not in visited:
+                        visited.add(v)
+                        nxt.append(v)
+            if not nxt:
+                return
+            yield [ids[u] for u in nxt]
+            frontier = nxt
+
+    def _collect_in_out_edges(
+        self,
+        included_nodes: AbstractSet[str],
+        node_ids: Iterable[str] | None = None,
+    ) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+        """Return in/out edge labels from the CSR rows of included nodes."""
+        ids, rels, rel_of = self._ids, self._rels, self._edge_rel
+        if node_ids is None:
+            node_ids = included_nodes
+        if len(included_nodes) == self._num_nodes:
+            included: AbstractSet[int] = range(self._num_nodes)
+        else:
+            included = {self._num[nid] for nid in included_nodes}
+        in_map: dict[str, list[str]] = {}
+        out_map: dict[str, list[str]] = {}
+        for node_id in node_ids:
+            u = self._num[node_id]
+            lo, hi = self._in_offsets[u], self._in_offsets[u + 1]
+            in_map[node_id] = [
+                f"{ids[v]}:{rels[rel_of[e]]}"
+                for v, e in zip(self._in_nbrs[lo:hi], self._in_eids[lo:hi])
+                if v in included
+            ]
+            lo, hi = self._out_offsets[u], self._out_offsets[u + 1]
+            out_map[node_id] = [
+                f"{ids[v]}:{rels[rel_of[e]]}"
+                for v, e in zip(self._out_nbrs[lo:hi], self._out_eids[lo:hi])
+                if v in included
+            ]
+        return in_map, out_map
+
+    def _select_edges(self, included_nodes: set[str]) -> list[Edge]:
+        """Return renderable edges between included nodes, in insertion order."""
+        included = {self._num[nid] for nid in included_nodes}
+        render = self._edge_render
+        selected: list[int] = []
+        for u in included:
+            lo, hi = self._out_offsets[u], self._out_offsets[u + 1]
+            for v, e in zip(self._out_nbrs[lo:hi], self._out_eids[lo:hi]):
+                if v in included and render[e]:
+                    selected.append(e)
+        selected.sort()
+        return [self._materialize_edge(e) for e in selected]
+
+    # ==================== Mutation is not supported ====================
+
+    _read_only = True
+
+    def _readonly(self, *args: object, **kwargs: object) -> NoReturn:
+        raise TypeError("FrozenGraph is immutable")
+
+    node = _readonly  # type: ignore[assignment]
+    edge = _readonly  # type: ignore[assignment]
+    add_node = _readonly  # type: ignore[assignment]
+    remove_node = _readonly  # type: ignore[assignment]
+    add_edge = _readonly  # type: ignore[assignment]
+    add_nodes_from = _readonly  # type: ignore[assignment]
+    add_edges_from = _readonly  # type: ignore[assignment]
+    add_blocks_from = _readonly  # type: ignore[assignment]
+    remove_edge = _readonly  # type: ignore[assignment]
+    block = _readonly  # type: ignore[assignment]
+    add_block = _readonly  # type: ignore[assignment]
+    remove_block = _readonly  # type: ignore[assignment]
+    replace_block = _readonly  # type: ignore[assignment]
+    set_block = _readonly  # type: ignore[assignment]
+    move_block = _readonly  # type: ignore[assignment]
+    swap_blocks = _readonly  # type: ignore[assignment]
+    reorder_blocks = _readonly  # type: ignore[assignment]
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value: str) -> None:
+        self._readonly()
+
+    @property
+    def suffix(self) -> str:
+        return self._suffix
+
+    @suffix.setter
+    def suffix(self, value: str) -> None:
+        self._readonly()
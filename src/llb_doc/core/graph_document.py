@@ -1,24 +1,62 @@
 from __future__ import annotations
 
 import asyncio
-from collections import deque
-from typing import Callable, Self, Sequence, Union
-
-from .block import Block
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Callable,
+    IO,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    Self,
+    Sequence,
+    Union,
+)
+from weakref import WeakSet
+
+from .block import Block, _set
+from .bulk import Rows, assign_ids, gc_paused, normalize_rows
 from .ctx import Ctx
-from .document import Document, IDGenerator, MetaRefreshMode
+from .document import Document, IDGenerator, MetaRefreshMode, _write_fragments
 from .edge import Edge
 from .node import Node
+from .render_state import RenderState, render_state
+from .vocab import Vocabulary
 
+from ..cache.render_cache import RenderCache
 from ..generators.registry import MetaGenerator
 from ..sorters.registry import BlockSorter, block_sorter
 
+if TYPE_CHECKING:
+    from .frozen_graph import FrozenGraph
+    from .overlay import OverlayGraph
+    from .session import RenderSession
+
 # Type for items in render_free: either a string ID or a tuple (ID, brief)
 ItemSpec = Union[str, tuple[str, bool]]
 
 # Type for custom brief renderer function
 BriefRenderer = Callable[[Block], str]
 
+# Size measure for budgeted rendering, e.g. len or a token counter
+SizeFunction = Callable[[str], int]
+
+# Sort key ranking candidate nodes within a tier (lower renders first)
+NodePriority = Callable[[Node], Any]
+
+# What add_edge does when an edge with the same (from_id, to_id, rel) exists
+OnDuplicate = Literal["allow", "skip", "replace", "error"]
+
+_NO_EDGES: dict[str, Edge] = {}
+
+# Size below which the session revision log is never pruned
+_REVISION_LOG_MIN = 1024
+
 
 class NodeNotFoundError(KeyError):
     """Raised when a node with the given ID is not found."""
@@ -28,6 +66,16 @@ class NodeNotFoundError(KeyError):
         self.id = id_
 
 
+class DuplicateEdgeError(ValueError):
+    """Raised when an edge with the same endpoints and relation exists."""
+
+    def __init__(self, from_id: str, to_id: str, rel: str) -> None:
+        super().__init__(f"Edge '{from_id}' -> '{to_id}' ({rel}) already exists")
+        self.from_id = from_id
+        self.to_id = to_id
+        self.rel = rel
+
+
 class NodeBuilder:
     """Builder for creating nodes."""
 
@@ -62,8 +110,8 @@ class NodeBuilder:
             content=self._content,
             _doc=self._doc,
         )
-        self._doc._node_order.append(node_id)
         self._doc._node_index[node_id] = node
+        self._doc._nodes_added((node_id,))
         return node
 
     def __enter__(self) -> Node:
@@ -81,8 +129,8 @@ class NodeBuilder:
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         if exc_type is None:
-            self._doc._node_order.append(self._node.id)
             self._doc._node_index[self._node.id] = self._node
+            self._doc._nodes_added((self._node.id,))
 
 
 class EdgeBuilder:
@@ -130,30 +178,26 @@ class EdgeBuilder:
         self._render_edge = render
         return self
 
-    def add(self) -> Edge:
-        edge_id = self._id or self._doc._generate_edge_id()
-        edge = Edge(
-            id=edge_id,
-            from_id=self._from_id,
-            to_id=self._to_id,
-            rel=self._rel,
-            type=self._type,
+    def add(self, on_duplicate: OnDuplicate = "allow") -> Edge:
+        return self._doc.add_edge(
+            self._from_id,
+            self._to_id,
+            self._rel,
+            type_=self._type,
             lang=self._lang,
-            meta=self._meta,
+            id_=self._id,
             content=self._content,
             render_edge=self._render_edge,
-            _doc=self._doc,
+            on_duplicate=on_duplicate,
+            **self._meta,
         )
-        self._doc._edges.append(edge)
-        self._doc._edge_index[edge_id] = edge
-        return edge
 
 
 @block_sorter("focus_last")
 def _focus_last_sort(blocks: list[Block]) -> list[Block]:
     """ctx -> (tier desc: nodes + edges per tier) -> focus"""
     ctx_blocks: list[Ctx] = []
-    focus_node: Node | None = None
+    focus_nodes: list[Node] = []
     node_tiers: dict[str, int] = {}
     nodes_by_tier: dict[int, list[Node]] = {}
     edges: list[Edge] = []
@@ -163,7 +207,7 @@ def _focus_last_sort(blocks: list[Block]) -> list[Block]:
             ctx_blocks.append(b)
         elif isinstance(b, Node):
             if b.tier == 0:
-                focus_node = b
+                focus_nodes.append(b)
                 node_tiers[b.id] = 0
             else:
                 tier = b.tier or 0
@@ -195,8 +239,7 @@ def _focus_last_sort(blocks: list[Block]) -> list[Block]:
         if tier in edges_by_tier:
             result.extend(edges_by_tier[tier])
 
-    if focus_node:
-        result.append(focus_node)
+    result.extend(focus_nodes)
     return result
 
 
@@ -204,7 +247,7 @@ def _focus_last_sort(blocks: list[Block]) -> list[Block]:
 def _focus_first_sort(blocks: list[Block]) -> list[Block]:
     """ctx -> focus -> (tier asc: nodes + edges per tier)"""
     ctx_blocks: list[Ctx] = []
-    focus_node: Node | None = None
+    focus_nodes: list[Node] = []
     node_tiers: dict[str, int] = {}
     nodes_by_tier: dict[int, list[Node]] = {}
     edges: list[Edge] = []
@@ -214,7 +257,7 @@ def _focus_first_sort(blocks: list[Block]) -> list[Block]:
             ctx_blocks.append(b)
         elif isinstance(b, Node):
             if b.tier == 0:
-                focus_node = b
+                focus_nodes.append(b)
                 node_tiers[b.id] = 0
             else:
                 tier = b.tier or 0
@@ -237,8 +280,7 @@ def _focus_first_sort(blocks: list[Block]) -> list[Block]:
     result: list[Block] = []
     result.extend(ctx_blocks)
 
-    if focus_node:
-        result.append(focus_node)
+    result.extend(focus_nodes)
 
     all_tiers = sorted(set(nodes_by_tier.keys()) | set(edges_by_tier.keys()))
     for tier in all_tiers:
@@ -298,7 +340,90 @@ def _tier_desc_sort(blocks: list[Block]) -> list[Block]:
     return result
 
 
-GRAPH_SORTERS = [_focus_last_sort, _focus_first_sort, _tier_asc_sort, _tier_desc_sort]
+def _id_key(id_: str) -> tuple[int, str]:
+    """Order IDs shorter first, so generated IDs (N9, NA, N10) sort by age."""
+    return len(id_), id_
+
+
+@block_sorter("stable")
+def _stable_sort(blocks: list[Block]) -> list[Block]:
+    """(tier asc: nodes by ID, then edges by ID) -> ctx
+
+    The order depends only on the rendered blocks, not on hashing or
+    insertion history, so equal contexts render identically in any
+    process. The blocks least likely to change lead: seeds and inner
+    tiers, whose edge lists cover all their neighbours, before the outer
+    tier; within a tier, older (generated) IDs first. The ctx block, whose
+    ID and tiers change with every render, goes last, so consecutive
+    renders share the longest common prefix.
+    """
+    ctx_blocks: list[Block] = []
+    node_tiers: dict[str, int] = {}
+    keyed: list[tuple[int, int, tuple[int, str], Block]] = []
+
+    for b in blocks:
+        if isinstance(b, Node):
+            tier = node_tiers[b.id] = b.tier or 0
+            keyed.append((tier, 0, _id_key(b.id), b))
+    for b in blocks:
+        if isinstance(b, Ctx):
+            ctx_blocks.append(b)
+        elif isinstance(b, Edge):
+            tier = max(node_tiers.get(b.from_id, 0), node_tiers.get(b.to_id, 0))
+            keyed.append((tier, 1, _id_key(b.id), b))
+
+    keyed.sort(key=lambda item: item[:3])
+    result: list[Block] = [item[3] for item in keyed]
+    result.extend(ctx_blocks)
+    return result
+
+
+GRAPH_SORTERS = [
+    _focus_last_sort,
+    _focus_first_sort,
+    _tier_asc_sort,
+    _tier_desc_sort,
+    _stable_sort,
+]
+
+
+_worker_graph: GraphDocument | None = None
+_worker_fragments: dict[tuple[bool, str], str] = {}
+
+
+def _init_render_worker(graph: GraphDocument) -> None:
+    global _worker_graph
+    _worker_graph = graph
+    _worker_fragments.clear()
+
+
+def _render_chunk(
+    jobs: list[tuple[str | Sequence[str], str]], options: dict
+) -> list[tuple[str | Sequence[str], str]]:
+    """Render a chunk of (focus, ctx_id) jobs inside a render_many worker."""
+    assert _worker_graph is not None
+    return [
+        (
+            focus,
+            _worker_graph._render_graph_body(
+                focus=focus, ctx_id=ctx_id, fragments=_worker_fragments, **options
+            ),
+        )
+        for focus, ctx_id in jobs
+    ]
+
+
+def _check_on_duplicate(on_duplicate: str) -> None:
+    if on_duplicate not in ("allow", "skip", "replace", "error"):
+        raise ValueError(f"Unknown on_duplicate mode: {on_duplicate!r}")
+
+
+_NODE_COLUMNS = ("id", "type", "content", "meta")
+_NODE_FIELDS = frozenset({"id", "type", "lang", "content", "meta"})
+_EDGE_COLUMNS = ("from_id", "to_id", "rel", "meta")
+_EDGE_FIELDS = frozenset(
+    {"id", "from_id", "to_id", "rel", "type", "lang", "content", "render_edge", "meta"}
+)
 
 
 class GraphDocument(Document):
@@ -309,20 +434,40 @@ class GraphDocument(Document):
         graph_id: str | None = None,
         generators: list[MetaGenerator] | None = None,
         sorters: list[BlockSorter] | None = None,
+        *,
+        vocab: Vocabulary | Literal[False] | None = None,
     ) -> None:
         all_sorters = list(GRAPH_SORTERS)
         if sorters:
             all_sorters.extend(sorters)
-        super().__init__(generators, all_sorters)
+        super().__init__(generators, all_sorters, vocab=vocab)
 
         self.graph_id = graph_id
         self._node_id_gen = IDGenerator("N")
         self._edge_id_gen = IDGenerator("E")
         self._ctx_id_gen = IDGenerator("C")
-        self._node_order: list[str] = []
+        # Nodes and edges are never reordered, so the insertion-ordered
+        # indexes double as order lists; dict deletion tombstones the slot
+        # and compacts on resize.
         self._node_index: dict[str, Node] = {}
-        self._edges: list[Edge] = []
         self._edge_index: dict[str, Edge] = {}
+        self._edge_seq: dict[str, int] = {}
+        self._edge_counter = 0
+        # node_id -> {edge_id: edge}, kept in edge insertion order
+        self._out_adj: dict[str, dict[str, Edge]] = {}
+        self._in_adj: dict[str, dict[str, Edge]] = {}
+        # (from_id, to_id) -> the edge, or a list of parallel edges in
+        # insertion order; most pairs have one edge, so no list is allocated
+        self._pairs: dict[tuple[str, str], Edge | list[Edge]] = {}
+        self._render_cache: RenderCache | None = None
+        # (is_edge, id) -> version of the last change, kept while render
+        # sessions exist; every block counts as changed at _revision_floor
+        self._revisions: dict[tuple[bool, str], int] | None = None
+        self._revision_floor = 0
+        self._revision_limit = _REVISION_LOG_MIN
+        self._sessions: WeakSet[RenderSession] | None = None
+        # @ctx block read back by parse_graph
+        self._ctx: Ctx | None = None
 
     def _generate_node_id(self) -> str:
         while True:
@@ -339,19 +484,265 @@ class GraphDocument(Document):
     def _generate_ctx_id(self) -> str:
         return self._ctx_id_gen.next()
 
+    def _endpoint(self, id_: str) -> str:
+        """Return the node's own ID object for an edge endpoint, if it exists.
+
+        Endpoints read from parsers or loaders are equal but distinct
+        strings; sharing the node's ID saves one string per endpoint.
+        """
+        node = self._node_index.get(id_)
+        return id_ if node is None else node.id
+
     def _validate_unique_node_id(self, id_: str) -> None:
         if id_ in self._node_index:
             from .document import DuplicateIDError
 
             raise DuplicateIDError(id_)
 
+    def _validate_unique_edge_id(self, id_: str) -> None:
+        if id_ in self._edge_index:
+            from .document import DuplicateIDError
+
+            raise DuplicateIDError(id_)
+
+    def _insert_edge(self, edge: Edge) -> None:
+        """Store edge and register it in the adjacency index."""
+        self._edge_index[edge.id] = edge
+        self._edge_seq[edge.id] = self._edge_counter
+        self._edge_counter += 1
+        self._out_adj.setdefault(edge.from_id, {})[edge.id] = edge
+        self._in_adj.setdefault(edge.to_id, {})[edge.id] = edge
+        self._link_pair(edge, edge.from_id, edge.to_id)
+        self._topology_changed(edge.from_id, edge.to_id)
+
+    def _link_pair(self, edge: Edge, from_id: str, to_id: str) -> None:
+        key = (from_id, to_id)
+        found = self._pairs.get(key)
+        if found is None:
+            self._pairs[key] = edge
+        elif type(found) is list:
+            found.append(edge)
+        else:
+            self._pairs[key] = [found, edge]  # type: ignore[list-item]
+
+    def _unlink_pair(self, edge: Edge, from_id: str, to_id: str) -> None:
+        key = (from_id, to_id)
+        found = self._pairs.get(key)
+        if found is edge:
+            del self._pairs[key]
+        elif type(found) is list:
+            found.remove(edge)
+            if len(found) == 1:
+                self._pairs[key] = found[0]
+
+    def _pair_edges(self, from_id: str, to_id: str) -> list[Edge]:
+        found = self._pairs.get((from_id, to_id))
+        if found is None:
+            return []
+        return list(found) if type(found) is list else [found]  # type: ignore[list-item]
+
+    def _edges_from(self, node_id: str) -> Iterable[Edge]:
+        """Out-edges of ``node_id`` in insertion order, without copying."""
+        return self._out_adj.get(node_id, _NO_EDGES).values()
+
+    def _edges_to(self, node_id: str) -> Iterable[Edge]:
+        """In-edges of ``node_id`` in insertion order, without copying."""
+        return self._in_adj.get(node_id, _NO_EDGES).values()
+
+    def _edge_position(self, id_: str) -> int:
+        """Rank of edge ``id_`` in insertion order."""
+        return self._edge_seq[id_]
+
+    def _edge_map(self) -> Mapping[str, Edge]:
+        """Edge ID -> edge in insertion order."""
+        return self._edge_index
+
+    def _replace_edge(self, old: Edge, edge: Edge) -> None:
+        """Put ``edge`` in the place of ``old``, which has the same ID and endpoints."""
+        self._edge_index[edge.id] = edge
+        self._out_adj[edge.from_id][edge.id] = edge
+        self._in_adj[edge.to_id][edge.id] = edge
+        key = (edge.from_id, edge.to_id)
+        found = self._pairs[key]
+        if found is old:
+            self._pairs[key] = edge
+        else:
+            found[found.index(old)] = edge  # type: ignore[union-attr]
+        old._doc = None
+        self._topology_changed(edge.from_id, edge.to_id)
+        self._revised(True, edge.id)
+
+    def _unindex_edge(self, edge: Edge) -> None:
+        """Drop edge from id and adjacency indexes in O(1)."""
+        del self._edge_index[edge.id]
+        del self._edge_seq[edge.id]
+        out = self._out_adj.get(edge.from_id)
+        if out is not None:
+            out.pop(edge.id, None)
+            if not out:
+                del self._out_adj[edge.from_id]
+        inc = self._in_adj.get(edge.to_id)
+        if inc is not None:
+            inc.pop(edge.id, None)
+            if not inc:
+                del self._in_adj[edge.to_id]
+        self._unlink_pair(edge, edge.from_id, edge.to_id)
+        self._topology_changed(edge.from_id, edge.to_id)
+        self._revised(True, edge.id)
+
+    def _edge_endpoint_changed(self, edge: Edge, name: str, old: str) -> None:
+        """Move an edge in the adjacency index after from_id/to_id changed.
+
+        The edge keeps its insertion-order place among the edges of its new
+        endpoint.
+        """
+        if self._edge_index.get(edge.id) is not edge:
+            return
+        if name == "from_id":
+            out = self._out_adj.get(old, {})
+            out.pop(edge.id, None)
+            if not out:
+                self._out_adj.pop(old, None)
+            self._adj_insert(self._out_adj, edge.from_id, edge)
+            self._unlink_pair(edge, old, edge.to_id)
+        else:
+            inc = self._in_adj.get(old, {})
+            inc.pop(edge.id, None)
+            if not inc:
+                self._in_adj.pop(old, None)
+            self._adj_insert(self._in_adj, edge.to_id, edge)
+            self._unlink_pair(edge, edge.from_id, old)
+        self._link_pair(edge, edge.from_id, edge.to_id)
+        found = self._pairs[(edge.from_id, edge.to_id)]
+        if type(found) is list:
+            found.sort(key=lambda e: self._edge_position(e.id))  # type: ignore[union-attr]
+        self._topology_changed(old, edge.from_id, edge.to_id)
+
+    def _adj_insert(
+        self, adj: dict[str, dict[str, Edge]], node_id: str, edge: Edge
+    ) -> None:
+        """Add ``edge`` to ``adj[node_id]`` at its insertion-order place."""
+        edges = adj.get(node_id)
+        if not edges:
+            adj[node_id] = {edge.id: edge}
+            return
+        position = self._edge_position
+        last = next(reversed(edges))
+        edges[edge.id] = edge
+        if position(edge.id) < position(last):
+            adj[node_id] = {id_: edges[id_] for id_ in sorted(edges, key=position)}
+
+    # ==================== Versioning & render cache ====================
+
+    def _topology_changed(self, *node_ids: str) -> None:
+        self._touch()
+        if self._render_cache is not None:
+            self._render_cache.invalidate_nodes(node_ids)
+
+    def _nodes_added(self, node_ids: Iterable[str]) -> None:
+        """Drop cached renders that reach the new nodes through their edges.
+
+        Edges may point at an ID before a node has it; renders near such a
+        dangling endpoint left the node out and must pick it up now.
+        """
+        self._touch()
+        if self._render_cache is None:
+            return
+        affected: list[str] = []
+        for id_ in node_ids:
+            affected.append(id_)
+            affected.extend(e.to_id for e in self._edges_from(id_))
+            affected.extend(e.from_id for e in self._edges_to(id_))
+        self._render_cache.invalidate_nodes(affected)
+
+    def _block_changed(self, block: Block, name: str) -> None:
+        if isinstance(block, Edge):
+            self._topology_changed(block.from_id, block.to_id)
+            self._revised(True, block.id)
+        else:
+            self._topology_changed(block.id)
+            self._revised(False, block.id)
+
+    def _revised(self, is_edge: bool, id_: str) -> None:
+        """Record a change or removal of a block for render sessions."""
+        revisions = self._revisions
+        if revisions is not None:
+            revisions[(is_edge, id_)] = self._version
+            if len(revisions) > self._revision_limit:
+                self._prune_revisions()
+
+    def _prune_revisions(self) -> None:
+        """Drop revisions that every live session has rendered past.
+
+        A session compares revisions with the version of its last turn, so
+        older entries cannot mark anything changed. Runs when the log has
+        doubled since the last pruning, keeping _revised() amortized O(1);
+        logging stops once no session is left.
+        """
+        synced = [s._synced for s in self._sessions or () if s._synced is not None]
+        if synced:
+            oldest = min(synced)
+            self._revisions = {k: v for k, v in self._revisions.items() if v > oldest}
+        elif self._sessions:
+            self._revisions = {}
+        else:
+            self._revisions = None
+            self._sessions = None
+        self._revision_limit = max(2 * len(self._revisions or ()), _REVISION_LOG_MIN)
+
+    def _frame_changed(self) -> None:
+        self._touch()
+        if self._render_cache is not None:
+            self._render_cache.clear()
+
+    @property
+    def render_cache(self) -> RenderCache | None:
+        return self._render_cache
+
+    def enable_render_cache(self, maxsize: int = 1024) -> RenderCache:
+        """Cache tiers and rendered text of focused renders (opt-in).
+
+        Entries are keyed by focus, radius, strategy, order and ctx args and
+        are dropped when a node or edge in their neighbourhood changes. Cache
+        hits return the stored text unchanged, including its @ctx ID.
+        Budgeted renders are not cached.
+        """
+        if self._render_cache is None or self._render_cache.maxsize != maxsize:
+            self._render_cache = RenderCache(maxsize)
+        return self._render_cache
+
+    def disable_render_cache(self) -> None:
+        self._render_cache = None
+
+    def session(self) -> RenderSession:
+        """Start a multi-turn render session over this graph.
+
+        Each turn emits only the blocks that are new or changed since the
+        previous ones; see RenderSession.
+        """
+        from .session import RenderSession
+
+        return RenderSession(self)
+
+    def __getstate__(self) -> dict[str, object]:
+        # Render sessions stay with the original graph
+        state = self.__dict__.copy()
+        state["_revisions"] = None
+        state["_sessions"] = None
+        return state
+
+    @property
+    def ctx(self) -> Ctx | None:
+        """The @ctx block of a parsed graph (see parse_graph), else None."""
+        return self._ctx
+
     @property
     def nodes(self) -> list[Node]:
-        return [self._node_index[id_] for id_ in self._node_order]
+        return list(self._node_index.values())
 
     @property
     def edges(self) -> list[Edge]:
-        return list(self._edges)
+        return list(self._edge_index.values())
 
     def node(self, type_: str, lang: str | None = None) -> NodeBuilder:
         return NodeBuilder(self, type_, lang)
@@ -375,10 +766,32 @@ class GraphDocument(Document):
             content=content,
             _doc=self,
         )
-        self._node_order.append(node_id)
         self._node_index[node_id] = node
+        self._nodes_added((node_id,))
         return node
 
+    def add_nodes_from(self, nodes: Rows) -> list[Node]:
+        """Add many nodes at once.
+
+        ``nodes`` is an iterable of ``(id, type[, content[, meta]])`` tuples
+        (``id`` may be None) or of dicts with ``id``, ``type``, ``lang``,
+        ``content`` and ``meta`` keys, or a dict of equal-length columns
+        under the same names. Other keys become meta entries. IDs are checked
+        for duplicates before any node is added.
+        """
+        with gc_paused():
+            rows = normalize_rows(nodes, _NODE_COLUMNS, 2, _NODE_FIELDS)
+            ids = assign_ids(rows, self._node_index, self._node_id_gen.take)
+            created: list[Node] = []
+            for i, (row, id_) in enumerate(zip(rows, ids)):
+                if "type" not in row:
+                    raise ValueError(f"Node row {i} has no type")
+                row["id"] = id_
+                created.append(Node(_doc=self, **row))
+            self._node_index.update(zip(ids, created))
+        self._nodes_added(ids)
+        return created
+
     def get_node(self, id_: str) -> Node | None:
         return self._node_index.get(id_)
 
@@ -389,14 +802,16 @@ class GraphDocument(Document):
         if id_ not in self._node_index:
             raise NodeNotFoundError(id_)
         node = self._node_index.pop(id_)
-        self._node_order.remove(id_)
         node._doc = None
-        self._edges = [e for e in self._edges if e.from_id != id_ and e.to_id != id_]
-        self._edge_index = {
-            k: v
-            for k, v in self._edge_index.items()
-            if v.from_id != id_ and v.to_id != id_
+        incident = {
+            **self._out_adj.get(id_, {}),
+            **self._in_adj.get(id_, {}),
         }
+        for edge in incident.values():
+            self._unindex_edge(edge)
+            edge._doc = None
+        self._topology_changed(id_)
+        self._revised(False, id_)
         return node
 
     def edge(self, from_id: str, to_id: str, rel: str) -> EdgeBuilder:
@@ -413,13 +828,39 @@ class GraphDocument(Document):
         id_: str | None = None,
         content: str = "",
         render_edge: bool = True,
+        on_duplicate: OnDuplicate = "allow",
         **meta: str,
     ) -> Edge:
+        """Add an edge between two nodes.
+
+        ``on_duplicate`` decides what happens when an edge with the same
+        ``from_id``, ``to_id`` and ``rel`` already exists: ``"allow"`` adds a
+        parallel edge, ``"skip"`` returns the existing edge unchanged,
+        ``"replace"`` swaps in the new edge under the existing edge's ID and
+        position, and ``"error"`` raises DuplicateEdgeError.
+        """
+        if on_duplicate != "allow":
+            existing = self._existing_edges(from_id, to_id, rel, on_duplicate)
+            if existing:
+                if on_duplicate == "skip":
+                    return existing[0]
+                return self._swap_in(
+                    existing,
+                    {
+                        "rel": rel,
+                        "type": type_,
+                        "lang": lang,
+                        "meta": meta,
+                        "content": content,
+                        "render_edge": render_edge,
+                    },
+                )
         edge_id = id_ or self._generate_edge_id()
+        self._validate_unique_edge_id(edge_id)
         edge = Edge(
             id=edge_id,
-            from_id=from_id,
-            to_id=to_id,
+            from_id=self._endpoint(from_id),
+            to_id=self._endpoint(to_id),
             rel=rel,
             type=type_,
             lang=lang,
@@ -428,27 +869,214 @@ class GraphDocument(Document):
             render_edge=render_edge,
             _doc=self,
         )
-        self._edges.append(edge)
-        self._edge_index[edge_id] = edge
+        self._insert_edge(edge)
+        return edge
+
+    def _existing_edges(
+        self, from_id: str, to_id: str, rel: str, on_duplicate: OnDuplicate
+    ) -> list[Edge]:
+        """Return the edges an add would duplicate; raise if that is an error."""
+        _check_on_duplicate(on_duplicate)
+        existing = self.get_edges_between(from_id, to_id, rel)
+        if existing and on_duplicate == "error":
+            raise DuplicateEdgeError(from_id, to_id, rel)
+        return existing
+
+    def _swap_in(self, existing: list[Edge], fields: dict[str, Any]) -> Edge:
+        """Replace the first of ``existing`` with a new edge, drop the rest."""
+        old = existing[0]
+        for extra in existing[1:]:
+            self.remove_edge(extra.id)
+        fields.update(id=old.id, from_id=old.from_id, to_id=old.to_id)
+        edge = Edge(_doc=self, **fields)
+        self._replace_edge(old, edge)
         return edge
 
+    def _dedupe_edge_rows(
+        self, rows: list[dict[str, Any]], on_duplicate: OnDuplicate
+    ) -> tuple[list[dict[str, Any]], list[tuple[list[Edge], dict[str, Any]]], list[Any]]:
+        """Resolve duplicate (from_id, to_id, rel) keys in a batch of edge rows.
+
+        Returns the rows to insert, the (existing edges, row) pairs to swap
+        in, and one reference per input row: an existing Edge or a
+        ``(list, position)`` pointing into one of the first two lists.
+        Nothing is modified, so errors leave the graph untouched.
+        """
+        fresh: list[dict[str, Any]] = []
+        swaps: list[tuple[list[Edge], dict[str, Any]]] = []
+        refs: list[Any] = []
+        batch: dict[tuple[str, str, str], Any] = {}
+        for row in rows:
+            key = (row["from_id"], row["to_id"], row["rel"])
+            ref = batch.get(key)
+            if ref is None:
+                existing = self._existing_edges(*key, on_duplicate)
+                if not existing:
+                    ref = (fresh, len(fresh))
+                    fresh.append(row)
+                elif on_duplicate == "skip":
+                    ref = existing[0]
+                else:
+                    ref = (swaps, len(swaps))
+                    swaps.append((existing, row))
+                batch[key] = ref
+            elif on_duplicate == "error":
+                raise DuplicateEdgeError(*key)
+            elif on_duplicate == "replace":
+                # A later row in the batch wins but keeps the earlier row's ID
+                target, pos = ref
+                if target is fresh:
+                    fresh[pos] = {**row, "id": row.get("id") or fresh[pos].get("id")}
+                else:
+                    swaps[pos] = (swaps[pos][0], row)
+            refs.append(ref)
+        return fresh, swaps, refs
+
+    def add_edges_from(
+        self, edges: Rows, *, on_duplicate: OnDuplicate = "allow"
+    ) -> list[Edge]:
+        """Add many edges at once.
+
+        ``edges`` is an iterable of ``(from_id, to_id, rel[, meta])`` tuples
+        or of dicts with ``id``, ``from_id``, ``to_id``, ``rel``, ``type``,
+        ``lang``, ``content``, ``render_edge`` and ``meta`` keys, or a dict
+        of equal-length columns under the same names. Other keys become meta
+        entries. IDs and, unless ``on_duplicate`` is ``"allow"``, duplicate
+        edges are checked before any edge is added. ``on_duplicate`` works
+        as in add_edge, also between rows of the batch (the later row wins
+        on ``"replace"``). Returns one edge per row.
+        """
+        with gc_paused():
+            rows = normalize_rows(edges, _EDGE_COLUMNS, 3, _EDGE_FIELDS)
+            for i, row in enumerate(rows):
+                if "from_id" not in row or "to_id" not in row or "rel" not in row:
+                    raise ValueError(f"Edge row {i} needs from_id, to_id and rel")
+            refs = None
+            if on_duplicate != "allow":
+                rows, swaps, refs = self._dedupe_edge_rows(rows, on_duplicate)
+            ids = assign_ids(rows, self._edge_index, self._edge_id_gen.take)
+            created: list[Edge] = []
+            for row, id_ in zip(rows, ids):
+                row["id"] = id_
+                created.append(Edge(_doc=self, **row))
+            self._index_edges(created)
+        if refs is None:
+            return created
+        swapped = [self._swap_in(existing, row) for existing, row in swaps]
+        return [
+            ref
+            if isinstance(ref, Edge)
+            else created[ref[1]]
+            if ref[0] is rows
+            else swapped[ref[1]]
+            for ref in refs
+        ]
+
+    def _index_edges(self, created: list[Edge]) -> None:
+        """Register new edges with unique IDs in all indexes at once.
+
+        Endpoints naming an existing node are switched to the node's own ID
+        string.
+        """
+        seq = self._edge_counter
+        self._edge_index.update((e.id, e) for e in created)
+        self._edge_seq.update((e.id, n) for n, e in enumerate(created, seq))
+        self._edge_counter = seq + len(created)
+        nodes, out_adj, in_adj = self._node_index, self._out_adj, self._in_adj
+        pairs = self._pairs
+        for edge in created:
+            node = nodes.get(edge.from_id)
+            if node is not None:
+                _set(edge, "from_id", node.id)
+            node = nodes.get(edge.to_id)
+            if node is not None:
+                _set(edge, "to_id", node.id)
+            out = out_adj.get(edge.from_id)
+            if out is None:
+                out = out_adj[edge.from_id] = {}
+            out[edge.id] = edge
+            inc = in_adj.get(edge.to_id)
+            if inc is None:
+                inc = in_adj[edge.to_id] = {}
+            inc[edge.id] = edge
+            key = (edge.from_id, edge.to_id)
+            if key in pairs:
+                self._link_pair(edge, *key)
+            else:
+                pairs[key] = edge
+        if self._render_cache is None:
+            self._touch()
+        else:
+            endpoints = {e.from_id for e in created} | {e.to_id for e in created}
+            self._topology_changed(*endpoints)
+
     def get_edge(self, id_: str) -> Edge | None:
         return self._edge_index.get(id_)
 
     def get_edges_from(self, node_id: str) -> list[Edge]:
-        return [e for e in self._edges if e.from_id == node_id]
+        return list(self._out_adj.get(node_id, {}).values())
 
     def get_edges_to(self, node_id: str) -> list[Edge]:
-        return [e for e in self._edges if e.to_id == node_id]
+        return list(self._in_adj.get(node_id, {}).values())
+
+    def get_edges_between(
+        self, from_id: str, to_id: str, rel: str | None = None
+    ) -> list[Edge]:
+        """Return edges from ``from_id`` to ``to_id`` in insertion order.
+
+        Looked up in the (from_id, to_id) index; ``rel`` filters the
+        parallel edges of that pair.
+        """
+        edges = self._pair_edges(from_id, to_id)
+        if rel is None:
+            return edges
+        return [e for e in edges if e.rel == rel]
+
+    def has_edge(self, from_id: str, to_id: str, rel: str | None = None) -> bool:
+        """Return whether an edge from ``from_id`` to ``to_id`` (with ``rel``) exists."""
+        found = self._pairs.get((from_id, to_id))
+        if found is None:
+            return False
+        if rel is None:
+            return True
+        if type(found) is list:
+            return any(e.rel == rel for e in found)
+        return found.rel == rel  # type: ignore[union-attr]
 
     def remove_edge(self, id_: str) -> Edge:
         if id_ not in self._edge_index:
             raise KeyError(f"Edge '{id_}' not found")
-        edge = self._edge_index.pop(id_)
-        self._edges.remove(edge)
+        edge = self._edge_index[id_]
+        self._unindex_edge(edge)
         edge._doc = None
         return edge
 
+    def freeze(self) -> FrozenGraph:
+        """Return an immutable, array-backed snapshot of this graph.
+
+        Node IDs are interned to dense ints and topology is stored as CSR
+        arrays, so focused rendering on the snapshot avoids per-edge objects.
+        Meta generators are not run on the snapshot; call ensure_meta()
+        first if generated meta should be included.
+        """
+        from .frozen_graph import FrozenGraph
+
+        return FrozenGraph(self)
+
+    def overlay(self) -> OverlayGraph:
+        """Return a copy-on-write overlay that reads through to this graph.
+
+        Nodes and edges added, removed or edited on the overlay are kept in
+        the overlay only, so many overlays can share one base, e.g. one per
+        request. Base blocks are copied when accessed through the overlay,
+        not when it renders. Dropping the overlay, or calling its
+        discard(), costs time proportional to its own blocks. The base
+        must not be modified while overlays of it are in use.
+        """
+        from .overlay import OverlayGraph
+
+        return OverlayGraph(self)
+
     async def ensure_meta(self, *, force: bool = False) -> None:
         """Apply generators to all nodes and edges."""
         all_blocks = list(self.nodes) + list(self.edges)
@@ -456,48 +1084,108 @@ class GraphDocument(Document):
             self._generator_registry.apply(b, force=force) for b in all_blocks
         ])
 
+    def _focus_seeds(self, focus: str | Sequence[str]) -> list[str]:
+        """Normalize focus to a de-duplicated list of existing node IDs."""
+        seeds = [focus] if isinstance(focus, str) else list(dict.fromkeys(focus))
+        if not seeds:
+            raise ValueError("focus must name at least one node")
+        for seed in seeds:
+            if seed not in self._node_index:
+                raise NodeNotFoundError(seed)
+        return seeds
+
     def _compute_tiers(
-        self, focus: str, radius: int, strategy: str = "bfs"
+        self, focus: str | Sequence[str], radius: int, strategy: str = "bfs"
     ) -> dict[str, int]:
-        """Compute tier for each node using BFS from focus node."""
-        if focus not in self._node_index:
-            raise NodeNotFoundError(focus)
+        """Compute tier for each node using BFS from the focus node(s).
+
+        With several focus nodes a single multi-source BFS is run, so each
+        node gets its minimum distance to any seed.
+        """
+        seeds = self._focus_seeds(focus)
 
         tiers: dict[str, int] = {}
         if strategy == "bfs":
-            queue: deque[tuple[str, int]] = deque([(focus, 0)])
-            visited: set[str] = {focus}
+            for tier, level in enumerate(self._bfs_levels(seeds, radius)):
+                for node_id in level:
+                    tiers[node_id] = tier
+        return tiers
 
-            while queue:
-                node_id, tier = queue.popleft()
-                if tier > radius:
-                    continue
-                tiers[node_id] = tier
+    def _bfs_levels(self, seeds: list[str], radius: int) -> Iterator[list[str]]:
+        """Yield node IDs tier by tier, starting with the seeds as tier 0.
 
-                for edge in self._edges:
-                    next_id = None
-                    if edge.from_id == node_id and edge.to_id not in visited:
-                        next_id = edge.to_id
-                    elif edge.to_id == node_id and edge.from_id not in visited:
-                        next_id = edge.from_id
-                    if next_id and next_id in self._node_index:
+        Levels are produced lazily, so callers may stop expanding early.
+        """
+        visited: set[str] = set(seeds)
+        level = list(seeds)
+        yield level
+        for _ in range(radius):
+            nxt: list[str] = []
+            for node_id in level:
+                for edge in self._edges_from(node_id):
+                    next_id = edge.to_id
+                    if next_id not in visited and next_id in self._node_index:
                         visited.add(next_id)
-                        queue.append((next_id, tier + 1))
-        return tiers
+                        nxt.append(next_id)
+                for edge in self._edges_to(node_id):
+                    next_id = edge.from_id
+                    if next_id not in visited and next_id in self._node_index:
+                        visited.add(next_id)
+                        nxt.append(next_id)
+            if not nxt:
+                return
+            yield nxt
+            level = nxt
+
+    def _collect_in_out_edges(
+        self,
+        included_nodes: AbstractSet[str],
+        node_ids: Iterable[str] | None = None,
+    ) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+        """Return in/out edge labels between included nodes, keyed by node ID.
+
+        Labels are collected for ``node_ids`` (default: every included node).
+        """
+        in_map: dict[str, list[str]] = {}
+        out_map: dict[str, list[str]] = {}
+        for node_id in included_nodes if node_ids is None else node_ids:
+            in_map[node_id] = [
+                f"{e.from_id}:{e.rel}"
+                for e in self._edges_to(node_id)
+                if e.from_id in included_nodes
+            ]
+            out_map[node_id] = [
+                f"{e.to_id}:{e.rel}"
+                for e in self._edges_from(node_id)
+                if e.to_id in included_nodes
+            ]
+        return in_map, out_map
 
     def _fill_in_out_edges(self, included_nodes: set[str]) -> None:
         """Fill in_edges and out_edges for nodes within included set."""
+        in_map, out_map = self._collect_in_out_edges(included_nodes)
         for node_id in included_nodes:
             node = self._node_index[node_id]
-            node.in_edges = []
-            node.out_edges = []
-
-        for edge in self._edges:
-            if edge.from_id in included_nodes and edge.to_id in included_nodes:
-                from_node = self._node_index[edge.from_id]
-                to_node = self._node_index[edge.to_id]
-                from_node.out_edges.append(f"{edge.to_id}:{edge.rel}")
-                to_node.in_edges.append(f"{edge.from_id}:{edge.rel}")
+            node.in_edges = in_map[node_id]
+            node.out_edges = out_map[node_id]
+
+    def _render_state(
+        self, tiers: dict[str, int], included_nodes: set[str]
+    ) -> RenderState:
+        in_map, out_map = self._collect_in_out_edges(included_nodes)
+        return RenderState(tiers, in_map, out_map)
+
+    def _select_edges(self, included_nodes: set[str]) -> list[Edge]:
+        """Return renderable edges between included nodes, in insertion order."""
+        position = self._edge_position
+        selected = [
+            e
+            for node_id in included_nodes
+            for e in self._edges_from(node_id)
+            if e.to_id in included_nodes and e.render_edge
+        ]
+        selected.sort(key=lambda e: position(e.id))
+        return selected
 
     def _build_tiers_string(self, tiers: dict[str, int]) -> str:
         """Build multiline tiers string like '0: N42\\n1: N10, N50'."""
@@ -516,78 +1204,299 @@ class GraphDocument(Document):
     def _render_graph_body(
         self,
         *,
-        focus: str | None = None,
+        focus: str | Sequence[str] | None = None,
         radius: int = 1,
         strategy: str = "bfs",
         order: str | None = "focus_last",
         ctx_content: str = "",
         ctx_meta: dict[str, str] | None = None,
+        ctx_id: str | None = None,
+        fragments: dict[tuple[bool, str], str] | None = None,
+        budget: int | None = None,
+        size_fn: SizeFunction | None = None,
+        priority: NodePriority | None = None,
     ) -> str:
-        """Build rendered graph document body."""
+        """Build rendered graph document body.
+
+        ``focus`` may be a single node ID or a sequence of seed IDs; the ctx
+        block then lists all seeds as ``focus=a,b,c``. ``fragments`` is an
+        optional cache of per-block static tails shared across renders.
+        """
         if focus is None:
             return self._render_all_nodes(order=order)
 
-        tiers = self._compute_tiers(focus, radius, strategy)
-        included_nodes = set(tiers.keys())
-
-        for node_id, tier in tiers.items():
-            self._node_index[node_id].tier = tier
-
-        self._fill_in_out_edges(included_nodes)
+        seeds = self._focus_seeds(focus)
+        cache = self._render_cache
+        if cache is not None and budget is None and ctx_id is None:
+            tiers_key = (tuple(seeds), radius, strategy)
+            text_key = (
+                tiers_key,
+                order,
+                ctx_content,
+                tuple(sorted((ctx_meta or {}).items())),
+            )
+            text = cache.get_text(text_key)
+            if text is not None:
+                return text
+            tiers = cache.get_tiers(tiers_key)
+            if tiers is None:
+                tiers = self._compute_tiers(seeds, radius, strategy)
+                cache.put_tiers(tiers_key, tiers)
+            ctx = Ctx(
+                id=self._generate_ctx_id(),
+                focus=",".join(seeds),
+                radius=radius,
+                strategy=strategy,
+                content=ctx_content,
+                meta=ctx_meta or {},
+                _doc=self,
+            )
+            text = self._render_tiers(tiers, ctx, order, fragments)
+            cache.put_text(text_key, text, tiers, self._version)
+            return text
 
-        tiers_str = self._build_tiers_string(tiers)
+        ctx, tiers = self._focus_ctx_tiers(
+            seeds, radius, strategy, order, ctx_content, ctx_meta, ctx_id,
+            fragments, budget, size_fn, priority,
+        )
+        return self._render_tiers(tiers, ctx, order, fragments)
 
+    def _focus_ctx_tiers(
+        self,
+        seeds: list[str],
+        radius: int,
+        strategy: str,
+        order: str | None,
+        ctx_content: str,
+        ctx_meta: dict[str, str] | None,
+        ctx_id: str | None,
+        fragments: dict[tuple[bool, str], str] | None,
+        budget: int | None,
+        size_fn: SizeFunction | None,
+        priority: NodePriority | None,
+    ) -> tuple[Ctx, dict[str, int]]:
+        """Build the ctx block and node tiers of an uncached focused render."""
         ctx = Ctx(
-            id=self._generate_ctx_id(),
-            focus=focus,
+            id=ctx_id or self._generate_ctx_id(),
+            focus=",".join(seeds),
             radius=radius,
             strategy=strategy,
-            tiers=tiers_str,
             content=ctx_content,
             meta=ctx_meta or {},
+            budget=budget,
             _doc=self,
         )
 
-        included_edges = [
-            e
-            for e in self._edges
-            if e.from_id in included_nodes
-            and e.to_id in included_nodes
-            and e.render_edge
-        ]
+        if budget is None:
+            tiers = self._compute_tiers(seeds, radius, strategy)
+        else:
+            if fragments is None:
+                fragments = {}
+            tiers = self._budget_tiers(
+                seeds,
+                radius,
+                strategy,
+                ctx,
+                order,
+                budget,
+                size_fn or len,
+                priority,
+                fragments,
+            )
+        return ctx, tiers
+
+    def _render_tiers(
+        self,
+        tiers: dict[str, int],
+        ctx: Ctx,
+        order: str | None,
+        fragments: dict[tuple[bool, str], str] | None,
+    ) -> str:
+        """Render ctx plus the given tiered nodes and the edges between them."""
+        return self._wrap_body(
+            "\n\n".join(self._iter_tiers(tiers, ctx, order, fragments))
+        )
+
+    def _iter_tiers(
+        self,
+        tiers: dict[str, int],
+        ctx: Ctx,
+        order: str | None,
+        fragments: dict[tuple[bool, str], str] | None,
+    ) -> Iterator[str]:
+        """Yield the blocks of ``_render_tiers`` in output order."""
+        for _, text in self._iter_tier_parts(tiers, ctx, order, fragments):
+            yield text
+
+    def _iter_tier_parts(
+        self,
+        tiers: dict[str, int],
+        ctx: Ctx,
+        order: str | None,
+        fragments: dict[tuple[bool, str], str] | None,
+    ) -> Iterator[tuple[Block, str]]:
+        """Yield the blocks of ``_render_tiers`` with their fragments.
+
+        The render state is only active while a block renders, never across
+        a yield, so consumers don't observe it.
+        """
+        included_nodes = set(tiers.keys())
+        state = self._render_state(tiers, included_nodes)
+
+        ctx.tiers = self._build_tiers_string(tiers)
+
+        included_edges = self._select_edges(included_nodes)
 
         blocks: list[Block] = [ctx]
-        blocks.extend(self._node_index[nid] for nid in included_nodes)
+        # Tiers are in BFS order; a set would order nodes by string hash
+        blocks.extend(self._node_index[nid] for nid in tiers)
         blocks.extend(included_edges)
 
-        sorted_blocks = self._sorter_registry.apply(blocks, order or "focus_last")
+        with render_state(state):
+            sorted_blocks = self._sorter_registry.apply(blocks, order or "focus_last")
+        for b in sorted_blocks:
+            with render_state(state):
+                if fragments is None:
+                    text = b.render()
+                else:
+                    text = self._render_fragment(b, fragments)
+            yield b, text
+
+    def _budget_tiers(
+        self,
+        seeds: list[str],
+        radius: int,
+        strategy: str,
+        ctx: Ctx,
+        order: str | None,
+        budget: int,
+        size_fn: SizeFunction,
+        priority: NodePriority | None,
+        fragments: dict[tuple[bool, str], str],
+    ) -> dict[str, int]:
+        """Expand tier by tier while the rendered size stays within budget.
+
+        Seeds are always included. Each candidate's cost is measured from its
+        own fragment, the edge blocks it brings in, and the growth of its
+        neighbours' edge lists and the ctx tiers line, so the neighbourhood is
+        never rendered as a whole. Costs are summed per fragment, which is
+        exact for ``len`` and an approximation for non-additive measures.
+        Sets ``ctx.cut`` when expansion stops early.
+        """
+        tiers = {seed: 0 for seed in seeds}
+        if strategy != "bfs":
+            return tiers
+        used = size_fn(self._render_tiers(tiers, ctx, order, fragments))
+
+        # Candidates are measured against this state, never the shared nodes.
+        state = RenderState()
+        with render_state(state):
+            return self._expand_within_budget(
+                tiers, seeds, radius, ctx, budget, used, size_fn, priority,
+                fragments, state,
+            )
+
+    def _expand_within_budget(
+        self,
+        tiers: dict[str, int],
+        seeds: list[str],
+        radius: int,
+        ctx: Ctx,
+        budget: int,
+        used: int,
+        size_fn: SizeFunction,
+        priority: NodePriority | None,
+        fragments: dict[tuple[bool, str], str],
+        state: RenderState,
+    ) -> dict[str, int]:
+        sep = size_fn("\n\n")
+        list_sep = size_fn(", ")
+        levels = self._bfs_levels(seeds, radius)
+        next(levels)
+        for tier, level in enumerate(levels, start=1):
+            if priority is not None:
+                level.sort(key=lambda nid: priority(self._node_index[nid]))
+            reserve = size_fn(f"\ncut={tier}:{len(level)}/{len(level)}")
+            # Leaving single-line "tiers=0: a" for the multi-line form.
+            cost = size_fn('"""\n\n"""') if tier == 1 else 0
+            for kept, node_id in enumerate(level):
+                node = self._node_index[node_id]
+                state.tiers[node_id] = tier
+                in_edges = state.in_edges[node_id] = []
+                out_edges = state.out_edges[node_id] = []
+                new_edges: dict[str, Edge] = {}
+                for e in self._edges_to(node_id):
+                    if e.from_id in tiers or e.from_id == node_id:
+                        in_edges.append(f"{e.from_id}:{e.rel}")
+                        new_edges[e.id] = e
+                for e in self._edges_from(node_id):
+                    if e.to_id in tiers or e.to_id == node_id:
+                        out_edges.append(f"{e.to_id}:{e.rel}")
+                        new_edges[e.id] = e
+                cost += sep + size_fn(self._render_fragment(node, fragments))
+                for e in new_edges.values():
+                    if e.render_edge:
+                        cost += sep + size_fn(self._render_fragment(e, fragments))
+                    if e.from_id != e.to_id:
+                        other = e.from_id if e.to_id == node_id else e.to_id
+                        cost += size_fn(repr(f"{other}:{e.rel}")) + list_sep
+                if kept == 0:
+                    cost += size_fn(f"\n{tier}: {node_id}")
+                else:
+                    cost += size_fn(f", {node_id}")
+                if used + cost + reserve > budget:
+                    ctx.cut = f"{tier}:{kept}/{len(level)}"
+                    return tiers
+                used += cost
+                cost = 0
+                tiers[node_id] = tier
+        return tiers
 
-        rendered_blocks = [b.render() for b in sorted_blocks]
-        body = "\n\n".join(rendered_blocks)
+    def _render_fragment(
+        self, block: Block, fragments: dict[tuple[bool, str], str]
+    ) -> str:
+        """Render a block, reusing cached static parts when possible.
 
-        parts: list[str] = []
-        if self._prefix:
-            parts.append(self._prefix)
-            parts.append("---")
-        if body:
-            parts.append(body)
-        if self._suffix:
-            parts.append("---")
-            parts.append(self._suffix)
-        return "\n\n".join(parts)
+        Blocks without render-time meta (edges) are cached whole; for nodes
+        only the tail after the tier/edge lines is cached.
+        """
+        cls = type(block)
+        if cls is Ctx or cls.render is not Block.render:
+            return block.render()
+        key = (isinstance(block, Edge), block.id)
+        cached = fragments.get(key)
+        if cls.render_meta is Block.render_meta:
+            if cached is None:
+                cached = fragments[key] = block.render()
+            return cached
+        extra_meta = block.render_meta()
+        if not block._meta and not extra_meta and not block.content:
+            return f"{block.render_header()} @end"
+        if cached is None:
+            cached = fragments[key] = block.render_tail()
+        return "\n".join([block.render_header(), *extra_meta, cached])
 
     def render(
         self,
         *,
-        focus: str | None = None,
+        focus: str | Sequence[str] | None = None,
         radius: int = 1,
         strategy: str = "bfs",
         order: str | None = "focus_last",
         ctx_content: str = "",
         ctx_meta: dict[str, str] | None = None,
         meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+        budget: int | None = None,
+        size_fn: SizeFunction | None = None,
+        priority: NodePriority | None = None,
     ) -> str:
-        """Render graph document with context (sync version)."""
+        """Render graph document with context (sync version).
+
+        With ``budget`` set, nodes are added tier by tier (within a tier in
+        ``priority`` order) until the next one would push the output size,
+        measured by ``size_fn`` (default ``len``), past the budget. Seeds are
+        always rendered; ``radius`` still caps the expansion.
+        """
         if meta_refresh != MetaRefreshMode.NONE:
             force = meta_refresh == MetaRefreshMode.FORCE
             asyncio.run(self.ensure_meta(force=force))
@@ -598,18 +1507,24 @@ class GraphDocument(Document):
             order=order,
             ctx_content=ctx_content,
             ctx_meta=ctx_meta,
+            budget=budget,
+            size_fn=size_fn,
+            priority=priority,
         )
 
     async def arender(
         self,
         *,
-        focus: str | None = None,
+        focus: str | Sequence[str] | None = None,
         radius: int = 1,
         strategy: str = "bfs",
         order: str | None = "focus_last",
         ctx_content: str = "",
         ctx_meta: dict[str, str] | None = None,
         meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+        budget: int | None = None,
+        size_fn: SizeFunction | None = None,
+        priority: NodePriority | None = None,
     ) -> str:
         """Async version of render()."""
         if meta_refresh != MetaRefreshMode.NONE:
@@ -622,39 +1537,182 @@ class GraphDocument(Document):
             order=order,
             ctx_content=ctx_content,
             ctx_meta=ctx_meta,
+            budget=budget,
+            size_fn=size_fn,
+            priority=priority,
         )
 
+    def iter_render(
+        self,
+        *,
+        focus: str | Sequence[str] | None = None,
+        radius: int = 1,
+        strategy: str = "bfs",
+        order: str | None = "focus_last",
+        ctx_content: str = "",
+        ctx_meta: dict[str, str] | None = None,
+        meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+        budget: int | None = None,
+        size_fn: SizeFunction | None = None,
+        priority: NodePriority | None = None,
+    ) -> Iterator[str]:
+        """Yield the output of render() as consecutive fragments.
+
+        Takes the same arguments as render(). Blocks are rendered as they
+        are consumed; a render served from the render cache is yielded as a
+        single fragment.
+        """
+        if meta_refresh != MetaRefreshMode.NONE:
+            force = meta_refresh == MetaRefreshMode.FORCE
+            asyncio.run(self.ensure_meta(force=force))
+        if focus is None:
+            return self._iter_wrapped(self._iter_all_nodes(order=order))
+        if self._render_cache is not None and budget is None:
+            text = self._render_graph_body(
+                focus=focus,
+                radius=radius,
+                strategy=strategy,
+                order=order,
+                ctx_content=ctx_content,
+                ctx_meta=ctx_meta,
+            )
+            return iter((text,))
+        ctx, tiers = self._focus_ctx_tiers(
+            self._focus_seeds(focus), radius, strategy, order, ctx_content,
+            ctx_meta, None, None, budget, size_fn, priority,
+        )
+        return self._iter_wrapped(self._iter_tiers(tiers, ctx, order, None))
+
+    def _iter_render_parts(  # type: ignore[override]
+        self,
+        *,
+        focus: str | Sequence[str] | None = None,
+        radius: int = 1,
+        strategy: str = "bfs",
+        order: str | None = "focus_last",
+        ctx_content: str = "",
+        ctx_meta: dict[str, str] | None = None,
+        meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+        budget: int | None = None,
+        size_fn: SizeFunction | None = None,
+        priority: NodePriority | None = None,
+    ) -> Iterator[tuple[Block | None, str]]:
+        """iter_render() output paired with the block of each fragment.
+
+        Blocks are always rendered, never taken from the render cache.
+        """
+        if meta_refresh != MetaRefreshMode.NONE:
+            force = meta_refresh == MetaRefreshMode.FORCE
+            asyncio.run(self.ensure_meta(force=force))
+        if focus is None:
+            return self._iter_wrapped_parts(self._iter_all_node_parts(order=order))
+        ctx, tiers = self._focus_ctx_tiers(
+            self._focus_seeds(focus), radius, strategy, order, ctx_content,
+            ctx_meta, None, None, budget, size_fn, priority,
+        )
+        return self._iter_wrapped_parts(self._iter_tier_parts(tiers, ctx, order, None))
+
+    def render_many(
+        self,
+        focuses: Iterable[str | Sequence[str]],
+        *,
+        radius: int = 1,
+        strategy: str = "bfs",
+        order: str | None = "focus_last",
+        ctx_content: str = "",
+        ctx_meta: dict[str, str] | None = None,
+        meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+        workers: int | None = None,
+        chunksize: int = 64,
+    ) -> Iterator[tuple[str | Sequence[str], str]]:
+        """Render one focused context per entry in ``focuses``.
+
+        Yields ``(focus, text)`` pairs in input order; each text equals what
+        ``render(focus=focus, ...)`` would return. Meta generators run once
+        for the whole batch and each block's static tail is rendered once and
+        reused across focuses.
+
+        Args:
+            focuses: Focus node IDs, or sequences of IDs for multi-seed focus.
+            workers: If greater than 1, spread the focuses over a process pool
+                of that size. The graph is pickled once per worker, so its
+                generators and sorters must be picklable.
+            chunksize: Number of focuses sent to a worker per task.
+        """
+        if meta_refresh != MetaRefreshMode.NONE:
+            force = meta_refresh == MetaRefreshMode.FORCE
+            asyncio.run(self.ensure_meta(force=force))
+
+        options = {
+            "radius": radius,
+            "strategy": strategy,
+            "order": order,
+            "ctx_content": ctx_content,
+            "ctx_meta": ctx_meta,
+        }
+        # Ctx IDs are assigned here so output does not depend on ``workers``.
+        jobs = ((focus, self._generate_ctx_id()) for focus in focuses)
+
+        if workers is None or workers <= 1:
+            fragments: dict[tuple[bool, str], str] = {}
+            for focus, ctx_id in jobs:
+                yield focus, self._render_graph_body(
+                    focus=focus, ctx_id=ctx_id, fragments=fragments, **options
+                )
+            return
+
+        chunks = iter(lambda: list(islice(jobs, chunksize)), [])
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(self,),
+        ) as pool:
+            for results in pool.map(_render_chunk, chunks, repeat(options)):
+                yield from results
+
     def _render_all_nodes(
         self,
         *,
         order: str | None = None,
     ) -> str:
         """Render all nodes without focus/radius filtering."""
-        all_node_ids = set(self._node_order)
-        self._fill_in_out_edges(all_node_ids)
+        return self._wrap_body("\n\n".join(self._iter_all_nodes(order=order)))
+
+    def _iter_all_nodes(self, *, order: str | None = None) -> Iterator[str]:
+        """Yield the blocks of an all-nodes render in output order."""
+        for _, text in self._iter_all_node_parts(order=order):
+            yield text
 
-        blocks: list[Block] = list(self.nodes)
-        blocks.extend(e for e in self._edges if e.render_edge)
+    def _iter_all_node_parts(
+        self, *, order: str | None = None
+    ) -> Iterator[tuple[Block, str]]:
+        """Yield the blocks of an all-nodes render with their fragments.
+
+        Unless a sorter needs every node's edge lists at once, they are
+        collected one node at a time so streaming a large graph keeps only
+        the current block in memory.
+        """
+        blocks: list[Block] = list(self._node_index.values())
+        blocks.extend(e for e in self._edge_map().values() if e.render_edge)
 
         if order:
-            try:
-                blocks = self._sorter_registry.apply(blocks, order)
-            except ValueError:
-                pass
-
-        rendered_blocks = [b.render() for b in blocks]
-        body = "\n\n".join(rendered_blocks)
-
-        parts: list[str] = []
-        if self._prefix:
-            parts.append(self._prefix)
-            parts.append("---")
-        if body:
-            parts.append(body)
-        if self._suffix:
-            parts.append("---")
-            parts.append(self._suffix)
-        return "\n\n".join(parts)
+            state = self._render_state({}, set(self._node_index))
+            with render_state(state):
+                try:
+                    blocks = self._sorter_registry.apply(blocks, order)
+                except ValueError:
+                    pass
+            del state
+
+        all_node_ids = self._node_index.keys()
+        for b in blocks:
+            if isinstance(b, Node):
+                in_map, out_map = self._collect_in_out_edges(all_node_ids, (b.id,))
+                with render_state(RenderState({}, in_map, out_map)):
+                    text = b.render()
+            else:
+                text = b.render()
+            yield b, text
 
     def render_free(
         self,
@@ -698,6 +1756,20 @@ class GraphDocument(Document):
                 brief_renderer=lambda b: f"[{b.type}] {b.id}",
             )
         """
+        return self._wrap_body(
+            "\n\n".join(
+                self._iter_free(items, ctx=ctx, brief_renderer=brief_renderer)
+            )
+        )
+
+    def _iter_free(
+        self,
+        items: Sequence[ItemSpec],
+        *,
+        ctx: dict[str, str | dict[str, str]] | Ctx | None = None,
+        brief_renderer: BriefRenderer | None = None,
+    ) -> Iterator[str]:
+        """Yield the blocks of a free-mode render in output order."""
         # Parse items into (id, brief) tuples
         parsed_items: list[tuple[str, bool]] = []
         for item in items:
@@ -712,16 +1784,13 @@ class GraphDocument(Document):
             if item_id in self._node_index:
                 included_node_ids.add(item_id)
 
-        # Fill in/out edges for included nodes
-        self._fill_in_out_edges(included_node_ids)
-
-        # Build rendered parts
-        rendered_parts: list[str] = []
+        # In/out edges for included nodes, visible only to this render
+        state = self._render_state({}, included_node_ids)
 
         # Render ctx first if provided
         if ctx is not None:
             if isinstance(ctx, Ctx):
-                rendered_parts.append(ctx.render())
+                yield ctx.render()
             else:
                 # Build Ctx from dict
                 ctx_content = ctx.get("content", "")
@@ -742,7 +1811,7 @@ class GraphDocument(Document):
                     meta=ctx_meta_dict,
                     _doc=self,
                 )
-                rendered_parts.append(ctx_block.render())
+                yield ctx_block.render()
 
         # Render items in order
         for item_id, is_brief in parsed_items:
@@ -751,34 +1820,22 @@ class GraphDocument(Document):
             # Try to find block (node or edge)
             if item_id in self._node_index:
                 block = self._node_index[item_id]
-            elif item_id in self._edge_index:
-                block = self._edge_index[item_id]
+            else:
+                block = self._edge_map().get(item_id)
 
             if block is None:
                 continue
 
             # Render the block
-            if is_brief:
-                if brief_renderer is not None:
-                    rendered_parts.append(brief_renderer(block))
+            with render_state(state):
+                if is_brief:
+                    if brief_renderer is not None:
+                        text = brief_renderer(block)
+                    else:
+                        text = block.render_brief()
                 else:
-                    rendered_parts.append(block.render_brief())
-            else:
-                rendered_parts.append(block.render())
-
-        body = "\n\n".join(rendered_parts)
-
-        # Apply prefix/suffix
-        parts: list[str] = []
-        if self._prefix:
-            parts.append(self._prefix)
-            parts.append("---")
-        if body:
-            parts.append(body)
-        if self._suffix:
-            parts.append("---")
-            parts.append(self._suffix)
-        return "\n\n".join(parts)
+                    text = block.render()
+            yield text
 
     async def arender_free(
         self,
@@ -797,11 +1854,32 @@ class GraphDocument(Document):
             await self.ensure_meta(force=force)
         return self.render_free(items, ctx=ctx, brief_renderer=brief_renderer)
 
+    def iter_render_free(
+        self,
+        items: Sequence[ItemSpec],
+        *,
+        ctx: dict[str, str | dict[str, str]] | Ctx | None = None,
+        brief_renderer: BriefRenderer | None = None,
+    ) -> Iterator[str]:
+        """Yield the output of render_free() as consecutive fragments."""
+        return self._iter_wrapped(
+            self._iter_free(items, ctx=ctx, brief_renderer=brief_renderer)
+        )
+
+    def render_free_to(self, fp: IO, items: Sequence[ItemSpec], **kwargs) -> int:
+        """Write render_free() output to a text or binary stream.
+
+        Takes the same keyword arguments as render_free(). Returns the number
+        of characters (text) or bytes (binary) written.
+        """
+        return _write_fragments(fp, self.iter_render_free(items, **kwargs))
+
 
 def create_graph(
     graph_id: str | None = None,
     *,
     generators: list[MetaGenerator] | None = None,
     sorters: list[BlockSorter] | None = None,
+    vocab: Vocabulary | Literal[False] | None = None,
 ) -> GraphDocument:
-    return GraphDocument(graph_id, generators, sorters)
+    return GraphDocument(graph_id, generators, sorters, vocab=vocab)
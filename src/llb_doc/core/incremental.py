@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+
+from .block import Block
+from .document import Document, MetaRefreshMode
+from .graph_document import GraphDocument
+
+
+class IncrementalRenderer:
+    """Re-renders a Document by appending to its previous output.
+
+    Bound to one document; see ``Document.incremental()``. ``render()``
+    returns the same text as ``doc.render()`` (in document order). When
+    the only changes since the previous call are appended blocks or a new
+    suffix, just the appended blocks are rendered and added to the stored
+    output. Any other change makes the next call render the whole
+    document: a new prefix, removing, moving or replacing blocks, or
+    editing a block that was already output.
+
+    With meta refresh, generators run on the appended blocks only; a
+    FORCE refresh, a change in the registered generators or a previous
+    render without refresh leads to a full render.
+    """
+
+    def __init__(self, doc: Document) -> None:
+        if isinstance(doc, GraphDocument):
+            raise TypeError("IncrementalRenderer renders flat Documents only")
+        self._doc = doc
+        # Output without the suffix section, and the block slots it covers
+        self._head = ""
+        self._slots = 0
+        # doc._rewrites at the last render; -1 until the first one
+        self._rewrites = -1
+        # Generator keys every rendered block was refreshed with, if any
+        self._meta_keys: tuple[str, ...] | None = None
+        self.full_renders = 0
+        self.incremental_renders = 0
+
+    @property
+    def document(self) -> Document:
+        return self._doc
+
+    def render(self, *, meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL) -> str:
+        """Render the document, reusing the previous output when possible."""
+        appended = self._appended(meta_refresh)
+        if self._needs_refresh(appended, meta_refresh):
+            asyncio.run(self._refresh(appended, meta_refresh))
+        return self._render(appended, meta_refresh)
+
+    async def arender(
+        self, *, meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL
+    ) -> str:
+        """Async version of render()."""
+        appended = self._appended(meta_refresh)
+        if self._needs_refresh(appended, meta_refresh):
+            await self._refresh(appended, meta_refresh)
+        return self._render(appended, meta_refresh)
+
+    def _appended(self, meta_refresh: MetaRefreshMode) -> list[Block] | None:
+        """Return the blocks appended since the last render.
+
+        None means the previous output cannot be extended.
+        """
+        doc = self._doc
+        if doc._rewrites != self._rewrites:
+            return None
+        if meta_refresh != MetaRefreshMode.NONE and (
+            meta_refresh == MetaRefreshMode.FORCE
+            or self._meta_keys != doc._generator_registry.keys()
+        ):
+            return None
+        index = doc._id_index
+        return [index[id_] for id_ in doc._block_order.ids_from(self._slots)]
+
+    def _needs_refresh(
+        self, appended: list[Block] | None, meta_refresh: MetaRefreshMode
+    ) -> bool:
+        if meta_refresh == MetaRefreshMode.NONE:
+            return False
+        if appended is None:
+            return True
+        return bool(appended) and bool(self._doc._generator_registry.keys())
+
+    async def _refresh(
+        self, appended: list[Block] | None, meta_refresh: MetaRefreshMode
+    ) -> None:
+        doc = self._doc
+        if appended is None:
+            await doc.ensure_meta(force=meta_refresh == MetaRefreshMode.FORCE)
+        else:
+            apply = doc._generator_registry.apply
+            await asyncio.gather(*[apply(b) for b in appended])
+
+    def _render(self, appended: list[Block] | None, meta_refresh: MetaRefreshMode) -> str:
+        doc = self._doc
+        if appended is None:
+            body = "\n\n".join(b.render() for b in doc)
+            head = doc._prefix
+            if head:
+                head += "\n\n---"
+                if body:
+                    head += "\n\n" + body
+            else:
+                head = body
+            self._head = head
+            self.full_renders += 1
+        else:
+            if appended:
+                body = "\n\n".join(b.render() for b in appended)
+                self._head = f"{self._head}\n\n{body}" if self._head else body
+            self.incremental_renders += 1
+        keys = doc._generator_registry.keys()
+        if meta_refresh == MetaRefreshMode.NONE:
+            # Without generators there is nothing a refresh could miss
+            self._meta_keys = None if keys else keys
+        elif appended is None:
+            self._meta_keys = keys
+
+        self._slots = doc._block_order.end
+        self._rewrites = doc._rewrites
+        if self._slots > doc._sealed_slots:
+            doc._sealed_slots = self._slots
+
+        suffix = doc._suffix
+        if not suffix:
+            return self._head
+        sep = "\n\n---\n\n" if self._head else "---\n\n"
+        return f"{self._head}{sep}{suffix}"
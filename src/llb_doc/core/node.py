@@ -2,14 +2,22 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .block import Block
+from .block import Block, _set
+from .render_state import current_render_state
 
 if TYPE_CHECKING:
     from .document import Document
 
 
 class Node(Block):
-    """Graph node, renders as @node."""
+    """Graph node, renders as @node.
+
+    ``tier``, ``in_edges`` and ``out_edges`` are render-time values: during a
+    graph render they come from the active RenderState, otherwise from the
+    values assigned on the node.
+    """
+
+    __slots__ = ("_tier", "_in_edges", "_out_edges")
 
     _fields = Block._fields | frozenset({"tier", "in_edges", "out_edges"})
 
@@ -24,9 +32,55 @@ class Node(Block):
         **kwargs: str,
     ) -> None:
         super().__init__(id, type, lang, meta, content, _doc, **kwargs)
-        self.tier: int | None = None
-        self.in_edges: list[str] = []
-        self.out_edges: list[str] = []
+        _set(self, "_tier", None)
+        # Edge lists are created on first use outside a graph render
+        _set(self, "_in_edges", None)
+        _set(self, "_out_edges", None)
+
+    @property
+    def tier(self) -> int | None:
+        state = current_render_state()
+        if state is not None and self.id in state.tiers:
+            return state.tiers[self.id]
+        return self._tier
+
+    @tier.setter
+    def tier(self, value: int | None) -> None:
+        _set(self, "_tier", value)
+
+    @property
+    def in_edges(self) -> list[str]:
+        state = current_render_state()
+        if state is not None:
+            edges = state.in_edges.get(self.id)
+            if edges is not None:
+                return edges
+        edges = self._in_edges
+        if edges is None:
+            edges = []
+            _set(self, "_in_edges", edges)
+        return edges
+
+    @in_edges.setter
+    def in_edges(self, value: list[str]) -> None:
+        _set(self, "_in_edges", value)
+
+    @property
+    def out_edges(self) -> list[str]:
+        state = current_render_state()
+        if state is not None:
+            edges = state.out_edges.get(self.id)
+            if edges is not None:
+                return edges
+        edges = self._out_edges
+        if edges is None:
+            edges = []
+            _set(self, "_out_edges", edges)
+        return edges
+
+    @out_edges.setter
+    def out_edges(self, value: list[str]) -> None:
+        _set(self, "_out_edges", value)
 
     def render_header(self) -> str:
         """Return @node header line."""
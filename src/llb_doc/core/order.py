@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+
+class IDOrder:
+    """Ordered sequence of IDs with O(1) removal.
+
+    Removed IDs leave a tombstone (``None``) in the slot list; the list is
+    compacted lazily once tombstones outnumber live entries, or on demand
+    via ``compact()``. Slot indexes only grow between compactions, so
+    ``position()`` can be used as a sort key for the current order.
+    """
+
+    __slots__ = ("_slots", "_pos", "_dead")
+
+    _MIN_COMPACT = 32
+
+    def __init__(self, ids: Iterable[str] = ()) -> None:
+        self._slots: list[str | None] = list(ids)
+        self._pos: dict[str, int] = {id_: i for i, id_ in enumerate(self._slots)}
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._slots) - self._dead
+
+    def __contains__(self, id_: object) -> bool:
+        return id_ in self._pos
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._dead:
+            return iter(self._slots)  # type: ignore[arg-type]
+        return (id_ for id_ in self._slots if id_ is not None)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IDOrder):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IDOrder({list(self)!r})"
+
+    def append(self, id_: str) -> None:
+        self._pos[id_] = len(self._slots)
+        self._slots.append(id_)
+
+    def extend(self, ids: Iterable[str]) -> None:
+        start = len(self._slots)
+        self._slots.extend(ids)
+        for i in range(start, len(self._slots)):
+            self._pos[self._slots[i]] = i  # type: ignore[index]
+
+    def remove(self, id_: str) -> None:
+        """Tombstone an ID in O(1). Raises ValueError if not present."""
+        try:
+            i = self._pos.pop(id_)
+        except KeyError:
+            raise ValueError(f"{id_!r} not in order") from None
+        self._slots[i] = None
+        self._dead += 1
+        if self._dead > self._MIN_COMPACT and self._dead * 2 > len(self._slots):
+            self.compact()
+
+    @property
+    def end(self) -> int:
+        """Slot index the next appended ID will take."""
+        return len(self._slots)
+
+    def ids_from(self, slot: int) -> list[str]:
+        """Return the live IDs in slots ``slot`` onwards, in order."""
+        return [id_ for id_ in self._slots[slot:] if id_ is not None]
+
+    def position(self, id_: str) -> int:
+        """Return the slot index of an ID (monotonic in order, not dense)."""
+        return self._pos[id_]
+
+    def index(self, id_: str) -> int:
+        """Return the dense index of an ID, compacting first if needed."""
+        self.compact()
+        return self._pos[id_]
+
+    def swap(self, id1: str, id2: str) -> None:
+        i, j = self._pos[id1], self._pos[id2]
+        self._slots[i], self._slots[j] = id2, id1
+        self._pos[id1], self._pos[id2] = j, i
+
+    def move(self, id_: str, position: int) -> None:
+        """Move an ID like ``list.remove`` followed by ``list.insert``."""
+        self.compact()
+        old = self._pos[id_]
+        del self._slots[old]
+        n = len(self._slots)
+        new = max(0, n + position) if position < 0 else min(position, n)
+        self._slots.insert(new, id_)
+        for i in range(min(old, new), max(old, new) + 1):
+            self._pos[self._slots[i]] = i  # type: ignore[index]
+
+    def compact(self) -> None:
+        """Drop tombstones and renumber slots."""
+        if not self._dead:
+            return
+        self._slots = [id_ for id_ in self._slots if id_ is not None]
+        self._pos = {id_: i for i, id_ in enumerate(self._slots)}  # type: ignore[misc]
+        self._dead = 0
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Iterable, Iterator, Mapping, MutableMapping, TypeVar
+
+from .block import Block
+from .edge import Edge
+from .graph_document import GraphDocument, NodeNotFoundError
+from .node import Node
+
+_V = TypeVar("_V")
+
+
+class _Layer(MutableMapping[str, _V]):
+    """Mapping that reads through to ``base`` and keeps writes in ``local``.
+
+    ``hidden`` holds the base keys that must not be read from the base:
+    deleted ones and those shadowed by a local entry. Like dict
+    assignment, writing a visible key keeps its position (the entry goes
+    to ``shadows``) while other local entries follow the base ones.
+    """
+
+    __slots__ = ("base", "local", "hidden", "shadows")
+
+    def __init__(self, base: Mapping[str, _V]) -> None:
+        self.base = base
+        self.local: dict[str, _V] = {}
+        self.hidden: set[str] = set()
+        self.shadows: set[str] = set()
+
+    def __getitem__(self, key: str) -> _V:
+        local = self.local
+        if key in local:
+            return local[key]
+        if key in self.hidden:
+            raise KeyError(key)
+        return self.base[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        local = self.local
+        if key in local:
+            return local[key]
+        if key in self.hidden:
+            return default
+        return self.base.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.local or (key not in self.hidden and key in self.base)
+
+    def __setitem__(self, key: str, value: _V) -> None:
+        local = self.local
+        if key not in local and key not in self.hidden and key in self.base:
+            self.hidden.add(key)
+            self.shadows.add(key)
+        local[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self.local:
+            del self.local[key]
+            self.shadows.discard(key)
+        elif key in self.hidden or key not in self.base:
+            raise KeyError(key)
+        else:
+            self.hidden.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        hidden, shadows = self.hidden, self.shadows
+        if hidden:
+            for key in self.base:
+                if key not in hidden or key in shadows:
+                    yield key
+        else:
+            yield from self.base
+        for key in self.local:
+            if key not in shadows:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.base) - len(self.hidden) + len(self.local)
+
+    def values(self) -> Iterator[_V]:  # type: ignore[override]
+        return map(self.__getitem__, self)
+
+
+class OverlayGraph(GraphDocument):
+    """Copy-on-write view of a base graph; see ``GraphDocument.overlay()``.
+
+    Nodes and edges are read through to the base until they are accessed.
+    Adds go to the overlay and removals hide base blocks, so the base is
+    never modified and overlays of one base are independent. Blocks
+    returned by get_node, get_edge and get_edges_* are its own: base
+    blocks are copied on first access, so their meta and content can be
+    edited locally. ``nodes`` and ``edges`` return copies that join the
+    overlay only when changed. Rendering, traversal and render_free read
+    the merged view without copying.
+    """
+
+    def __init__(self, base: GraphDocument) -> None:
+        super().__init__(base.graph_id, vocab=base._vocab or False)
+        self._sorter_registry = base._sorter_registry
+        self._generator_registry = base._generator_registry
+        self._prefix = base._prefix
+        self._suffix = base._suffix
+        self._ctx = base._ctx
+        self._tokenizer = base._tokenizer
+        self._node_id_gen = base._node_id_gen.copy()
+        self._edge_id_gen = base._edge_id_gen.copy()
+        self._ctx_id_gen = base._ctx_id_gen.copy()
+
+        self._base = base
+        self._node_index: _Layer[Node] = _Layer(base._node_index)  # type: ignore[assignment]
+        self._edge_index: _Layer[Edge] = _Layer(base._edge_map())  # type: ignore[assignment]
+        # Local edges rank after every base edge; copies keep the base rank
+        self._base_edge_count = max(base._edge_counter, len(self._edge_index.base))
+        self._edge_counter = self._base_edge_count
+
+    @property
+    def base(self) -> GraphDocument:
+        return self._base
+
+    def __enter__(self) -> OverlayGraph:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.discard()
+
+    def discard(self) -> None:
+        """Drop all local changes, leaving an empty overlay over the base.
+
+        Takes time proportional to the overlay's own blocks and detaches
+        them, so they are freed without waiting for the cycle collector.
+        """
+        for block in [*self._node_index.local.values(), *self._edge_index.local.values()]:
+            block._doc = None
+        self._node_index = _Layer(self._base._node_index)
+        self._edge_index = _Layer(self._base._edge_map())
+        self._edge_seq = {}
+        self._out_adj = {}
+        self._in_adj = {}
+        self._pairs = {}
+        self._frame_changed()
+        # Blocks revert to the base versions
+        self._revision_floor = self._version
+
+    # ==================== Merged adjacency ====================
+
+    def _merge(self, base_edges: Iterable[Edge], local: Iterable[Edge] | None) -> list[Edge]:
+        hidden = self._edge_index.hidden
+        if hidden:
+            edges = [e for e in base_edges if e.id not in hidden]
+        else:
+            edges = list(base_edges)
+        if local:
+            n = len(edges)
+            edges.extend(local)
+            # Copies of base edges go back to the base edge's place
+            base_count = self._base_edge_count
+            seq = self._edge_seq
+            if len(edges) > 1 and any(seq[e.id] < base_count for e in edges[n:]):
+                edges.sort(key=lambda e: self._edge_position(e.id))
+        return edges
+
+    def _edges_from(self, node_id: str) -> list[Edge]:
+        local = self._out_adj.get(node_id)
+        return self._merge(self._base._edges_from(node_id), local and local.values())
+
+    def _edges_to(self, node_id: str) -> list[Edge]:
+        local = self._in_adj.get(node_id)
+        return self._merge(self._base._edges_to(node_id), local and local.values())
+
+    def _pair_edges(self, from_id: str, to_id: str) -> list[Edge]:
+        found = self._pairs.get((from_id, to_id))
+        local = found if type(found) is list else None if found is None else [found]
+        return self._merge(self._base._pair_edges(from_id, to_id), local)  # type: ignore[arg-type]
+
+    def _edge_position(self, id_: str) -> int:
+        seq = self._edge_seq.get(id_)
+        return self._base._edge_position(id_) if seq is None else seq
+
+    def _edge_map(self) -> Mapping[str, Edge]:
+        return self._edge_index
+
+    # ==================== Copy on access ====================
+
+    def _copy_node(self, node: Node) -> Node:
+        copy = Node(
+            id=node.id,
+            type=node.type,
+            lang=node.lang,
+            meta=node._meta,
+            content=node.content,
+            _doc=self,
+        )
+        copy.tier = node._tier
+        return copy
+
+    def _copy_edge(self, edge: Edge) -> Edge:
+        return Edge(
+            id=edge.id,
+            from_id=edge.from_id,
+            to_id=edge.to_id,
+            rel=edge.rel,
+            type=edge.type,
+            lang=edge.lang,
+            meta=edge._meta,
+            content=edge.content,
+            render_edge=edge.render_edge,
+            _doc=self,
+        )
+
+    def _index_copy(self, copy: Edge) -> None:
+        """Index the copy of a base edge in place of the base edge."""
+        self._edge_seq[copy.id] = self._base._edge_position(copy.id)
+        self._edge_index[copy.id] = copy
+        self._out_adj.setdefault(copy.from_id, {})[copy.id] = copy
+        self._in_adj.setdefault(copy.to_id, {})[copy.id] = copy
+        self._link_pair(copy, copy.from_id, copy.to_id)
+
+    def _own_node(self, node: Node) -> Node:
+        """Return the overlay's copy of ``node``, copying a base node."""
+        if node._doc is self:
+            return node
+        copy = self._copy_node(node)
+        self._node_index[node.id] = copy
+        return copy
+
+    def _own_edge(self, edge: Edge) -> Edge:
+        """Return the overlay's copy of ``edge``, copying a base edge."""
+        if edge._doc is self:
+            return edge
+        copy = self._copy_edge(edge)
+        self._index_copy(copy)
+        return copy
+
+    def _adopt(self, block: Block) -> bool:
+        """Make a copy returned by nodes/edges the overlay's own block.
+
+        Called when the copy changes. Returns False if the overlay already
+        owns a block with its ID or the ID was removed; changes to such a
+        stale copy are not seen by the overlay.
+        """
+        is_edge = isinstance(block, Edge)
+        index = self._edge_index if is_edge else self._node_index
+        current = index.get(block.id)
+        if current is None or current is block or current._doc is self:
+            return False
+        if is_edge:
+            self._index_copy(block)  # type: ignore[arg-type]
+        else:
+            index[block.id] = block
+        return True
+
+    def _block_changed(self, block: Block, name: str) -> None:
+        self._adopt(block)
+        super()._block_changed(block, name)
+
+    def _edge_endpoint_changed(self, edge: Edge, name: str, old: str) -> None:
+        if self._adopt(edge):
+            self._topology_changed(old)
+        else:
+            super()._edge_endpoint_changed(edge, name, old)
+
+    @property
+    def nodes(self) -> list[Node]:
+        """All nodes, with copies of the visible base nodes.
+
+        The copies join the overlay only when changed, so listing leaves
+        it as small as its edits; each call still allocates one copy per
+        base node. Use get_node() for one node, or render and traverse
+        the graph, to avoid the copies.
+        """
+        return [n if n._doc is self else self._copy_node(n) for n in self._node_index.values()]
+
+    @property
+    def edges(self) -> list[Edge]:
+        """All edges, with copies of the visible base edges; see ``nodes``."""
+        return [e if e._doc is self else self._copy_edge(e) for e in self._edge_index.values()]
+
+    def get_node(self, id_: str) -> Node | None:
+        node = self._node_index.get(id_)
+        return None if node is None else self._own_node(node)
+
+    def get_edge(self, id_: str) -> Edge | None:
+        edge = self._edge_index.get(id_)
+        return None if edge is None else self._own_edge(edge)
+
+    def get_edges_from(self, node_id: str) -> list[Edge]:
+        return [self._own_edge(e) for e in self._edges_from(node_id)]
+
+    def get_edges_to(self, node_id: str) -> list[Edge]:
+        return [self._own_edge(e) for e in self._edges_to(node_id)]
+
+    def get_edges_between(
+        self, from_id: str, to_id: str, rel: str | None = None
+    ) -> list[Edge]:
+        return [
+            self._own_edge(e)
+            for e in self._pair_edges(from_id, to_id)
+            if rel is None or e.rel == rel
+        ]
+
+    def has_edge(self, from_id: str, to_id: str, rel: str | None = None) -> bool:
+        return any(rel is None or e.rel == rel for e in self._pair_edges(from_id, to_id))
+
+    # ==================== Removal ====================
+
+    def _drop_edge(self, edge: Edge) -> Edge:
+        """Remove ``edge``; return it, or a detached copy of a base edge."""
+        if edge._doc is self:
+            self._unindex_edge(edge)
+            edge._doc = None
+            return edge
+        del self._edge_index[edge.id]
+        self._topology_changed(edge.from_id, edge.to_id)
+        self._revised(True, edge.id)
+        return Edge(
+            id=edge.id,
+            from_id=edge.from_id,
+            to_id=edge.to_id,
+            rel=edge.rel,
+            type=edge.type,
+            lang=edge.lang,
+            meta=edge._meta,
+            content=edge.content,
+            render_edge=edge.render_edge,
+        )
+
+    def remove_node(self, id_: str) -> Node:
+        node = self._node_index.get(id_)
+        if node is None:
+            raise NodeNotFoundError(id_)
+        incident = {e.id: e for e in self._edges_from(id_)}
+        incident.update((e.id, e) for e in self._edges_to(id_))
+        for edge in incident.values():
+            self._drop_edge(edge)
+        del self._node_index[id_]
+        if node._doc is self:
+            node._doc = None
+        else:
+            node = Node(
+                id=node.id,
+                type=node.type,
+                lang=node.lang,
+                meta=node._meta,
+                content=node.content,
+            )
+        self._topology_changed(id_)
+        self._revised(False, id_)
+        return node
+
+    def remove_edge(self, id_: str) -> Edge:
+        edge = self._edge_index.get(id_)
+        if edge is None:
+            raise KeyError(f"Edge '{id_}' not found")
+        return self._drop_edge(edge)
+
+    async def ensure_meta(self, *, force: bool = False) -> None:
+        """Apply generators to the overlay's own nodes and edges.
+
+        Base blocks keep the meta they have; run ensure_meta() on the base
+        to generate theirs.
+        """
+        blocks = [*self._node_index.local.values(), *self._edge_index.local.values()]
+        await asyncio.gather(*[
+            self._generator_registry.apply(b, force=force) for b in blocks
+        ])
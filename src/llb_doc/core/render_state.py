@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class RenderState:
+    """Per-render node state: tiers and in/out edge lists keyed by node ID.
+
+    Graph renders install a RenderState for their duration instead of writing
+    onto shared Node objects. While one is active, ``Node.tier``,
+    ``Node.in_edges`` and ``Node.out_edges`` read from it, so sorters and
+    ``Node.render_meta()`` see the values of the render in progress. The
+    state lives in a ContextVar, making it private to each thread and to each
+    asyncio task.
+    """
+
+    __slots__ = ("tiers", "in_edges", "out_edges")
+
+    def __init__(
+        self,
+        tiers: dict[str, int] | None = None,
+        in_edges: dict[str, list[str]] | None = None,
+        out_edges: dict[str, list[str]] | None = None,
+    ) -> None:
+        self.tiers: dict[str, int] = tiers if tiers is not None else {}
+        self.in_edges: dict[str, list[str]] = in_edges if in_edges is not None else {}
+        self.out_edges: dict[str, list[str]] = (
+            out_edges if out_edges is not None else {}
+        )
+
+
+_current_state: ContextVar[RenderState | None] = ContextVar(
+    "llb_render_state", default=None
+)
+
+
+def current_render_state() -> RenderState | None:
+    """Return the RenderState of the render in progress, if any."""
+    return _current_state.get()
+
+
+@contextmanager
+def render_state(state: RenderState) -> Iterator[RenderState]:
+    """Activate ``state`` for the current thread / task."""
+    token = _current_state.set(state)
+    try:
+        yield state
+    finally:
+        _current_state.reset(token)
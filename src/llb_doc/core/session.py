@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Sequence
+from weakref import WeakSet
+
+from .block import Block
+from .ctx import Ctx
+from .document import MetaRefreshMode
+from .graph_document import _id_key
+from .render_state import render_state
+
+if TYPE_CHECKING:
+    from .graph_document import GraphDocument
+
+# (is_edge, id) -> render-time values of a node (None for an edge)
+_Emitted = dict[tuple[bool, str], object]
+
+_MISSING = object()
+
+
+class RenderSession:
+    """Renders a graph turn by turn, emitting only what the reader lacks.
+
+    Created by ``GraphDocument.session()``. Each ``render()`` computes the
+    focused neighbourhood like ``GraphDocument.render()`` but outputs only
+    the nodes and edges that were not emitted by an earlier turn, or that
+    changed since: their fields, a node's tier or its in/out edge lists.
+    The @ctx block lists the whole scope in ``tiers`` and, in ``removed``,
+    the emitted IDs that are no longer in it. Prefix and suffix are
+    emitted on the first turn and again when they change.
+
+    Changes are read from per-block revisions the graph records while
+    sessions exist, so unchanged blocks are never rendered again. The graph
+    drops revisions older than the last turn of its oldest live session.
+    """
+
+    def __init__(self, doc: GraphDocument) -> None:
+        if doc._revisions is None:
+            doc._revisions = {}
+        if doc._sessions is None:
+            doc._sessions = WeakSet()
+        doc._sessions.add(self)
+        self._doc = doc
+        self._emitted: _Emitted = {}
+        # Graph version at the last turn, None before the first one
+        self._synced: int | None = None
+        self._prefix = ""
+        self._suffix = ""
+
+    @property
+    def document(self) -> GraphDocument:
+        return self._doc
+
+    def reset(self) -> None:
+        """Forget what was emitted; the next turn renders the full context."""
+        self._emitted = {}
+        self._synced = None
+        self._prefix = ""
+        self._suffix = ""
+
+    def render(
+        self,
+        *,
+        focus: str | Sequence[str],
+        radius: int = 1,
+        strategy: str = "bfs",
+        order: str | None = "focus_last",
+        ctx_content: str = "",
+        ctx_meta: dict[str, str] | None = None,
+        meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+    ) -> str:
+        """Render the next turn: the @ctx plus new and changed blocks."""
+        if meta_refresh != MetaRefreshMode.NONE:
+            force = meta_refresh == MetaRefreshMode.FORCE
+            asyncio.run(self._doc.ensure_meta(force=force))
+        return self._render_delta(focus, radius, strategy, order, ctx_content, ctx_meta)
+
+    async def arender(
+        self,
+        *,
+        focus: str | Sequence[str],
+        radius: int = 1,
+        strategy: str = "bfs",
+        order: str | None = "focus_last",
+        ctx_content: str = "",
+        ctx_meta: dict[str, str] | None = None,
+        meta_refresh: MetaRefreshMode = MetaRefreshMode.NORMAL,
+    ) -> str:
+        """Async version of render()."""
+        if meta_refresh != MetaRefreshMode.NONE:
+            force = meta_refresh == MetaRefreshMode.FORCE
+            await self._doc.ensure_meta(force=force)
+        return self._render_delta(focus, radius, strategy, order, ctx_content, ctx_meta)
+
+    def _render_delta(
+        self,
+        focus: str | Sequence[str],
+        radius: int,
+        strategy: str,
+        order: str | None,
+        ctx_content: str,
+        ctx_meta: dict[str, str] | None,
+    ) -> str:
+        doc = self._doc
+        seeds = doc._focus_seeds(focus)
+        tiers = self._tiers(seeds, radius, strategy)
+        included = set(tiers)
+        state = doc._render_state(tiers, included)
+
+        version = doc._version
+        # Everything emitted so far was current at the last turn
+        synced = self._synced or 0
+        revisions = doc._revisions or {}
+        floor = doc._revision_floor
+        previous = self._emitted
+        emitted: _Emitted = {}
+        changed: list[Block] = []
+
+        def visit(key: tuple[bool, str], block: Block, values: object) -> None:
+            if (
+                previous.get(key, _MISSING) != values
+                or max(revisions.get(key, 0), floor) > synced
+            ):
+                changed.append(block)
+            emitted[key] = values
+
+        in_edges, out_edges = state.in_edges, state.out_edges
+        for node_id, tier in tiers.items():
+            visit(
+                (False, node_id),
+                doc._node_index[node_id],
+                (tier, in_edges[node_id], out_edges[node_id]),
+            )
+        for edge in doc._select_edges(included):
+            visit((True, edge.id), edge, None)
+
+        removed = sorted(
+            (key for key in previous if key not in emitted),
+            key=lambda key: (key[0], _id_key(key[1])),
+        )
+        self._emitted = emitted
+        self._synced = version
+
+        ctx = Ctx(
+            id=doc._generate_ctx_id(),
+            focus=",".join(seeds),
+            radius=radius,
+            strategy=strategy,
+            tiers=doc._build_tiers_string(tiers),
+            removed=", ".join(id_ for _, id_ in removed) or None,
+            content=ctx_content,
+            meta=ctx_meta or {},
+            _doc=doc,
+        )
+        with render_state(state):
+            blocks = doc._sorter_registry.apply([ctx, *changed], order or "focus_last")
+            body = "\n\n".join(b.render() for b in blocks)
+        return self._wrap(body)
+
+    def _tiers(self, seeds: list[str], radius: int, strategy: str) -> dict[str, int]:
+        doc = self._doc
+        cache = doc._render_cache
+        if cache is None:
+            return doc._compute_tiers(seeds, radius, strategy)
+        key = (tuple(seeds), radius, strategy)
+        tiers = cache.get_tiers(key)
+        if tiers is None:
+            tiers = doc._compute_tiers(seeds, radius, strategy)
+            cache.put_tiers(key, tiers)
+        return tiers
+
+    def _wrap(self, body: str) -> str:
+        """Add the prefix and suffix sections the reader has not seen yet."""
+        doc = self._doc
+        parts: list[str] = []
+        if doc._prefix and doc._prefix != self._prefix:
+            parts.append(doc._prefix)
+            parts.append("---")
+        parts.append(body)
+        if doc._suffix and doc._suffix != self._suffix:
+            parts.append("---")
+            parts.append(doc._suffix)
+        self._prefix = doc._prefix
+        self._suffix = doc._suffix
+        return "\n\n".join(parts)
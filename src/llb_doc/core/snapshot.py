@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import json
+import mmap as _mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterable, Iterator, Sequence, Union
+
+from .block import Block, LazyFields, _content_slot, _meta_slot, _set
+from .bulk import gc_paused
+from .ctx import Ctx
+from .document import Document, IDGenerator
+from .edge import Edge
+from .frozen_graph import FrozenGraph, _int_typecode
+from .graph_document import GraphDocument
+from .node import Node
+from .vocab import Vocabulary
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+MAGIC = b"LLBSNAP\0"
+FORMAT_VERSION = 1
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 8
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a snapshot this version can read."""
+
+
+# ==================== Writing ====================
+
+
+class _Writer:
+    """Collects named, typed sections and writes them after a JSON header.
+
+    Section offsets in the header are relative to the 8-byte aligned start
+    of the data, so the header can be serialized before the data is laid
+    out. Integer sections use native byte order, recorded in the header.
+    """
+
+    def __init__(self) -> None:
+        self._sections: list[tuple[str, str, Any]] = []
+
+    def ints(self, name: str, values: Any, typecode: str | None = None) -> None:
+        if isinstance(values, memoryview):
+            values = array(values.format, values)
+        elif not isinstance(values, array):
+            values = list(values)
+            limit = max(max(values, default=0), -min(values, default=0))
+            values = array(typecode or _int_typecode(limit + 1), values)
+        self._sections.append((name, values.typecode, values))
+
+    def bytes(self, name: str, data: Any) -> None:
+        self._sections.append((name, "B", data))
+
+    def strings(self, name: str, values: Iterable[str]) -> None:
+        """A string column: UTF-8 data plus n + 1 byte offsets."""
+        chunks = [value.encode("utf-8") for value in values]
+        offsets = array("q", [0]) * (len(chunks) + 1)
+        pos = 0
+        for i, chunk in enumerate(chunks, 1):
+            pos += len(chunk)
+            offsets[i] = pos
+        self._sections.append((f"{name}.off", "q", offsets))
+        self._sections.append((f"{name}.data", "B", b"".join(chunks)))
+
+    def write(self, path: PathLike, meta: dict[str, Any]) -> int:
+        table: dict[str, list[Any]] = {}
+        pos = 0
+        for name, fmt, data in self._sections:
+            size = memoryview(data).nbytes
+            table[name] = [pos, size, fmt]
+            pos += size + -size % _ALIGN
+        header = json.dumps(
+            {"byteorder": sys.byteorder, "sections": table, "doc": meta},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        start = _PREAMBLE.size + len(header)
+        with open(path, "wb") as fp:
+            fp.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            fp.write(header)
+            fp.write(b"\0" * (-start % _ALIGN))
+            for _, _, data in self._sections:
+                size = memoryview(data).nbytes
+                fp.write(data)
+                fp.write(b"\0" * (-size % _ALIGN))
+        return start + -start % _ALIGN + pos
+
+
+def _write_records(
+    writer: _Writer, name: str, blocks: Sequence[Block], vocab: dict[str, int]
+) -> None:
+    """Write id, type, lang, content and meta columns for ``blocks``."""
+
+    def code(s: str) -> int:
+        n = vocab.get(s)
+        if n is None:
+            n = vocab[s] = len(vocab)
+        return n
+
+    writer.strings(f"{name}.id", [b.id for b in blocks])
+    writer.ints(f"{name}.type", [code(b.type) for b in blocks])
+    writer.ints(f"{name}.lang", [code(b.lang) if b.lang else -1 for b in blocks])
+    writer.strings(f"{name}.content", [b.content for b in blocks])
+    offsets = [0]
+    keys: list[int] = []
+    values: list[str] = []
+    for block in blocks:
+        meta = block._meta
+        if meta:
+            for key, value in meta.items():
+                keys.append(code(key))
+                values.append(str(value))
+        offsets.append(len(keys))
+    writer.ints(f"{name}.meta.off", offsets)
+    writer.ints(f"{name}.meta.key", keys)
+    writer.strings(f"{name}.meta.value", values)
+
+
+def _id_gen_state(gen: IDGenerator) -> list[Any]:
+    return [gen._prefix, gen._counter]
+
+
+def _ctx_state(ctx: Ctx | None) -> dict[str, Any] | None:
+    if ctx is None:
+        return None
+    fields = ("id", "type", "lang", "content", "focus", "radius", "strategy")
+    state = {name: getattr(ctx, name) for name in fields}
+    state.update(tiers=ctx.tiers, budget=ctx.budget, cut=ctx.cut, removed=ctx.removed)
+    state["meta"] = dict(ctx._meta or {})
+    return state
+
+
+def save_snapshot(doc: Document, path: PathLike) -> int:
+    """Write ``doc`` to ``path`` in the binary snapshot format.
+
+    Strings repeated across blocks (types, langs, rels, meta keys) are
+    stored once in a table; contents and meta values are concatenated into
+    offset-indexed columns. A GraphDocument is stored as its frozen form:
+    nodes, CSR topology and the edges that carry extra fields. Meta values
+    are stored as strings. Meta generators and custom sorters are not
+    stored. Returns the number of bytes written.
+    """
+    writer = _Writer()
+    vocab: dict[str, int] = {}
+    meta: dict[str, Any] = {
+        "prefix": doc._prefix,
+        "suffix": doc._suffix,
+        "vocab": None if doc._vocab is None else sorted(doc._vocab.value_keys),
+    }
+    if isinstance(doc, GraphDocument):
+        frozen = doc if isinstance(doc, FrozenGraph) else FrozenGraph(doc)
+        meta["kind"] = "graph"
+        meta["graph_id"] = doc.graph_id
+        meta["ctx"] = _ctx_state(doc._ctx)
+        meta["id_gens"] = [
+            _id_gen_state(gen)
+            for gen in (doc._node_id_gen, doc._edge_id_gen, doc._ctx_id_gen)
+        ]
+        _write_records(writer, "node", list(frozen._node_index.values()), vocab)
+        writer.strings("dangling", frozen._ids[frozen._num_nodes :])
+        writer.strings("rels", frozen._rels)
+        writer.strings("edge.id", frozen._edge_ids)
+        for name in ("src", "dst", "rel"):
+            writer.ints(f"edge.{name}", getattr(frozen, f"_edge_{name}"))
+        writer.bytes("edge.render", frozen._edge_render)
+        for direction in ("out", "in"):
+            writer.ints(f"{direction}.off", getattr(frozen, f"_{direction}_offsets"))
+            writer.ints(f"{direction}.nbr", getattr(frozen, f"_{direction}_nbrs"))
+            writer.ints(f"{direction}.eid", getattr(frozen, f"_{direction}_eids"))
+        extra = frozen._edge_extra
+        eids = sorted(extra) if isinstance(extra, dict) else list(extra.eids)
+        writer.ints("extra.eid", eids)
+        _write_records(writer, "extra", [extra.get(eid) for eid in eids], vocab)
+    else:
+        meta["kind"] = "document"
+        meta["id_gens"] = [_id_gen_state(doc._id_gen)]
+        _write_records(writer, "block", doc.blocks, vocab)
+    writer.strings("vocab", vocab)
+    return writer.write(path, meta)
+
+
+# ==================== Reading ====================
+
+
+class _StringColumn(Sequence[str]):
+    """Read-only sequence of the strings in a column, decoded on access."""
+
+    __slots__ = ("_off", "_data")
+
+    def __init__(self, offsets: memoryview, data: memoryview) -> None:
+        self._off = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._off) - 1
+
+    def __getitem__(self, i: int) -> str:  # type: ignore[override]
+        if i < 0:
+            i += len(self)
+        off = self._off
+        return str(self._data[off[i] : off[i + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.decode())
+
+    def decode(self) -> list[str]:
+        """Decode the whole column at once."""
+        data = bytes(self._data)
+        off = self._off
+        text = data.decode("utf-8")
+        if len(text) == len(data):
+            # ASCII: byte offsets are character offsets
+            return [text[a:b] for a, b in zip(off, off[1:])]
+        return [data[a:b].decode("utf-8") for a, b in zip(off, off[1:])]
+
+    def __reduce__(self) -> tuple:
+        return (list, (self.decode(),))
+
+
+class _Reader:
+    def __init__(self, buf: Any) -> None:
+        view = memoryview(buf)
+        if view.nbytes < _PREAMBLE.size:
+            raise SnapshotError("File is too short to be a snapshot")
+        magic, version, size = _PREAMBLE.unpack_from(view)
+        if magic != MAGIC:
+            raise SnapshotError("Not an llb_doc snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}")
+        start = _PREAMBLE.size + size
+        header = json.loads(bytes(view[_PREAMBLE.size : start]))
+        if header["byteorder"] != sys.byteorder:
+            raise SnapshotError(f"Snapshot is {header['byteorder']}-endian")
+        self.meta: dict[str, Any] = header["doc"]
+        self._sections: dict[str, list[Any]] = header["sections"]
+        self._data = view[start + -start % _ALIGN :]
+
+    def ints(self, name: str) -> memoryview:
+        pos, size, fmt = self._sections[name]
+        return self._data[pos : pos + size].cast(fmt)
+
+    def bytes(self, name: str) -> memoryview:
+        pos, size, _ = self._sections[name]
+        return self._data[pos : pos + size]
+
+    def strings(self, name: str) -> _StringColumn:
+        return _StringColumn(self.ints(f"{name}.off"), self.bytes(f"{name}.data"))
+
+
+class _Records:
+    """Columns of one block table; contents and meta are read per row."""
+
+    __slots__ = ("ids", "types", "langs", "content", "meta_off", "meta_key", "meta_value", "vocab")
+
+    def __init__(self, reader: _Reader, name: str, vocab: list[str]) -> None:
+        self.ids = reader.strings(f"{name}.id")
+        self.types = reader.ints(f"{name}.type")
+        self.langs = reader.ints(f"{name}.lang")
+        self.content = reader.strings(f"{name}.content")
+        self.meta_off = reader.ints(f"{name}.meta.off")
+        self.meta_key = reader.ints(f"{name}.meta.key")
+        self.meta_value = reader.strings(f"{name}.meta.value")
+        self.vocab = vocab
+
+    def header(self) -> Iterator[tuple[str, str, str | None]]:
+        """Yield (id, type, lang) per row."""
+        vocab = self.vocab
+        for id_, type_, lang in zip(self.ids.decode(), self.types, self.langs):
+            yield id_, vocab[type_], vocab[lang] if lang >= 0 else None
+
+    def read(self, row: int) -> tuple[str, dict[str, str] | None]:
+        lo, hi = self.meta_off[row], self.meta_off[row + 1]
+        meta = None
+        if hi > lo:
+            vocab, values = self.vocab, self.meta_value
+            meta = {vocab[self.meta_key[j]]: values[j] for j in range(lo, hi)}
+        return self.content[row], meta
+
+
+class _SnapshotBlock(LazyFields, Block):
+    __slots__ = ("_source", "_row")
+
+    def _read(self) -> tuple[str, dict[str, str] | None]:
+        return self._source.read(self._row)
+
+
+class _SnapshotNode(LazyFields, Node):
+    __slots__ = ("_source", "_row")
+
+    def _read(self) -> tuple[str, dict[str, str] | None]:
+        return self._source.read(self._row)
+
+
+def _new_blocks(
+    cls: type[Block], records: _Records, doc: Document
+) -> Iterator[Block]:
+    """Yield one unloaded ``cls`` block per row without running __init__.
+
+    Types and langs come from the interned vocab table, so the slots are
+    set directly; this is most of the cost of a load.
+    """
+    new = cls.__new__
+    node = issubclass(cls, Node)
+    for row, (id_, type_, lang) in enumerate(records.header()):
+        block = new(cls)
+        _set(block, "id", id_)
+        _set(block, "type", type_)
+        _set(block, "lang", lang)
+        _content_slot.__set__(block, "")
+        _meta_slot.__set__(block, None)
+        _set(block, "_doc", doc)
+        _set(block, "_memo", None)
+        _set(block, "_brief_memo", None)
+        _set(block, "_token_memo", None)
+        if node:
+            _set(block, "_tier", None)
+            _set(block, "_in_edges", None)
+            _set(block, "_out_edges", None)
+        _set(block, "_source", records)
+        _set(block, "_row", row)
+        yield block
+
+
+class _SnapshotEdge(LazyFields, Edge):
+    __slots__ = ("_source", "_row")
+
+    def __init__(self, source: _Records, row: int, **fields: Any) -> None:
+        _set(self, "_source", None)
+        super().__init__(**fields)
+        _set(self, "_source", source)
+        _set(self, "_row", row)
+
+    def _read(self) -> tuple[str, dict[str, str] | None]:
+        return self._source.read(self._row)
+
+
+class _ExtraEdges:
+    """FrozenGraph edges with extra fields, created on first lookup by eid."""
+
+    __slots__ = ("eids", "_records", "_graph", "_cache")
+
+    def __init__(self, eids: memoryview, records: _Records, graph: FrozenGraph) -> None:
+        self.eids = eids
+        self._records = records
+        self._graph = graph
+        self._cache: dict[int, Edge] = {}
+
+    def get(self, eid: int, default: Edge | None = None) -> Edge | None:
+        edge = self._cache.get(eid)
+        if edge is not None:
+            return edge
+        eids = self.eids
+        row = bisect_left(eids, eid)
+        if row == len(eids) or eids[row] != eid:
+            return default
+        g = self._graph
+        records = self._records
+        lang = records.langs[row]
+        edge = _SnapshotEdge(
+            records,
+            row,
+            id=g._edge_ids[eid],
+            from_id=g._ids[g._edge_src[eid]],
+            to_id=g._ids[g._edge_dst[eid]],
+            rel=g._rels[g._edge_rel[eid]],
+            type=records.vocab[records.types[row]],
+            lang=records.vocab[lang] if lang >= 0 else None,
+            render_edge=bool(g._edge_render[eid]),
+            _doc=g,
+        )
+        self._cache[eid] = edge
+        return edge
+
+    def __reduce__(self) -> tuple:
+        return (dict, ({eid: self.get(eid) for eid in self.eids},))
+
+
+def _restore_id_gens(gens: Sequence[IDGenerator], states: list[list[Any]]) -> None:
+    for gen, (prefix, counter) in zip(gens, states):
+        gen._prefix = prefix
+        gen._counter = counter
+
+
+def load_snapshot(path: PathLike, *, mmap: bool = True) -> Document:
+    """Load a document written by ``save_snapshot``.
+
+    With ``mmap`` (the default) the file is memory-mapped read-only, so
+    processes loading the same snapshot share its pages. Block IDs, types
+    and langs are read up front; each block's content and meta are decoded
+    from the file on first access. A graph comes back as a FrozenGraph
+    whose CSR arrays are views of the file; a flat document comes back as
+    a Document that can be edited as usual.
+    """
+    with open(path, "rb") as fp:
+        if mmap:
+            try:
+                buf: Any = _mmap.mmap(fp.fileno(), 0, access=_mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError("File is too short to be a snapshot") from None
+        else:
+            buf = fp.read()
+    reader = _Reader(buf)
+    meta = reader.meta
+    value_keys = meta["vocab"]
+    vocab_strings = reader.strings("vocab").decode()
+    if value_keys is None:
+        vocab: Vocabulary | bool = False
+    else:
+        vocab = Vocabulary(value_keys)
+        vocab_strings = [vocab.intern(s) for s in vocab_strings]
+
+    with gc_paused():
+        if meta["kind"] == "graph":
+            return _load_graph(reader, meta, vocab, vocab_strings)
+        doc = Document(vocab=vocab)
+        doc._prefix = meta["prefix"]
+        doc._suffix = meta["suffix"]
+        _restore_id_gens([doc._id_gen], meta["id_gens"])
+        records = _Records(reader, "block", vocab_strings)
+        doc._id_index = {b.id: b for b in _new_blocks(_SnapshotBlock, records, doc)}
+        doc._block_order.extend(doc._id_index)
+        return doc
+
+
+def _load_graph(
+    reader: _Reader, meta: dict[str, Any], vocab: Vocabulary | bool, vocab_strings: list[str]
+) -> FrozenGraph:
+    graph = FrozenGraph.__new__(FrozenGraph)
+    GraphDocument.__init__(graph, meta["graph_id"], vocab=vocab)  # type: ignore[arg-type]
+    graph._prefix = meta["prefix"]
+    graph._suffix = meta["suffix"]
+    _restore_id_gens(
+        [graph._node_id_gen, graph._edge_id_gen, graph._ctx_id_gen], meta["id_gens"]
+    )
+    ctx = meta["ctx"]
+    if ctx is not None:
+        graph._ctx = Ctx(_doc=graph, **ctx)
+
+    records = _Records(reader, "node", vocab_strings)
+    graph._node_index = {n.id: n for n in _new_blocks(_SnapshotNode, records, graph)}  # type: ignore[misc]
+    ids = list(graph._node_index)
+    graph._num_nodes = len(ids)
+    ids.extend(reader.strings("dangling").decode())
+    graph._ids = ids
+    graph._num = {id_: i for i, id_ in enumerate(ids)}
+    graph._rels = reader.strings("rels").decode()
+    graph._edge_ids = reader.strings("edge.id")
+    graph._edge_src = reader.ints("edge.src")
+    graph._edge_dst = reader.ints("edge.dst")
+    graph._edge_rel = reader.ints("edge.rel")
+    graph._edge_render = reader.bytes("edge.render")
+    graph._edge_num = None
+    for direction in ("out", "in"):
+        setattr(graph, f"_{direction}_offsets", reader.ints(f"{direction}.off"))
+        setattr(graph, f"_{direction}_nbrs", reader.ints(f"{direction}.nbr"))
+        setattr(graph, f"_{direction}_eids", reader.ints(f"{direction}.eid"))
+    graph._edge_extra = _ExtraEdges(  # type: ignore[assignment]
+        reader.ints("extra.eid"), _Records(reader, "extra", vocab_strings), graph
+    )
+    return graph
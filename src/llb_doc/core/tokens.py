@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import re
+import zlib
+from typing import TYPE_CHECKING, Protocol, Sequence
+
+from .block import _set
+
+if TYPE_CHECKING:
+    from .block import Block
+
+
+class Tokenizer(Protocol):
+    """Anything with ``encode(text) -> token IDs``.
+
+    ``tiktoken`` encodings qualify as they are; wrap other libraries in a
+    small class, e.g. ``encode = lambda self, t: hf.encode(t).ids``.
+    """
+
+    def encode(self, text: str) -> Sequence[int]: ...
+
+
+# Pre-tokenizer in the style of GPT-2/cl100k: words and punctuation runs
+# with their leading space, numbers of up to three digits, whitespace
+_PIECES = re.compile(r" ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+")
+
+
+class ApproxTokenizer:
+    """Local approximation of a BPE tokenizer; no vocabulary needed.
+
+    Text is split like a GPT-style pre-tokenizer and pieces longer than
+    ``max_piece`` characters are cut into chunks, which lands close to
+    the counts of common LLM tokenizers on English prose and code. IDs
+    are stable hashes of the chunks, unique only in practice, so they are
+    good for plumbing and tests but not for a real model.
+    """
+
+    def __init__(self, max_piece: int = 8, vocab_size: int = 1 << 17) -> None:
+        if max_piece <= 0 or vocab_size <= 0:
+            raise ValueError("max_piece and vocab_size must be positive")
+        self.max_piece = max_piece
+        self.vocab_size = vocab_size
+
+    def encode(self, text: str) -> list[int]:
+        step, size = self.max_piece, self.vocab_size
+        crc32 = zlib.crc32
+        ids: list[int] = []
+        for piece in _PIECES.findall(text):
+            for i in range(0, len(piece), step):
+                ids.append(crc32(piece[i : i + step].encode("utf-8")) % size)
+        return ids
+
+    def __repr__(self) -> str:
+        return f"ApproxTokenizer(max_piece={self.max_piece}, vocab_size={self.vocab_size})"
+
+
+DEFAULT_TOKENIZER = ApproxTokenizer()
+
+
+class TokenCounts:
+    """Token counts of one render.
+
+    ``total`` covers the whole output, including prefix, suffix and the
+    separators between blocks; ``blocks`` maps block IDs to the counts of
+    their fragments, in output order.
+    """
+
+    __slots__ = ("total", "blocks")
+
+    def __init__(self, total: int, blocks: dict[str, int]) -> None:
+        self.total = total
+        self.blocks = blocks
+
+    def __repr__(self) -> str:
+        return f"TokenCounts(total={self.total}, blocks={len(self.blocks)})"
+
+
+def block_tokens(tokenizer: Tokenizer, block: Block, text: str) -> Sequence[int]:
+    """Return the tokens of ``text``, a fragment rendered from ``block``.
+
+    The tokens are memoized on the block until it changes or renders a
+    different fragment (nodes do when their tier or edges change).
+    """
+    memo = block._token_memo
+    if memo is not None and memo[0] is tokenizer and memo[1] == text:
+        return memo[2]
+    tokens = tokenizer.encode(text)
+    _set(block, "_token_memo", (tokenizer, text, tokens))
+    return tokens
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Mapping
+
+
+class Vocabulary:
+    """Interning table for strings repeated across the blocks of a document.
+
+    Block types, edge relations, langs and meta keys are replaced by one
+    shared string object when a block is created for a document, so equal
+    strings from parsers or JSON loaders are stored once and compare by
+    identity. Meta values are interned only for the keys in ``value_keys``,
+    which should name low-cardinality fields such as a status or kind.
+
+    A vocabulary may be shared by several documents by passing the same
+    instance to each.
+    """
+
+    __slots__ = ("_strings", "value_keys")
+
+    def __init__(self, value_keys: Iterable[str] = ()) -> None:
+        self._strings: dict[str, str] = {}
+        self.value_keys = frozenset(value_keys)
+
+    def intern(self, s: str) -> str:
+        """Return the canonical object for ``s``, adding it if new."""
+        return self._strings.setdefault(s, s)
+
+    def intern_meta(
+        self, meta: Mapping[str, Any], into: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Return a copy of ``meta`` with interned keys (and chosen values).
+
+        The entries are written into ``into`` instead of a new dict if
+        given, bypassing any ``__setitem__`` override of a dict subclass.
+        """
+        intern = self._strings.setdefault
+        value_keys = self.value_keys
+        if into is None:
+            if not value_keys:
+                return {intern(k, k): v for k, v in meta.items()}
+            return {
+                intern(k, k): intern(v, v) if k in value_keys and type(v) is str else v
+                for k, v in meta.items()
+            }
+        setitem = dict.__setitem__
+        if not value_keys:
+            for k, v in meta.items():
+                setitem(into, intern(k, k), v)
+        else:
+            for k, v in meta.items():
+                if k in value_keys and type(v) is str:
+                    v = intern(v, v)
+                setitem(into, intern(k, k), v)
+        return into
+
+    def intern_item(self, key: str, value: Any) -> tuple[str, Any]:
+        """Return ``key`` interned, and ``value`` too if key is a value key."""
+        key = self._strings.setdefault(key, key)
+        if key in self.value_keys and type(value) is str:
+            value = self._strings.setdefault(value, value)
+        return key, value
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __contains__(self, s: object) -> bool:
+        return s in self._strings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strings)
+
+    def __repr__(self) -> str:
+        return f"Vocabulary({len(self._strings)} strings)"
@@ -23,6 +23,9 @@ class GeneratorRegistry:
     def get(self, meta_key: str) -> MetaGenerator | None:
         return self._generators.get(meta_key)
 
+    def keys(self) -> tuple[str, ...]:
+        return tuple(self._generators)
+
     def set_cache(self, cache: GeneratorCache | None) -> None:
         self._cache = cache
 
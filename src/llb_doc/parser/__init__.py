@@ -1,3 +1,16 @@
+from .graph_parser import parse_graph
+from .lazy import LazyBlock
+from .parallel import parse_llb_parallel, parse_many
 from .parser import ParseError, parse_llb
+from .stream import BlockStream, iter_parse
 
-__all__ = ["ParseError", "parse_llb"]
+__all__ = [
+    "BlockStream",
+    "LazyBlock",
+    "ParseError",
+    "iter_parse",
+    "parse_graph",
+    "parse_llb",
+    "parse_llb_parallel",
+    "parse_many",
+]
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import ast
+import re
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Literal
+
+from ..core.bulk import gc_paused
+from ..core.ctx import Ctx
+from ..core.document import DuplicateIDError
+from ..core.edge import Edge
+from ..core.node import Node
+from .parser import END_MARKER, ParseError, _read_meta, _split_sections
+
+if TYPE_CHECKING:
+    from ..core.graph_document import GraphDocument
+    from ..core.vocab import Vocabulary
+
+GRAPH_START_RE = re.compile(r"^@(?:node|edge|ctx)\s+\S")
+
+# (from_id, to_id, rel) of an edge
+_EdgeKey = tuple[str, str, str]
+
+
+def _is_end(line: str) -> bool:
+    """Match ``@end <id>`` lines and one-line ``... @end`` headers."""
+    return line.startswith("@") and (
+        line.startswith("@end ") or line.endswith(" @end")
+    )
+
+
+def _int_or_none(value: str | None, key: str, line_number: int) -> int | None:
+    if value is None or value == "None":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ParseError(f"Invalid {key}: {value!r}", line_number) from None
+
+
+def _edge_labels(value: str, line_number: int) -> list[str]:
+    if value == "[]":
+        return []
+    if (
+        value.startswith("['")
+        and value.endswith("']")
+        and "\\" not in value
+        and '"' not in value
+    ):
+        # repr() switches to double quotes for labels containing a quote,
+        # so these labels have none and split on the separator exactly
+        return value[2:-2].split("', '")
+    try:
+        labels = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        labels = None
+    if not isinstance(labels, list):
+        raise ParseError(f"Invalid edge list: {value!r}", line_number)
+    return labels
+
+
+def parse_graph(
+    text: str, *, vocab: Vocabulary | Literal[False] | None = None
+) -> GraphDocument:
+    """Parse rendered graph text back into a GraphDocument.
+
+    Reads ``@node``, ``@edge`` and ``@ctx`` blocks, including one-line
+    ``... @end`` blocks and triple-quoted multi-line meta, in one pass over
+    the lines. Node ``tier`` lines are restored onto the nodes. Edges that
+    appear in a node's ``out_edges`` but were not rendered (``render_edge``
+    False) are re-created as hidden edges, in their place among the node's
+    ``out_edges`` and ``in_edges``. Edges to IDs without a node have an
+    @edge block in full renders but are in no node's edge lists; they keep
+    their block order. The ``@ctx`` block, if any, is
+    available as ``graph.ctx``; the graph's next render gets its ID, so
+    rendering ``graph.ctx.focus`` and ``graph.ctx.radius`` again reproduces
+    the text.
+    """
+    from ..core.graph_document import GraphDocument
+
+    graph = GraphDocument(vocab=vocab)
+    with gc_paused():
+        _parse_body(graph, text)
+    return graph
+
+
+def _parse_body(graph: GraphDocument, text: str) -> None:
+    lines = text.split("\n")
+    i, body_end = _split_sections(graph, lines, GRAPH_START_RE.match, _is_end)
+    out_labels: list[tuple[Node, list[str], int]] = []
+    in_labels: dict[str, list[str]] = {}
+    # Set when @node blocks follow @edge blocks, i.e. edges go by tier
+    tiered = False
+    # Edges are indexed in one batch once all nodes are known
+    edges: dict[str, Edge] = {}
+
+    while i < body_end:
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+
+        line_number = i + 1
+        parts = line.split()
+        one_line = len(parts) > 2 and parts[-1] == END_MARKER
+        if one_line:
+            parts.pop()
+        kind = parts[0]
+        if kind == "@node" and len(parts) in (3, 4):
+            block_id = parts[1]
+        elif kind == "@edge" and len(parts) in (6, 7) and parts[3] == "->":
+            block_id = parts[1]
+        elif kind == "@ctx" and len(parts) == 2:
+            block_id = parts[1]
+        else:
+            raise ParseError(f"Expected @node, @edge or @ctx, got: {line!r}", line_number)
+        i += 1
+
+        meta: dict[str, str] = {}
+        content = ""
+        if not one_line:
+            i = _read_meta(lines, i, body_end, meta, f"{END_MARKER} {block_id}")
+            # Skip empty line after metadata
+            if i < body_end and lines[i] == "":
+                i += 1
+            try:
+                end = lines.index(f"{END_MARKER} {block_id}", i, body_end)
+            except ValueError:
+                raise ParseError(
+                    f"Missing @end for block '{block_id}'", line_number
+                ) from None
+            content = "\n".join(lines[i:end]).rstrip("\n")
+            i = end + 1
+
+        try:
+            if kind == "@node":
+                tiered = tiered or bool(edges)
+                tier = _int_or_none(meta.pop("tier", None), "tier", line_number)
+                in_edges = meta.pop("in_edges", None)
+                out_edges = meta.pop("out_edges", None)
+                graph._validate_unique_node_id(block_id)
+                node = Node(
+                    id=block_id,
+                    type=parts[2],
+                    lang=parts[3] if len(parts) == 4 else None,
+                    meta=meta,
+                    content=content,
+                    _doc=graph,
+                )
+                node.tier = tier
+                graph._node_index[block_id] = node
+                if in_edges is not None:
+                    in_labels[block_id] = _edge_labels(in_edges, line_number)
+                if out_edges is not None:
+                    out_labels.append(
+                        (node, _edge_labels(out_edges, line_number), line_number)
+                    )
+            elif kind == "@edge":
+                if block_id in edges:
+                    raise DuplicateIDError(block_id)
+                edges[block_id] = Edge(
+                    id=block_id,
+                    from_id=parts[2],
+                    to_id=parts[4],
+                    rel=parts[5],
+                    lang=parts[6] if len(parts) == 7 else None,
+                    meta=meta,
+                    content=content,
+                    _doc=graph,
+                )
+            else:
+                if graph._ctx is not None:
+                    raise ParseError("Multiple @ctx blocks", line_number)
+                tiers = meta.pop("tiers", None)
+                graph._ctx = Ctx(
+                    id=block_id,
+                    focus=meta.pop("focus", None),
+                    radius=_int_or_none(meta.pop("radius", None), "radius", line_number),
+                    strategy=meta.pop("strategy", None),
+                    tiers=tiers.strip("\n") if tiers is not None else None,
+                    budget=_int_or_none(meta.pop("budget", None), "budget", line_number),
+                    cut=meta.pop("cut", None),
+                    removed=meta.pop("removed", None),
+                    meta=meta,
+                    content=content,
+                    _doc=graph,
+                )
+                # The next render of the same focus reuses the parsed ID
+                graph._ctx_id_gen.set_next(block_id)
+        except DuplicateIDError as e:
+            raise ParseError(str(e), line_number) from None
+
+    graph._index_edges(
+        _with_hidden_edges(
+            graph, list(edges.values()), out_labels, in_labels, tiered
+        )
+    )
+    graph._nodes_added(graph._node_index)
+
+
+def _with_hidden_edges(
+    graph: GraphDocument,
+    edges: list[Edge],
+    out_labels: list[tuple[Node, list[str], int]],
+    in_labels: dict[str, list[str]],
+    tiered: bool,
+) -> list[Edge]:
+    """Return ``edges`` with the edges listed in ``out_edges`` but not rendered.
+
+    Hidden edges have no @edge block, so their place in insertion order is
+    recovered from the node edge lists: edges are merged so that every
+    parsed ``out_edges`` and ``in_edges`` list comes out unchanged and the
+    rendered edges keep the order of their blocks (of each tier's blocks
+    with ``tiered``, as sorters group edges by tier when nodes follow
+    them). Of parallel edges with the same label, a rendered one is placed
+    first when both would fit. Lists that contradict the blocks fall back
+    to block order.
+    """
+    keys = [(e.from_id, e.to_id, e.rel) for e in edges]
+    # Labels of rendered edges map to their keys as written; other labels
+    # are split at the last colon
+    out_known: dict[str, dict[str, _EdgeKey]] = {}
+    for key in keys:
+        out_known.setdefault(key[0], {})[f"{key[1]}:{key[2]}"] = key
+    unlisted = Counter(keys)
+
+    outs: dict[str, list[_EdgeKey]] = {}
+    hidden: dict[_EdgeKey, list[Edge]] = {}
+    taken: set[str] | None = None
+    for node, labels, line_number in out_labels:
+        known = out_known.get(node.id, {})
+        listed = outs[node.id] = []
+        for label in labels:
+            key = known.get(label)
+            if key is not None and unlisted[key]:
+                unlisted[key] -= 1
+                listed.append(key)
+                continue
+            to_id, sep, rel = label.rpartition(":")
+            if not sep or not to_id or not rel:
+                raise ParseError(f"Invalid edge label: {label!r}", line_number)
+            if taken is None:
+                taken = {e.id for e in edges}
+            edge_id = graph._edge_id_gen.next()
+            while edge_id in taken:
+                edge_id = graph._edge_id_gen.next()
+            key = (node.id, to_id, rel)
+            listed.append(key)
+            hidden.setdefault(key, []).append(
+                Edge(
+                    id=edge_id,
+                    from_id=node.id,
+                    to_id=to_id,
+                    rel=rel,
+                    render_edge=False,
+                    _doc=graph,
+                )
+            )
+    if not hidden and not tiered:
+        return edges
+
+    # Sorters keep insertion order among the edges they print together:
+    # all edges, or with ``tiered`` the edges of each tier
+    nodes = graph._node_index
+    tiers = {id_: node._tier or 0 for id_, node in nodes.items()}
+    chain_index: dict[int, int] = {}
+    chains: list[list[int]] = []
+    chain_of: list[int] = []
+    for n, key in enumerate(keys):
+        group = max(tiers.get(key[0], 0), tiers.get(key[1], 0)) if tiered else 0
+        c = chain_index.get(group)
+        if c is None:
+            c = chain_index[group] = len(chains)
+            chains.append([])
+        chains[c].append(n)
+        chain_of.append(c)
+    if not hidden and len(chains) < 2:
+        return edges
+    # Same-key edges share their endpoints, hence their chain
+    key_chain = dict(zip(keys, chain_of))
+    chain_pos = [0] * len(chains)
+    unplaced = Counter(keys)
+
+    in_known: dict[str, dict[str, _EdgeKey]] = {}
+    for key in keys:
+        in_known.setdefault(key[1], {})[f"{key[0]}:{key[2]}"] = key
+    ins: dict[str, list[_EdgeKey]] = {}
+    for node_id, labels in in_labels.items():
+        known = in_known.get(node_id, {})
+        listed = ins[node_id] = []
+        for label in labels:
+            key = known.get(label)
+            if key is None:
+                from_id, _, rel = label.rpartition(":")
+                key = (from_id, node_id, rel)
+            listed.append(key)
+    for queue in hidden.values():
+        queue.reverse()
+    out_pos = dict.fromkeys(outs, 0)
+    in_pos = dict.fromkeys(ins, 0)
+
+    def blocker(key: _EdgeKey) -> _EdgeKey | None:
+        """Return the edge at the head of a list ``key`` is waiting on.
+
+        That is ``key`` itself once it heads its source's ``out_edges`` and
+        its target's ``in_edges``; None if a list has no room for it. Lists
+        only hold edges between nodes, so an edge with a dangling endpoint
+        waits on neither.
+        """
+        if key[0] not in nodes or key[1] not in nodes:
+            return key
+        listed = outs.get(key[0])
+        if listed is not None:
+            pos = out_pos[key[0]]
+            if pos == len(listed):
+                return None
+            if listed[pos] != key:
+                return listed[pos]
+        listed = ins.get(key[1])
+        if listed is not None:
+            pos = in_pos[key[1]]
+            if pos == len(listed):
+                return None
+            if listed[pos] != key:
+                return listed[pos]
+        return key
+
+    def resolve(
+        key: _EdgeKey, path: list[_EdgeKey], seen: set[_EdgeKey]
+    ) -> int | Edge | None:
+        """Return an edge that ``key`` waits on and that can be placed now.
+
+        Rendered edges are returned by index. The keys passed on the way are
+        pushed on ``path`` (and ``seen``), so the caller can resume from them
+        once the edge is placed.
+        """
+        while key not in seen:
+            head = blocker(key)
+            if head is None:
+                return None
+            if head == key:
+                if not unplaced[key]:
+                    return hidden[key][-1] if hidden.get(key) else None
+                c = key_chain[key]
+                first = chains[c][chain_pos[c]]
+                if keys[first] == key:
+                    return first
+                head = keys[first]
+                if hidden.get(key):
+                    # Parallel edges with the same label: place the rendered
+                    # one first unless its chain waits on the hidden one
+                    found = resolve(head, path[:], seen | {key})
+                    return hidden[key][-1] if found is None else found
+            path.append(key)
+            seen.add(key)
+            key = head
+        return None
+
+    ordered: list[Edge] = []
+
+    def place(found: int | Edge) -> None:
+        if type(found) is int:
+            key = keys[found]
+            unplaced[key] -= 1
+            chain_pos[chain_of[found]] += 1
+            ordered.append(edges[found])
+        else:
+            key = (found.from_id, found.to_id, found.rel)  # type: ignore[union-attr]
+            hidden[key].pop()
+            ordered.append(found)  # type: ignore[arg-type]
+        listed = outs.get(key[0])
+        if listed is not None:
+            pos = out_pos[key[0]]
+            if pos < len(listed) and listed[pos] == key:
+                out_pos[key[0]] = pos + 1
+        listed = ins.get(key[1])
+        if listed is not None:
+            pos = in_pos[key[1]]
+            if pos < len(listed) and listed[pos] == key:
+                in_pos[key[1]] = pos + 1
+
+    path: list[_EdgeKey] = []
+    seen: set[_EdgeKey] = set()
+    filled = [0] * len(chains)
+    for c in chain_of:
+        i = filled[c]
+        filled[c] = i + 1
+        path.clear()
+        seen.clear()
+        while chain_pos[c] <= i:
+            head = chains[c][chain_pos[c]]
+            key = keys[head]
+            if not path and blocker(key) is key:
+                place(head)
+                continue
+            found = None
+            if path:
+                resume = path.pop()
+                seen.discard(resume)
+                found = resolve(resume, path, seen)
+            if found is None:
+                path.clear()
+                seen.clear()
+                found = resolve(key, path, seen)
+            # None: the edge lists contradict the blocks; keep block order
+            place(head if found is None else found)
+    progress = True
+    while progress:
+        progress = False
+        for node_id, listed in outs.items():
+            while out_pos[node_id] < len(listed):
+                found = resolve(listed[out_pos[node_id]], [], set())
+                if found is None:
+                    break
+                place(found)
+                progress = True
+    for queue in hidden.values():
+        ordered.extend(reversed(queue))
+    return ordered
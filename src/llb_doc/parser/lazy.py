@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..core.block import Block, LazyFields, _set
+from .parser import _scan_meta
+
+if TYPE_CHECKING:
+    from ..core.document import Document
+
+
+class LazyBlock(LazyFields, Block):
+    """Block whose meta and content are parsed from the source on first use.
+
+    Created by ``parse_llb(text, lazy=True)``. ``id``, ``type`` and ``lang``
+    are read from the header; the first access to the meta or content
+    parses ``source[start:stop]``, after which the block behaves as a
+    plain Block and no longer references the source text.
+    """
+
+    __slots__ = ("_source", "_start", "_stop")
+
+    def __init__(
+        self,
+        id: str,
+        type: str,
+        lang: str | None,
+        source: str,
+        start: int,
+        stop: int,
+        _doc: Document | None = None,
+    ) -> None:
+        _set(self, "_source", None)
+        super().__init__(id=id, type=type, lang=lang, _doc=_doc)
+        _set(self, "_source", source)
+        _set(self, "_start", start)
+        _set(self, "_stop", stop)
+
+    def _read(self) -> tuple[str, dict[str, str]]:
+        source = self._source
+        # stop is the offset of the "@end <id>" line; its newline ends the body
+        stop = self._stop
+        meta: dict[str, str] = {}
+        i = _scan_meta(source, self._start, stop - 1, meta, f"@end {self.id}")
+        return source[i : stop - 1].rstrip("\n") if stop > i else "", meta
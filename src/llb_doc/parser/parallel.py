@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal, Optional, Tuple, Union
+
+from ..core.block import Block
+from ..core.bulk import gc_paused
+from .parser import (
+    TRIPLE_QUOTE,
+    _body_bounds,
+    _is_end_line,
+    _line_before,
+    _parse_fast,
+    _parse_lines,
+    _read_blocks,
+    _scan_blocks,
+    parse_llb,
+)
+
+if TYPE_CHECKING:
+    from ..core.document import Document
+    from ..core.vocab import Vocabulary
+
+PathOrText = Union[str, "os.PathLike[str]"]
+
+# (id, type, lang, meta, content) of a block parsed in a worker
+_Row = Tuple[str, str, Optional[str], Optional[dict], str]
+
+# Bodies are split into chunks of at least this many characters; smaller
+# inputs are parsed in-process since starting workers costs more
+MIN_CHUNK = 1 << 20
+
+
+def _read_file(path: PathOrText) -> str:
+    """Read a file as UTF-8 with line endings kept, as iter_parse does."""
+    with open(path, "rb") as fp:
+        return fp.read().decode("utf-8")
+
+
+def _read_text(text_or_path: PathOrText) -> str:
+    """Return the text of a path, or ``text_or_path`` itself if it is text.
+
+    A ``str`` is taken as a path only when it has no newline and names an
+    existing file.
+    """
+    if isinstance(text_or_path, os.PathLike) or (
+        "\n" not in text_or_path and os.path.isfile(text_or_path)
+    ):
+        return _read_file(text_or_path)
+    return text_or_path
+
+
+def _split_body(text: str, start: int, end: int, parts: int) -> list[int]:
+    """Return chunk offsets from ``start`` to ``end``, cutting before headers.
+
+    A cut is placed at the first ``@block`` line after each even share of
+    the body whose previous non-blank line ends a block. The cut may still
+    fall inside content that contains such lines; workers detect that and
+    the merge re-parses from there.
+    """
+    bounds = [start]
+    size = (end - start) // parts
+    for k in range(1, parts):
+        at = max(start + k * size, bounds[-1])
+        while True:
+            at = text.find("\n@block ", at, end)
+            if at == -1:
+                break
+            at += 1
+            if _is_end_line(_line_before(text, at)):
+                break
+        if at == -1:
+            break
+        bounds.append(at)
+    bounds.append(end)
+    return bounds
+
+
+def _block_rows(doc: Document) -> list[_Row] | None:
+    """Rows of a worker-parsed document, or None if its cut may be unsafe.
+
+    A meta value left starting with triple quotes had no closing line in
+    the chunk; in the whole text the search for one would run on.
+    """
+    rows: list[_Row] = []
+    for block in doc._id_index.values():
+        meta = block._meta
+        if meta:
+            if any(value.startswith(TRIPLE_QUOTE) for value in meta.values()):
+                return None
+            meta = dict(meta)
+        rows.append((block.id, block.type, block.lang, meta, block.content))
+    return rows
+
+
+def _parse_chunk(text: str) -> list[_Row] | None:
+    """Parse a body chunk in a worker; None if it must be parsed in order."""
+    from ..core.document import Document
+
+    doc = Document(vocab=False)
+    with gc_paused():
+        if not _scan_blocks(text, 0, len(text), doc):
+            return None
+        return _block_rows(doc)
+
+
+def _add_rows(doc: Document, rows: list[_Row]) -> None:
+    index = doc._id_index
+    order = doc._block_order
+    for block_id, block_type, lang, meta, content in rows:
+        order.append(block_id)
+        index[block_id] = Block(
+            id=block_id, type=block_type, lang=lang, meta=meta, content=content, _doc=doc
+        )
+
+
+def parse_llb_parallel(
+    text_or_path: PathOrText,
+    *,
+    workers: int | None = None,
+    vocab: Vocabulary | Literal[False] | None = None,
+) -> Document:
+    """Parse a large LLB text or file with a pool of worker processes.
+
+    The body is cut into up to ``workers`` chunks (default: the CPU count)
+    at block boundaries, the chunks are parsed in parallel and the blocks
+    are added to one Document in order. The result, including errors and
+    their line numbers, is the same as ``parse_llb``: a chunk that fails
+    to parse, possibly because a cut fell inside a block, is re-parsed in
+    order from its start. Inputs under ``MIN_CHUNK`` characters per worker
+    are parsed in-process.
+    """
+    from ..core.document import Document
+
+    text = _read_text(text_or_path)
+    doc = Document(vocab=vocab)
+    start, end = _body_bounds(text, doc)
+    parts = min(workers or os.cpu_count() or 1, (end - start) // MIN_CHUNK)
+    if parts < 2:
+        return parse_llb(text, vocab=vocab)
+
+    bounds = _split_body(text, start, end, parts)
+    with ProcessPoolExecutor(len(bounds) - 1) as pool:
+        results = pool.map(_parse_chunk, (text[a:b] for a, b in zip(bounds, bounds[1:])))
+        with gc_paused():
+            for at, rows in zip(bounds, results):
+                if rows is None:
+                    # Parse the rest in order; errors get their own line numbers
+                    lines = text[at:end].split("\n")
+                    _read_blocks(lines, 0, len(lines), doc, text.count("\n", 0, at))
+                    break
+                _add_rows(doc, rows)
+    return doc
+
+
+def _parse_file(path: PathOrText) -> tuple[str, str, list[_Row]]:
+    """Parse one file in a worker into (prefix, suffix, rows)."""
+    from ..core.document import Document
+
+    text = _read_file(path)
+    doc = Document(vocab=False)
+    with gc_paused():
+        if not _parse_fast(text, doc):
+            doc = Document(vocab=False)
+            _parse_lines(text, doc)
+        rows = [
+            (b.id, b.type, b.lang, dict(b._meta) if b._meta else None, b.content)
+            for b in map(doc._id_index.__getitem__, doc._block_order)
+        ]
+    return doc._prefix, doc._suffix, rows
+
+
+def parse_many(
+    paths: Iterable[PathOrText],
+    *,
+    workers: int | None = None,
+    vocab: Vocabulary | Literal[False] | None = None,
+) -> Iterator[Document]:
+    """Parse many LLB files in a pool of worker processes.
+
+    Yields one Document per path, in the order given, as results become
+    available. ``vocab`` works as in ``parse_llb``: each document gets a
+    fresh Vocabulary by default, and passing one instance shares it across
+    all documents. A ParseError is raised for the first failing file after
+    the documents before it have been yielded.
+    """
+    from ..core.document import Document
+
+    paths = list(paths)
+    with ProcessPoolExecutor(workers) as pool:
+        for prefix, suffix, rows in pool.map(_parse_file, paths, chunksize=4):
+            doc = Document(vocab=vocab)
+            with gc_paused():
+                _add_rows(doc, rows)
+            doc._prefix = prefix
+            doc._suffix = suffix
+            yield doc
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Iterator, Literal
 
 if TYPE_CHECKING:
     from ..core.document import Document
+    from ..core.vocab import Vocabulary
 
 from ..core.block import Block
 
-BLOCK_START_RE = re.compile(r"^@block\s+(\S+)\s+(\S+)(?:\s+(\S+))?$")
+BLOCK_START_RE = re.compile(r"^@block\s+(\S+)\s+(\S+)(?:\s+(\S+))?(?:\s+(@end))?$")
 BLOCK_END_RE = re.compile(r"^@end\s+(\S+)$")
 META_RE = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*)=(.*)$")
 SEPARATOR = "---"
+END_MARKER = "@end"
+TRIPLE_QUOTE = '"""'
 
 
 class ParseError(ValueError):
@@ -24,19 +27,325 @@ class ParseError(ValueError):
         self.line_number = line_number
 
 
-def parse_llb(text: str) -> Document:
-    """Parse LLB format text into a Document object."""
+def parse_llb(
+    text: str,
+    *,
+    vocab: Vocabulary | Literal[False] | None = None,
+    lazy: bool = False,
+) -> Document:
+    """Parse LLB format text into a Document object.
+
+    Block types, langs and meta keys are interned into ``vocab`` (a fresh
+    Vocabulary by default; ``False`` disables interning).
+
+    With ``lazy=True`` only block headers are kept after the scan: each
+    block is a LazyBlock holding offsets into ``text`` and parses its meta
+    and content on first access, so reading a few blocks of a large text
+    costs memory for the index only. Text that is not well-formed, or that
+    repeats block IDs, is parsed eagerly.
+    """
     from ..core.document import Document
 
-    doc = Document()
+    doc = Document(vocab=vocab)
+    if _parse_fast(text, doc, lazy):
+        return doc
+    # The line-based parser handles the rest and reports errors
+    doc = Document(vocab=vocab)
+    _parse_lines(text, doc)
+    return doc
+
+
+def _parse_lines(text: str, doc: Document) -> None:
+    """Parse ``text`` into ``doc`` line by line."""
     lines = text.split("\n")
+    body_start, body_end = _split_sections(
+        doc, lines, BLOCK_START_RE.match, _is_block_end
+    )
+    _read_blocks(lines, body_start, body_end, doc)
+
+
+def _read_blocks(
+    lines: list[str], i: int, body_end: int, doc: Document, line_base: int = 0
+) -> None:
+    """Parse the body lines ``lines[i:body_end]`` into ``doc``.
+
+    ``line_base`` is added to reported line numbers when ``lines`` start
+    further into the text.
+    """
+    while i < body_end:
+        line = lines[i]
+
+        # Skip empty lines between blocks
+        if not line.strip():
+            i += 1
+            continue
+
+        header = _match_header(line)
+        if header is None:
+            raise ParseError(
+                f"Expected @block, got: {line!r}", line_number=line_base + i + 1
+            )
+
+        block_id, block_type, lang, one_line = header
+        meta: dict[str, str] = {}
+        content_lines: list[str] = []
+        i += 1
+        if one_line:
+            doc._block_order.append(block_id)
+            doc._id_index[block_id] = Block(
+                id=block_id, type=block_type, lang=lang, _doc=doc
+            )
+            continue
+
+        # Parse metadata lines
+        end_pattern = f"@end {block_id}"
+        i = _read_meta(lines, i, body_end, meta, end_pattern)
+
+        # Skip empty line after metadata
+        if i < body_end and lines[i] == "":
+            i += 1
+
+        # Parse content until @end
+        found_end = False
+        while i < body_end:
+            if lines[i] == end_pattern:
+                found_end = True
+                break
+            content_lines.append(lines[i])
+            i += 1
+
+        if not found_end:
+            raise ParseError(f"Missing @end for block '{block_id}'")
+
+        block = Block(
+            id=block_id,
+            type=block_type,
+            lang=lang,
+            meta=meta,
+            content="\n".join(content_lines).rstrip("\n"),
+            _doc=doc,
+        )
+        doc._block_order.append(block_id)
+        doc._id_index[block_id] = block
+        i += 1
+
+
+def _parse_fast(text: str, doc: Document, lazy: bool = False) -> bool:
+    """Parse well-formed ``text`` into ``doc`` using offsets into the buffer.
+
+    Block ends are located with ``str.find`` and content is sliced from
+    ``text`` directly, so content lines are never split or re-joined; only
+    headers and meta lines are examined one by one. Gives the same result
+    as _parse_lines. Returns False, possibly leaving ``doc`` partly filled,
+    when the input needs the line-based parser: on errors and on duplicate
+    block IDs.
+    """
+    i, end = _body_bounds(text, doc)
+    return _scan_blocks(text, i, end, doc, lazy)
+
+
+def _scan_blocks(
+    text: str, i: int, end: int, doc: Document, lazy: bool = False
+) -> bool:
+    """Fast-path parse of the body ``text[i:end]``; see _parse_fast.
+
+    With ``lazy``, blocks are LazyBlocks holding offsets into ``text``.
+    """
+    if lazy:
+        from .lazy import LazyBlock
+    find = text.find
+    index = doc._id_index
+    order = doc._block_order
+
+    # Body lines start at i and after each "\n" up to ``end``; the last one
+    # ends at ``end``, so a line may start at ``end`` itself
+    while i <= end:
+        nl = find("\n", i, end)
+        line_end = end if nl == -1 else nl
+        line = text[i:line_end]
+        # Skip empty lines between blocks
+        if not line.strip():
+            i = line_end + 1
+            continue
+
+        header = _match_header(line)
+        if header is None:
+            return False
+        block_id, block_type, lang, one_line = header
+        if block_id in index:
+            return False
+        i = line_end + 1
+        if one_line:
+            order.append(block_id)
+            index[block_id] = Block(id=block_id, type=block_type, lang=lang, _doc=doc)
+            continue
+
+        start = i
+        meta: dict[str, str] = {}
+        end_pattern = f"@end {block_id}"
+        i = _scan_meta(text, i, end, meta, end_pattern)
+
+        # Content runs up to the first "@end <id>" line
+        size = len(end_pattern)
+        at = find(end_pattern, i, end)
+        while at != -1 and not (
+            (at == i or text[at - 1] == "\n")
+            and (at + size == end or text[at + size] == "\n")
+        ):
+            at = find(end_pattern, at + 1, end)
+        if at == -1:
+            return False
+
+        if lazy:
+            # Meta and content are read again from text[start:at] on access
+            block = LazyBlock(block_id, block_type, lang, text, start, at, doc)
+        else:
+            block = Block(
+                id=block_id,
+                type=block_type,
+                lang=lang,
+                meta=meta,
+                content=text[i : at - 1].rstrip("\n") if at > i else "",
+                _doc=doc,
+            )
+        order.append(block_id)
+        index[block_id] = block
+        i = at + size + 1
+    return True
 
+
+def _scan_meta(
+    text: str, i: int, end: int, meta: dict[str, str], end_pattern: str
+) -> int:
+    """Read meta lines from offset ``i`` into ``meta``; return the content offset.
+
+    Offset version of _read_meta. The empty line after the metadata is
+    skipped too.
+    """
+    count, _ = _take_meta(_text_lines(text, i, end), end_pattern, meta)
+    find = text.find
+    for _ in range(count):
+        nl = find("\n", i, end)
+        i = end + 1 if nl == -1 else nl + 1
+
+    # Skip empty line after metadata
+    if i <= end and (i == end or text[i] == "\n"):
+        i += 1
+    return i
+
+
+def _text_lines(text: str, i: int, end: int) -> Iterator[str]:
+    """Yield the lines of ``text[i:end]``, the last one ending at ``end``."""
+    find = text.find
+    while i <= end:
+        nl = find("\n", i, end)
+        line_end = end if nl == -1 else nl
+        yield text[i:line_end]
+        i = line_end + 1
+
+
+def _body_bounds(text: str, doc: Document) -> tuple[int, int]:
+    """Offset version of _split_sections: set prefix/suffix, return body range.
+
+    The body is ``text[start:end]``.
+    """
+    n = len(text)
+    separators: list[int] = []
+    at = text.find(SEPARATOR)
+    while at != -1:
+        if (at == 0 or text[at - 1] == "\n") and (at + 3 == n or text[at + 3] == "\n"):
+            separators.append(at)
+        at = text.find(SEPARATOR, at + 3)
+    if not separators:
+        return 0, n
+
+    start_sep = next(
+        (at for at in reversed(separators) if _is_start_line(_line_after(text, at))),
+        None,
+    )
+    end_sep = next(
+        (at for at in separators if _is_end_line(_line_before(text, at))), None
+    )
+    start, end = 0, n
+    if start_sep is not None:
+        if start_sep > 0:
+            doc._prefix = text[: start_sep - 1].rstrip("\n")
+        start = start_sep + 4
+    if end_sep is not None:
+        end = end_sep - 1
+        if end_sep + 3 < n:
+            doc._suffix = text[end_sep + 4 :].lstrip("\n")
+    return start, end
+
+
+def _line_after(text: str, at: int) -> str | None:
+    """First non-blank line after the separator line at offset ``at``."""
+    i = at + 4
+    while i <= len(text):
+        nl = text.find("\n", i)
+        line = text[i:] if nl == -1 else text[i:nl]
+        if line.strip():
+            return line
+        if nl == -1:
+            return None
+        i = nl + 1
+    return None
+
+
+def _line_before(text: str, at: int) -> str | None:
+    """Last non-blank line before the separator line at offset ``at``."""
+    end = at - 1
+    while end >= 0:
+        start = text.rfind("\n", 0, end) + 1
+        line = text[start:end]
+        if line.strip():
+            return line
+        end = start - 1
+    return None
+
+
+def _is_start_line(line: str | None) -> bool:
+    return line is not None and BLOCK_START_RE.match(line) is not None
+
+
+def _is_end_line(line: str | None) -> bool:
+    return line is not None and _is_block_end(line)
+
+
+def _match_header(line: str) -> tuple[str, str, str | None, bool] | None:
+    """Return (id, type, lang, one_line) for an @block header line."""
+    match = BLOCK_START_RE.match(line)
+    if match is None:
+        return None
+    block_id, block_type, lang, end = match.groups()
+    if end is None and lang == END_MARKER:
+        # "@block id type @end": the optional lang group took the marker
+        lang, end = None, lang
+    return block_id, block_type, lang, end is not None
+
+
+def _is_block_end(line: str) -> bool:
+    """Match ``@end <id>`` lines and one-line ``@block ... @end`` blocks."""
+    return BLOCK_END_RE.match(line) is not None or (
+        line.startswith("@block ") and line.endswith(" @end")
+    )
+
+
+def _split_sections(
+    doc: Document,
+    lines: list[str],
+    is_start: Callable[[str], object],
+    is_end: Callable[[str], object],
+) -> tuple[int, int]:
+    """Store prefix/suffix on ``doc`` and return the body's line range.
+
+    The body starts after the last separator followed by a block header
+    (``is_start``) and ends at the first separator preceded by an end
+    marker (``is_end``).
+    """
     # Find separator positions
     separator_indices = [i for i, line in enumerate(lines) if line == SEPARATOR]
 
-    # Determine prefix/body/suffix boundaries based on content detection
-    # Find the last separator followed by @block (body start)
-    # Find the first separator preceded by @end (body end)
     def find_first_nonblank_after(idx: int) -> str | None:
         """Find first non-blank line after given index."""
         for i in range(idx + 1, len(lines)):
@@ -58,19 +367,19 @@ def parse_llb(text: str) -> Document:
         body_end = len(lines)
         suffix_start = len(lines)
     else:
-        # Find last separator followed by @block (body start boundary)
+        # Find last separator followed by a header (body start boundary)
         body_start_sep = None
         for sep_idx in reversed(separator_indices):
             next_line = find_first_nonblank_after(sep_idx)
-            if next_line and BLOCK_START_RE.match(next_line):
+            if next_line and is_start(next_line):
                 body_start_sep = sep_idx
                 break
 
-        # Find first separator preceded by @end (body end boundary)
+        # Find first separator preceded by an end marker (body end boundary)
         body_end_sep = None
         for sep_idx in separator_indices:
             prev_line = find_last_nonblank_before(sep_idx)
-            if prev_line and BLOCK_END_RE.match(prev_line):
+            if prev_line and is_end(prev_line):
                 body_end_sep = sep_idx
                 break
 
@@ -110,62 +419,57 @@ def parse_llb(text: str) -> Document:
         suffix_text = "\n".join(lines[suffix_start:])
         doc._suffix = suffix_text.lstrip("\n")
 
-    # Parse blocks in body section
-    i = body_start
-    while i < body_end:
-        line = lines[i]
+    return body_start, body_end
 
-        # Skip empty lines between blocks
-        if not line.strip():
-            i += 1
-            continue
 
-        match = BLOCK_START_RE.match(line)
-        if not match:
-            raise ParseError(f"Expected @block, got: {line!r}", line_number=i + 1)
+def _read_meta(
+    lines: list[str], i: int, end: int, meta: dict[str, str], end_pattern: str
+) -> int:
+    """Read ``key=value`` lines from ``i`` into ``meta``; return the next index."""
+    count, _ = _take_meta(map(lines.__getitem__, range(i, end)), end_pattern, meta)
+    return i + count
 
-        block_id, block_type, lang = match.groups()
-        meta: dict[str, str] = {}
-        content_lines: list[str] = []
-        i += 1
 
-        # Parse metadata lines
-        while i < body_end and lines[i].strip():
-            meta_match = META_RE.match(lines[i])
-            if meta_match:
-                key, value = meta_match.groups()
-                meta[key] = value
-                i += 1
-            else:
-                break
-
-        # Skip empty line after metadata
-        if i < body_end and lines[i] == "":
-            i += 1
-
-        # Parse content until @end
-        end_pattern = f"@end {block_id}"
-        found_end = False
-        while i < body_end:
-            if lines[i] == end_pattern:
-                found_end = True
-                break
-            content_lines.append(lines[i])
-            i += 1
+def _take_meta(
+    lines: Iterator[str], end_pattern: str, meta: dict[str, str]
+) -> tuple[int, list[str]]:
+    """Read ``key=value`` lines from ``lines`` into ``meta``.
 
-        if not found_end:
-            raise ParseError(f"Missing @end for block '{block_id}'")
-
-        block = Block(
-            id=block_id,
-            type=block_type,
-            lang=lang,
-            meta=meta,
-            content="\n".join(content_lines).rstrip("\n"),
-            _doc=doc,
-        )
-        doc._block_order.append(block_id)
-        doc._id_index[block_id] = block
-        i += 1
-
-    return doc
+    Shared by every parser. Values rendered in triple quotes may span
+    lines; an opening quote without a closing line before the block's
+    ``end_pattern`` line is kept as a literal value, and the lines after
+    it are read as usual. Returns the number of meta lines and the lines
+    read past them, which belong to the block body.
+    """
+    ahead: list[str] = []  # lines read but not used, last one first
+    count = 0
+    while True:
+        line = ahead.pop() if ahead else next(lines, None)
+        if line is None:
+            return count, []
+        key, sep, value = line.partition("=")
+        if not sep or not key.isidentifier() or not key.isascii():
+            ahead.append(line)
+            return count, ahead[::-1]
+        count += 1
+        if value.startswith(TRIPLE_QUOTE):
+            if len(value) >= 6 and value.endswith(TRIPLE_QUOTE):
+                value = value[3:-3]
+            else:
+                inner: list[str] = []
+                nxt = ahead.pop() if ahead else next(lines, None)
+                while (
+                    nxt is not None
+                    and nxt != end_pattern
+                    and not nxt.endswith(TRIPLE_QUOTE)
+                ):
+                    inner.append(nxt)
+                    nxt = ahead.pop() if ahead else next(lines, None)
+                if nxt is not None and nxt != end_pattern:
+                    value = "\n".join([value[3:], *inner, nxt[:-3]])
+                    count += len(inner) + 1
+                else:
+                    if nxt is not None:
+                        inner.append(nxt)
+                    ahead.extend(reversed(inner))
+        meta[key] = value
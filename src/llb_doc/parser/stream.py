@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, Literal, Union
+
+from ..core.block import Block, MetaDict, _set
+from ..core.vocab import Vocabulary
+from .parser import (
+    END_MARKER,
+    SEPARATOR,
+    ParseError,
+    _match_header,
+    _take_meta,
+)
+
+if TYPE_CHECKING:
+    from ..core.document import Document
+
+# A path, a text or binary file object, or an iterable of lines
+Source = Union[str, "os.PathLike[str]", IO, Iterable[str]]
+
+
+def _read_lines(source: Source) -> Iterator[str]:
+    """Yield the lines of ``source`` without their trailing newline.
+
+    Lines are split on ``\\n`` only, as ``parse_llb`` does; a trailing
+    newline yields a final empty line, like ``text.split("\\n")``.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fp:
+            yield from _read_lines(fp)
+        return
+    line = ""
+    for raw in source:
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        yield line[:-1] if line.endswith("\n") else line
+    if line.endswith("\n"):
+        yield ""
+
+
+class _Lines:
+    """Line reader with pushback and 1-based line numbers."""
+
+    __slots__ = ("_it", "_back", "number")
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._it = lines
+        self._back: deque[str] = deque()
+        self.number = 0
+
+    def next(self) -> str | None:
+        if self._back:
+            line = self._back.popleft()
+        else:
+            line = next(self._it, None)
+            if line is None:
+                return None
+        self.number += 1
+        return line
+
+    def push(self, lines: list[str]) -> None:
+        """Return ``lines`` to the front of the stream."""
+        self._back.extendleft(reversed(lines))
+        self.number -= len(lines)
+
+
+class BlockStream:
+    """Blocks parsed one at a time from an LLB source.
+
+    Only the block being parsed is held in memory, plus the prefix and
+    suffix text. ``prefix`` is known once the first block has been read
+    and ``suffix`` once the stream is exhausted. Yielded blocks belong to
+    no document; to_document() collects the remaining ones into one.
+    """
+
+    def __init__(
+        self, source: Source, *, vocab: Vocabulary | Literal[False] | None = None
+    ) -> None:
+        self.vocab: Vocabulary | None = (
+            Vocabulary() if vocab is None else vocab or None
+        )
+        self.prefix = ""
+        self.suffix = ""
+        self._blocks = self._parse(_Lines(_read_lines(source)))
+
+    def __iter__(self) -> BlockStream:
+        return self
+
+    def __next__(self) -> Block:
+        return next(self._blocks)
+
+    def close(self) -> None:
+        """Stop parsing and close a file opened from a path."""
+        self._blocks.close()
+
+    def to_document(self) -> Document:
+        """Build a Document from the blocks not yet read, block by block.
+
+        Repeated block IDs are kept as parse_llb keeps them: each occurrence
+        takes a place in the order and the last block wins.
+        """
+        from ..core.document import Document
+
+        doc = Document(vocab=self.vocab if self.vocab is not None else False)
+        for block in self:
+            block._doc = doc
+            doc._block_order.append(block.id)
+            doc._id_index[block.id] = block
+        doc._prefix = self.prefix
+        doc._suffix = self.suffix
+        doc._touch()
+        return doc
+
+    # ==================== Parsing ====================
+
+    def _parse(self, lines: _Lines) -> Iterator[Block]:
+        line = self._read_prefix(lines)
+        while line is not None:
+            if line == SEPARATOR:
+                self._read_suffix(lines)
+                return
+            if line.strip():
+                yield self._read_block(lines, line)
+            line = lines.next()
+
+    def _read_prefix(self, lines: _Lines) -> str | None:
+        """Consume the prefix; return the first header line of the body.
+
+        A body that starts with a header needs no lookahead. Otherwise the
+        body starts after the first separator followed by a header, so
+        only blank lines after a separator are held back.
+        """
+        held: list[str] = []
+        first_line = 0
+        while True:
+            line = lines.next()
+            if line is None:
+                break
+            if not first_line and _match_header(line):
+                return line
+            if line.strip() and not first_line:
+                first_line = lines.number
+            held.append(line)
+            if line != SEPARATOR:
+                continue
+            blanks: list[str] = []
+            line = lines.next()
+            while line is not None and not line.strip():
+                blanks.append(line)
+                line = lines.next()
+            if line is not None and _match_header(line):
+                self.prefix = "\n".join(held[:-1]).rstrip("\n")
+                return line
+            held.extend(blanks)
+            if line is None:
+                break
+            lines.push([line])
+        first = next((line for line in held if line.strip()), None)
+        if first is None:
+            return None
+        raise ParseError(f"Expected @block, got: {first!r}", line_number=first_line)
+
+    def _read_suffix(self, lines: _Lines) -> None:
+        rest: list[str] = []
+        line = lines.next()
+        while line is not None:
+            rest.append(line)
+            line = lines.next()
+        self.suffix = "\n".join(rest).lstrip("\n")
+
+    def _read_block(self, lines: _Lines, line: str) -> Block:
+        header_line = lines.number
+        header = _match_header(line)
+        if header is None:
+            raise ParseError(f"Expected @block, got: {line!r}", line_number=header_line)
+        block_id, block_type, lang, one_line = header
+        vocab = self.vocab
+        if vocab is not None:
+            block_type = vocab.intern(block_type)
+            if lang:
+                lang = vocab.intern(lang)
+        if one_line:
+            return Block(id=block_id, type=block_type, lang=lang)
+
+        end_pattern = f"{END_MARKER} {block_id}"
+        meta = self._read_meta(lines, end_pattern)
+
+        content: list[str] = []
+        line = lines.next()
+        # Skip empty line after metadata
+        if line == "":
+            line = lines.next()
+        while line != end_pattern:
+            if line is None:
+                raise ParseError(f"Missing @end for block '{block_id}'")
+            content.append(line)
+            line = lines.next()
+        block = Block(
+            id=block_id,
+            type=block_type,
+            lang=lang,
+            content="\n".join(content).rstrip("\n"),
+        )
+        if meta:
+            # Keys are interned while copied into the block's own dict
+            _set(block, "_meta", MetaDict._owned(meta, block, vocab))
+        return block
+
+    def _read_meta(self, lines: _Lines, end_pattern: str) -> dict[str, str]:
+        """Read meta lines with _take_meta and push back the lines read past them."""
+        meta: dict[str, str] = {}
+        _, rest = _take_meta(iter(lines.next, None), end_pattern, meta)
+        lines.push(rest)
+        return meta
+
+
+def iter_parse(
+    source: Source, *, vocab: Vocabulary | Literal[False] | None = None
+) -> BlockStream:
+    """Parse LLB text from a path, file object or iterable of lines lazily.
+
+    Returns a BlockStream yielding one Block at a time, so memory stays
+    bounded by the largest block instead of the whole input. Call
+    ``to_document()`` on it to build a Document without holding the text;
+    it gives the same Document as ``parse_llb`` on the full text, and parse
+    errors carry the same messages and line numbers.
+    """
+    return BlockStream(source, vocab=vocab)
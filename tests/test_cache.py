@@ -242,3 +242,45 @@ class TestCacheWithGraphDocument:
         g.render(meta_refresh=MetaRefreshMode.NONE)
         assert call_count == 0
         assert "skip" not in g.get_node("t1").meta
+
+
+class TestRenderCacheNodeInsert:
+    """Test that adding a node drops cached renders of its edges' ends."""
+
+    def test_add_node_at_dangling_endpoint(self):
+        from llb_doc import create_graph
+        from llb_doc.core.document import MetaRefreshMode
+
+        def build(cached):
+            g = create_graph()
+            g.add_node("concept", "A", id_="A")
+            g.add_edge("A", "Z", "refs")
+            if cached:
+                g.enable_render_cache()
+            g.render(focus="A", meta_refresh=MetaRefreshMode.NONE)
+            return g
+
+        for add in (
+            lambda g: g.add_node("concept", "Z", id_="Z"),
+            lambda g: g.node("concept").id("Z").content("Z").add(),
+            lambda g: g.add_nodes_from([("Z", "concept", "Z")]),
+        ):
+            cached, plain = build(True), build(False)
+            add(cached)
+            add(plain)
+            text = cached.render(focus="A", meta_refresh=MetaRefreshMode.NONE)
+            assert "@node Z concept" in text
+            assert text == plain.render(focus="A", meta_refresh=MetaRefreshMode.NONE)
+
+    def test_builder_context_at_dangling_endpoint(self):
+        from llb_doc import create_graph
+        from llb_doc.core.document import MetaRefreshMode
+
+        g = create_graph()
+        g.add_node("concept", "A", id_="A")
+        g.add_edge("Z", "A", "refs")
+        g.enable_render_cache()
+        assert "@node Z" not in g.render(focus="A", meta_refresh=MetaRefreshMode.NONE)
+        with g.node("concept").id("Z") as node:
+            node.content = "Z"
+        assert "@node Z concept" in g.render(focus="A", meta_refresh=MetaRefreshMode.NONE)
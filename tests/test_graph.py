@@ -1,9 +1,32 @@
 """Tests for GraphDocument and graph rendering."""
 
+import asyncio
+import gc
+import io
+import os
+import pickle
+import random
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from llb_doc import NodeNotFoundError, create_graph
-from llb_doc.core import Ctx, Edge, Node
+from llb_doc import (
+    FrozenGraph,
+    MetaRefreshMode,
+    NodeNotFoundError,
+    ParseError,
+    SnapshotError,
+    Vocabulary,
+    create_graph,
+    load_snapshot,
+    parse_graph,
+    shared_prefix,
+)
+from llb_doc.core import Ctx, DuplicateIDError, Edge, Node
+from llb_doc.core.bulk import gc_paused
 
 
 class TestGraphDocumentBasic:
@@ -128,6 +151,733 @@ class TestGraphDocumentEdges:
         assert len(g.edges) == 0
 
 
+class TestBulkIngestion:
+    """Test add_nodes_from/add_edges_from against the per-call path."""
+
+    def _per_call(self):
+        g = create_graph()
+        g.add_node("person", "Alice", id_="a", role="admin")
+        g.add_node("person", "Bob", id_="b")
+        g.add_node("team", "", id_="t", lang="en")
+        g.add_edge("a", "b", "knows", since="2020")
+        g.add_edge("b", "t", "member")
+        g.add_edge("a", "t", "owns", render_edge=False)
+        return g
+
+    @pytest.mark.parametrize("form", ["tuples", "dicts", "columns"])
+    def test_matches_per_call(self, form):
+        g = create_graph()
+        if form == "tuples":
+            g.add_nodes_from(
+                [("a", "person", "Alice", {"role": "admin"}), ("b", "person", "Bob")]
+            )
+            g.add_nodes_from([{"id": "t", "type": "team", "lang": "en"}])
+            g.add_edges_from([("a", "b", "knows", {"since": "2020"}), ("b", "t", "member")])
+            g.add_edges_from([{"from_id": "a", "to_id": "t", "rel": "owns", "render_edge": False}])
+        elif form == "dicts":
+            g.add_nodes_from(
+                [
+                    {"id": "a", "type": "person", "content": "Alice", "role": "admin"},
+                    {"id": "b", "type": "person", "content": "Bob"},
+                    {"id": "t", "type": "team", "lang": "en"},
+                ]
+            )
+            g.add_edges_from(
+                [
+                    {"from_id": "a", "to_id": "b", "rel": "knows", "meta": {"since": "2020"}},
+                    {"from_id": "b", "to_id": "t", "rel": "member"},
+                    {"from_id": "a", "to_id": "t", "rel": "owns", "render_edge": False},
+                ]
+            )
+        else:
+            g.add_nodes_from(
+                {
+                    "id": ["a", "b", "t"],
+                    "type": ["person", "person", "team"],
+                    "content": ["Alice", "Bob", ""],
+                    "lang": [None, None, "en"],
+                    "meta": [{"role": "admin"}, {}, None],
+                }
+            )
+            g.add_edges_from(
+                {
+                    "from_id": ["a", "b", "a"],
+                    "to_id": ["b", "t", "t"],
+                    "rel": ["knows", "member", "owns"],
+                    "render_edge": [True, True, False],
+                    "meta": [{"since": "2020"}, None, None],
+                }
+            )
+        expected = self._per_call()
+        assert g.render() == expected.render()
+        assert g.render(focus="b") == expected.render(focus="b")
+        assert [e.id for e in g.get_edges_from("a")] == ["E1", "E3"]
+        assert g.get_edges_to("t")[0].from_id == "b"
+
+    def test_extra_columns_become_meta(self):
+        g = create_graph()
+        g.add_nodes_from({"id": ["x", "y"], "type": ["t", "t"], "score": ["1", "2"]})
+        assert g.get_node("y").meta == {"score": "2"}
+
+    def test_generated_ids_skip_taken(self):
+        g = create_graph()
+        g.add_node("t", id_="N1")
+        nodes = g.add_nodes_from([(None, "t"), ("N2", "t"), (None, "t")])
+        assert [n.id for n in nodes] == ["N3", "N2", "N4"]
+        assert g.add_node("t").id == "N5"
+
+    def test_duplicate_in_batch_adds_nothing(self):
+        g = create_graph()
+        with pytest.raises(DuplicateIDError, match="'a'"):
+            g.add_nodes_from([("a", "t"), ("b", "t"), ("a", "t")])
+        assert len(g.nodes) == 0
+
+    def test_duplicate_with_existing(self):
+        g = create_graph()
+        g.add_node("t", id_="a")
+        g.add_edge("a", "a", "self", id_="E9")
+        with pytest.raises(DuplicateIDError):
+            g.add_nodes_from([("b", "t"), ("a", "t")])
+        with pytest.raises(DuplicateIDError):
+            g.add_edges_from([{"id": "E9", "from_id": "a", "to_id": "a", "rel": "x"}])
+        assert len(g.nodes) == 1 and len(g.edges) == 1
+
+    def test_invalid_rows(self):
+        g = create_graph()
+        with pytest.raises(ValueError):
+            g.add_edges_from([("a", "b")])
+        with pytest.raises(ValueError):
+            g.add_nodes_from([{"id": "a"}])
+        with pytest.raises(ValueError):
+            g.add_nodes_from({"id": ["a", "b"], "type": ["t"]})
+        with pytest.raises(TypeError):
+            g.add_nodes_from(["a"])
+
+    def test_bulk_nodes_track_changes(self):
+        g = create_graph()
+        (node,) = g.add_nodes_from([("a", "t", "text")])
+        before = node.render()
+        version = g.version
+        node.meta["k"] = "v"
+        assert node.render() != before
+        assert g.version > version
+        node.tier = 2
+        assert node.tier == 2
+
+    def test_remove_bulk_edge(self):
+        g = create_graph()
+        g.add_nodes_from([("a", "t"), ("b", "t")])
+        (edge,) = g.add_edges_from([("a", "b", "r")])
+        g.remove_node("a")
+        assert g.get_edge(edge.id) is None
+        assert g.get_edges_to("b") == []
+
+    def test_invalidates_render_cache(self):
+        g = create_graph()
+        g.add_nodes_from([("a", "t"), ("b", "t")])
+        g.enable_render_cache()
+        before = g.render(focus="a")
+        g.add_edges_from([("a", "b", "r")])
+        assert g.render(focus="a") != before
+
+    def test_frozen_graph_is_read_only(self):
+        g = create_graph().freeze()
+        with pytest.raises(TypeError):
+            g.add_nodes_from([("a", "t")])
+        with pytest.raises(TypeError):
+            g.add_edges_from([("a", "b", "r")])
+
+    def test_overlapping_gc_pauses(self):
+        first, second = gc_paused(), gc_paused()
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        assert not gc.isenabled()
+        second.__exit__(None, None, None)
+        assert gc.isenabled()
+
+        gc.disable()
+        try:
+            with gc_paused():
+                pass
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+
+class TestGraphVocabulary:
+    def test_rels_and_endpoints_share_strings(self):
+        g = create_graph()
+        g.add_nodes_from([("a", "doc"), ("b", "doc")])
+        g.add_edge("".join(["a"]), "".join(["b"]), "".join(["ci", "tes"]))
+        (e2,) = g.add_edges_from([("".join(["b"]), "".join(["a"]), "".join(["ci", "tes"]))])
+        e1 = g.get_edge("E1")
+        assert e1.rel is e2.rel
+        assert e1.from_id is g.get_node("a").id is e2.to_id
+        assert g.get_node("a").type is g.get_node("b").type
+
+    def test_freeze_shares_vocabulary(self):
+        g = create_graph()
+        g.add_node("doc", id_="a")
+        assert g.freeze().vocab is g.vocab
+        assert create_graph(vocab=False).freeze().vocab is None
+
+
+class TestAdjacencyIndex:
+    """Test adjacency maps stay in sync with mutations."""
+
+    def test_edge_builder_indexed(self):
+        g = create_graph()
+        g.add_node("person", id_="N1")
+        g.add_node("person", id_="N2")
+        g.edge("N1", "N2", "knows").id("E1").add()
+        assert [e.id for e in g.get_edges_from("N1")] == ["E1"]
+        assert [e.id for e in g.get_edges_to("N2")] == ["E1"]
+
+    def test_remove_edge_updates_adjacency(self):
+        g = create_graph()
+        g.add_node("person", id_="N1")
+        g.add_node("person", id_="N2")
+        g.add_edge("N1", "N2", "knows", id_="E1")
+        g.remove_edge("E1")
+        assert g.get_edges_from("N1") == []
+        assert g._compute_tiers("N1", radius=1) == {"N1": 0}
+
+    def test_remove_node_updates_adjacency(self):
+        g = create_graph()
+        for nid in ("N1", "N2", "N3"):
+            g.add_node("person", id_=nid)
+        g.add_edge("N1", "N2", "knows", id_="E1")
+        g.add_edge("N2", "N3", "knows", id_="E2")
+        g.add_edge("N1", "N3", "knows", id_="E3")
+        g.remove_node("N2")
+        assert [e.id for e in g.edges] == ["E3"]
+        assert [e.id for e in g.get_edges_from("N1")] == ["E3"]
+        assert g.get_edges_to("N2") == []
+
+    def test_duplicate_edge_id(self):
+        from llb_doc import DuplicateIDError
+
+        g = create_graph()
+        g.add_edge("N1", "N2", "knows", id_="E1")
+        with pytest.raises(DuplicateIDError):
+            g.add_edge("N1", "N2", "likes", id_="E1")
+
+    def test_rendered_edges_keep_insertion_order(self):
+        g = create_graph()
+        for nid in ("a", "b", "c"):
+            g.add_node("person", id_=nid)
+        g.add_edge("c", "a", "r", id_="E1")
+        g.add_edge("a", "b", "r", id_="E2")
+        g.add_edge("b", "c", "r", id_="E3")
+        edges = g._select_edges({"a", "b", "c"})
+        assert [e.id for e in edges] == ["E1", "E2", "E3"]
+
+
+class TestEdgeLookup:
+    """Test the (from_id, to_id) index behind has_edge and on_duplicate."""
+
+    def _graph(self):
+        g = create_graph()
+        for nid in ("a", "b", "c"):
+            g.add_node("person", id_=nid)
+        g.add_edge("a", "b", "knows", id_="E1")
+        g.add_edge("a", "b", "likes", id_="E2")
+        g.add_edge("b", "a", "knows", id_="E3")
+        return g
+
+    def test_has_edge_and_between(self):
+        g = self._graph()
+        assert g.has_edge("a", "b") and g.has_edge("a", "b", "likes")
+        assert not g.has_edge("a", "b", "hates") and not g.has_edge("a", "c")
+        assert [e.id for e in g.get_edges_between("a", "b")] == ["E1", "E2"]
+        assert [e.id for e in g.get_edges_between("a", "b", "knows")] == ["E1"]
+        assert [e.id for e in g.get_edges_between("b", "a")] == ["E3"]
+
+    def test_index_follows_mutations(self):
+        g = self._graph()
+        g.remove_edge("E1")
+        assert [e.id for e in g.get_edges_between("a", "b")] == ["E2"]
+        g.get_edge("E2").to_id = "c"
+        assert not g.has_edge("a", "b") and g.has_edge("a", "c", "likes")
+        g.get_edge("E3").rel = "met"
+        assert g.has_edge("b", "a", "met") and not g.has_edge("b", "a", "knows")
+        g.remove_node("c")
+        assert not g.has_edge("a", "c")
+
+    def test_endpoint_change_keeps_insertion_order(self):
+        g = self._graph()
+        g.add_edge("c", "b", "knows", id_="E4")
+        g.add_edge("c", "a", "knows", id_="E5")
+        g.get_edge("E1").from_id = "c"
+        assert [e.id for e in g.get_edges_from("c")] == ["E1", "E4", "E5"]
+        assert [e.id for e in g.get_edges_between("c", "b")] == ["E1", "E4"]
+        g.get_edge("E3").to_id = "c"
+        g.get_edge("E2").to_id = "c"
+        assert [e.id for e in g.get_edges_to("c")] == ["E2", "E3"]
+        text = g.render(focus="c", radius=1)
+        assert "in_edges=['a:likes', 'b:knows']" in text
+        assert "out_edges=['b:knows', 'b:knows', 'a:knows']" in text
+        with g.overlay() as ov:
+            ov.add_edge("c", "b", "likes", id_="E6")
+            ov.add_edge("c", "a", "likes", id_="E7")
+            ov.get_edge("E6").to_id = "a"
+            assert [e.id for e in ov.get_edges_to("a")] == ["E5", "E6", "E7"]
+
+    def test_on_duplicate_modes(self):
+        from llb_doc import DuplicateEdgeError
+
+        g = self._graph()
+        assert g.add_edge("a", "b", "knows", on_duplicate="skip").id == "E1"
+        with pytest.raises(DuplicateEdgeError):
+            g.add_edge("a", "b", "knows", on_duplicate="error")
+        g.add_edge("a", "b", "knows", on_duplicate="allow", id_="E4")
+        new = g.add_edge("a", "b", "knows", on_duplicate="replace", weight="2")
+        assert new.id == "E1" and new.weight == "2"
+        assert [e.id for e in g.edges] == ["E1", "E2", "E3"]
+        assert g.get_edges_between("a", "b", "knows") == [new]
+        assert g.edge("b", "a", "knows").add(on_duplicate="skip").id == "E3"
+        with pytest.raises(ValueError):
+            g.add_edge("a", "c", "knows", on_duplicate="merge")
+
+    def test_replace_invalidates_render_cache(self):
+        g = self._graph()
+        g.enable_render_cache()
+        before = g.render(focus="a", radius=1)
+        g.add_edge("a", "b", "knows", on_duplicate="replace", note="x")
+        assert g.render(focus="a", radius=1) != before
+        assert "note=x" in g.render(focus="a", radius=1)
+
+    def test_bulk_on_duplicate(self):
+        from llb_doc import DuplicateEdgeError
+
+        g = self._graph()
+        rows = [("a", "b", "knows"), ("a", "c", "knows"), ("a", "c", "knows")]
+        skipped = g.add_edges_from(rows, on_duplicate="skip")
+        assert [e.id for e in skipped] == ["E1", "E4", "E4"]
+        with pytest.raises(DuplicateEdgeError):
+            g.add_edges_from([("c", "a", "r"), ("b", "a", "knows")], on_duplicate="error")
+        assert not g.has_edge("c", "a")
+        replaced = g.add_edges_from(
+            [("a", "b", "knows", {"v": "1"}), ("c", "b", "r"), ("c", "b", "r", {"v": "2"})],
+            on_duplicate="replace",
+        )
+        assert [e.id for e in replaced] == ["E1", "E5", "E5"]
+        assert g.get_edge("E5").v == "2" and g.get_edge("E1").v == "1"
+        assert len(g.edges) == 5
+
+    def test_frozen_lookup(self):
+        frozen = self._graph().freeze()
+        assert frozen.has_edge("a", "b", "likes") and not frozen.has_edge("a", "c")
+        assert not frozen.has_edge("a", "b", "hates")
+        assert [e.id for e in frozen.get_edges_between("a", "b")] == ["E1", "E2"]
+
+
+class TestParseGraph:
+    def _graph(self):
+        g = create_graph()
+        g.add_node("person", "Alice is\na dev", id_="a", name="Alice", bio="l1\nl2")
+        g.add_node("company", id_="b")
+        g.add_node("city", "Paris", lang="fr", id_="c")
+        g.add_edge("a", "b", "works_at", since="2020")
+        g.add_edge("b", "c", "located_in")
+        g.add_edge("a", "c", "lives_in", content="since 2019", lang="md")
+        g.add_edge("c", "a", "hidden", render_edge=False)
+        g.prefix = "# Head"
+        g.suffix = "# Tail"
+        return g
+
+    def test_focused_roundtrip(self):
+        g = self._graph()
+        g.render(focus="c", radius=1)
+        for kwargs in ({"focus": "a", "radius": 2}, {"focus": "b", "radius": 1, "order": "tier_asc"}):
+            text = g.render(**kwargs)
+            parsed = parse_graph(text)
+            again = dict(kwargs, focus=parsed.ctx.focus, radius=parsed.ctx.radius)
+            assert parsed.render(**again) == text
+
+    def test_rebuilds_graph(self):
+        parsed = parse_graph(self._graph().render(focus="a", radius=2))
+        a = parsed.get_node("a")
+        assert a.tier == 0 and a.bio == "l1\nl2" and a.content == "Alice is\na dev"
+        assert parsed.get_node("c").lang == "fr"
+        assert parsed.prefix == "# Head" and parsed.suffix == "# Tail"
+        e2, e3 = parsed.get_edge("E2"), parsed.get_edge("E3")
+        assert (e2.from_id, e2.to_id, e2.rel, e2.content) == ("b", "c", "located_in", "")
+        assert (e3.lang, e3.content) == ("md", "since 2019")
+        (hidden,) = parsed.get_edges_between("c", "a")
+        assert hidden.rel == "hidden" and not hidden.render_edge
+        ctx = parsed.ctx
+        assert (ctx.focus, ctx.radius, ctx.strategy) == ("a", 2, "bfs")
+        assert ctx.tiers == "0: a\n1: b, c"
+
+    def test_unfocused_and_free(self):
+        g = self._graph()
+        text = g.render()
+        parsed = parse_graph(text)
+        assert parsed.ctx is None and parsed.render() == text
+        free = g.render_free(["a", "E1", ("b", True)])
+        parsed = parse_graph(free)
+        assert [n.id for n in parsed.nodes] == ["a", "b"]
+        assert parsed.get_node("b").content == ""
+
+    def test_hidden_edges_keep_their_place(self):
+        g = create_graph()
+        for nid in "abc":
+            g.add_node("t", id_=nid)
+        g.add_edge("a", "b", "r", render_edge=False)
+        g.add_edge("a", "c", "r")
+        g.add_edge("c", "b", "r")
+        g.add_edge("a", "b", "s", render_edge=False)
+        g.add_edge("a", "b", "r")
+        g.add_edge("b", "a", "r", render_edge=False)
+        g.add_edge("b", "c", "r")
+        text = g.render()
+        parsed = parse_graph(text)
+        assert parsed.render() == text
+
+        def edges(graph, method, nid):
+            return [
+                (e.from_id, e.to_id, e.rel, e.render_edge)
+                for e in getattr(graph, method)(nid)
+            ]
+
+        for nid in "abc":
+            for method in ("get_edges_from", "get_edges_to"):
+                assert edges(parsed, method, nid) == edges(g, method, nid)
+
+    def test_dangling_edges_with_hidden_edges(self):
+        g = create_graph()
+        g.add_node("t", id_="a")
+        g.add_node("t", id_="b")
+        g.add_edge("b", "zz", "x")
+        g.add_edge("b", "a", "y")
+        g.add_edge("b", "b", "y")
+        g.add_edge("b", "a", "y", render_edge=False)
+        text = g.render()
+        assert "@edge E1 b -> zz x" in text
+        assert "out_edges=['a:y', 'b:y', 'a:y']" in text
+        assert parse_graph(text).render() == text
+
+    def test_random_roundtrips_with_hidden_edges(self):
+        rng = random.Random(3)
+        for _ in range(100):
+            g = create_graph()
+            n = rng.randint(2, 8)
+            for i in range(n):
+                g.add_node("t", id_=f"n{i}")
+            # Some endpoints name no node
+            for _ in range(rng.randint(1, 20)):
+                g.add_edge(
+                    f"n{rng.randrange(n + 2)}",
+                    f"n{rng.randrange(n + 2)}",
+                    rng.choice("ab"),
+                    render_edge=rng.random() < 0.6,
+                )
+            for order in ("focus_last", "tier_asc"):
+                kwargs = {"focus": "n0", "radius": rng.randint(1, 2), "order": order}
+                text = g.render(**kwargs)
+                assert parse_graph(text).render(**kwargs) == text
+            text = g.render()
+            assert parse_graph(text).render() == text
+
+    def test_budget_ctx(self):
+        g = create_graph()
+        for i in range(6):
+            g.add_node("n", "x" * 50, id_=f"n{i}")
+            if i:
+                g.add_edge("n0", f"n{i}", "r")
+        parsed = parse_graph(g.render(focus="n0", radius=1, budget=200))
+        assert parsed.ctx.budget == 200 and parsed.ctx.cut is not None
+
+    def test_errors(self):
+        with pytest.raises(ParseError, match="Expected @node"):
+            parse_graph("@block b1 note @end")
+        with pytest.raises(ParseError, match="Missing @end") as exc:
+            parse_graph("@node a t\n\ntext\n@node b t @end")
+        assert exc.value.line_number == 1
+        with pytest.raises(ParseError, match="already exists"):
+            parse_graph("@node a t @end\n\n@node a t @end")
+
+
+class TestSnapshot:
+    def _graph(self):
+        g = create_graph("g1", vocab=Vocabulary(value_keys=["status"]))
+        g.add_node("person", "Alice is\na dev", id_="a", status="open", bio="l1\nl2")
+        g.add_node("company", id_="b")
+        g.add_node("city", "Paris", lang="fr", id_="c")
+        g.add_edge("a", "b", "works_at", since="2020")
+        g.add_edge("b", "c", "located_in")
+        g.add_edge("a", "c", "lives_in", content="since 2019", lang="md")
+        g.add_edge("c", "a", "hidden", render_edge=False)
+        g.add_edge("b", "gone", "points_to")
+        g.prefix = "# Head"
+        g.suffix = "# Tail"
+        return g
+
+    def test_roundtrip_renders(self, tmp_path):
+        g = self._graph()
+        path = tmp_path / "g.snap"
+        assert g.save_snapshot(path) == path.stat().st_size
+        for mmap in (True, False):
+            frozen = g.freeze()
+            loaded = load_snapshot(path, mmap=mmap)
+            assert isinstance(loaded, FrozenGraph) and loaded.graph_id == "g1"
+            for kwargs in ({"focus": "a", "radius": 2}, {"focus": ["b", "c"], "radius": 1}, {}):
+                assert loaded.render(**kwargs) == frozen.render(**kwargs)
+
+    def test_lazy_nodes_and_edges(self, tmp_path):
+        path = tmp_path / "g.snap"
+        self._graph().save_snapshot(path)
+        loaded = load_snapshot(path)
+        a = loaded.get_node("a")
+        assert a._source is not None and a.type == "person"
+        assert a.bio == "l1\nl2" and a._source is None
+        assert a.content == "Alice is\na dev"
+        assert a.status is loaded.vocab.intern("open")
+        (edge,) = loaded.get_edges_between("a", "c")
+        assert (edge.content, edge.lang, edge.rel) == ("since 2019", "md", "lives_in")
+        assert loaded.get_edge("E1").since == "2020"
+        assert loaded.has_edge("c", "a", "hidden") and loaded.has_edge("b", "gone")
+        assert not loaded.get_edge("E4").render_edge
+
+    def test_resave_and_pickle(self, tmp_path):
+        first, second = tmp_path / "1.snap", tmp_path / "2.snap"
+        self._graph().save_snapshot(first)
+        load_snapshot(first).save_snapshot(second)
+        assert first.read_bytes() == second.read_bytes()
+        loaded = load_snapshot(first)
+        restored = pickle.loads(pickle.dumps(loaded))
+        assert restored.render(focus="a", radius=2) == loaded.render(focus="a", radius=2)
+
+    def test_ctx_and_id_generators(self, tmp_path):
+        g = self._graph()
+        parsed = parse_graph(g.render(focus="a", radius=1))
+        path = tmp_path / "g.snap"
+        parsed.save_snapshot(path)
+        loaded = load_snapshot(path)
+        assert loaded.ctx.focus == "a" and loaded.ctx.radius == 1
+        assert loaded.render(focus="a", radius=1) == parsed.render(focus="a", radius=1)
+
+    def test_bad_files(self, tmp_path):
+        path = tmp_path / "bad.snap"
+        for data in (b"", b"not a snapshot at all"):
+            path.write_bytes(data)
+            with pytest.raises(SnapshotError):
+                load_snapshot(path)
+
+
+class TestFreeze:
+    """Test FrozenGraph snapshots."""
+
+    def _graph(self):
+        g = create_graph()
+        for nid in ("a", "b", "c", "d"):
+            g.add_node("person", nid.upper(), id_=nid)
+        g.add_edge("a", "b", "knows")
+        g.add_edge("b", "c", "likes", since="2020")
+        g.add_edge("c", "a", "knows")
+        g.add_edge("c", "d", "hidden", render_edge=False)
+        g.add_edge("d", "ghost", "refs")
+        return g
+
+    def test_tiers_match(self):
+        g = self._graph()
+        f = g.freeze()
+        for focus in ("a", "b", "c", "d"):
+            for radius in (0, 1, 2, 3):
+                assert f._compute_tiers(focus, radius) == g._compute_tiers(focus, radius)
+
+    def test_render_matches(self):
+        g = self._graph()
+        f = g.freeze()
+        for kwargs in ({"focus": "a", "radius": 1}, {"focus": "c", "radius": 2}, {}):
+            expected = sorted(g.render(**kwargs).split("\n\n"))
+            assert sorted(f.render(**kwargs).split("\n\n")) == expected
+
+    def test_edge_lookups(self):
+        f = self._graph().freeze()
+        assert [e.rel for e in f.get_edges_from("c")] == ["knows", "hidden"]
+        assert [e.from_id for e in f.get_edges_to("a")] == ["c"]
+        assert f.get_edge("E2").meta == {"since": "2020"}
+        assert f.get_edge("E99") is None
+        assert len(f.edges) == 5
+
+    def test_snapshot_is_independent(self):
+        g = self._graph()
+        f = g.freeze()
+        g.add_node("person", id_="e")
+        g.add_edge("a", "e", "knows")
+        g.get_node("a").content = "changed"
+        assert not f.has_node("e")
+        assert f.get_node("a").content == "A"
+        assert f._compute_tiers("a", 1) == {"a": 0, "b": 1, "c": 1}
+
+    def test_mutation_raises(self):
+        f = self._graph().freeze()
+        with pytest.raises(TypeError):
+            f.add_node("person")
+        with pytest.raises(TypeError):
+            f.add_edge("a", "b", "knows")
+        with pytest.raises(TypeError):
+            f.remove_node("a")
+        with pytest.raises(TypeError):
+            f.prefix = "x"
+
+    def test_blocks_are_read_only(self):
+        f = self._graph().freeze()
+        before = f.render()
+        plain = f.get_edges_between("a", "b")[0]
+        extra = f.get_edges_between("b", "c")[0]
+        assert extra.since == "2020"
+        for block in (f.get_node("a"), plain, extra):
+            with pytest.raises(TypeError):
+                block.content = "edited"
+            with pytest.raises(TypeError):
+                block.meta["k"] = "v"
+            with pytest.raises(TypeError):
+                block.note = "v"
+            with pytest.raises(TypeError):
+                del block.content
+        for edge in (plain, extra):
+            with pytest.raises(TypeError):
+                edge.rel = "other"
+            with pytest.raises(TypeError):
+                edge.to_id = "d"
+            with pytest.raises(TypeError):
+                edge.render_edge = False
+        with pytest.raises(TypeError):
+            extra.meta.pop("since")
+        assert f.render() == before
+        assert f.get_node("a").content == "A" and not f.get_node("a").meta
+
+
+class TestOverlay:
+    """Test copy-on-write overlays over a shared base graph."""
+
+    def _graph(self):
+        return TestFreeze()._graph()
+
+    @staticmethod
+    def _body(text):
+        return re.sub(r"C\d+", "C", text)
+
+    def _apply(self, g):
+        g.add_node("question", "Why?", id_="q")
+        g.add_edge("q", "a", "asks")
+        g.get_node("b").content = "edited"
+        g.get_edge("E2").meta["since"] = "2021"
+        g.remove_edge("E1")
+        g.remove_node("d")
+
+    @pytest.mark.parametrize("frozen", [False, True])
+    def test_matches_edited_copy(self, frozen):
+        base = self._graph().freeze() if frozen else self._graph()
+        expected = self._graph()
+        before = base.render(focus="a", radius=2)
+        ov = base.overlay()
+        self._apply(ov)
+        self._apply(expected)
+        for kwargs in ({"focus": "q", "radius": 2}, {"focus": "c", "radius": 1}, {}):
+            assert self._body(ov.render(**kwargs)) == self._body(expected.render(**kwargs))
+        items = ["q", "b", "E2", ("c", True)]
+        assert ov.render_free(items) == expected.render_free(items)
+        assert [n.id for n in ov.nodes] == ["a", "b", "c", "q"]
+        assert [e.id for e in ov.edges] == [e.id for e in expected.edges]
+        assert self._body(base.render(focus="a", radius=2)) == self._body(before)
+
+    def test_base_is_untouched(self):
+        g = self._graph()
+        ov = g.overlay()
+        self._apply(ov)
+        assert not g.has_node("q") and g.has_node("d")
+        assert g.get_node("b").content == "B"
+        assert g.get_edge("E2").meta == {"since": "2020"}
+        assert g.has_edge("a", "b", "knows")
+        assert [e.rel for e in g.get_edges_from("c")] == ["knows", "hidden"]
+
+    def test_accessed_blocks_belong_to_overlay(self):
+        g = self._graph()
+        ov = g.overlay()
+        node = ov.get_node("a")
+        assert node is not g.get_node("a") and node is ov.get_node("a")
+        edge = ov.get_edges_from("c")[0]
+        assert edge is not g.get_edge("E3") and edge is ov.get_edge("E3")
+        node.meta["k"] = "v"
+        assert g.get_node("a")._meta is None
+
+    def test_listed_blocks_are_copied_on_change(self):
+        g = self._graph()
+        ov = g.overlay()
+        nodes = {n.id: n for n in ov.nodes}
+        edges = {e.id: e for e in ov.edges}
+        assert not ov._node_index.local and not ov._edge_index.local
+        nodes["b"].content = "edited"
+        edges["E3"].to_id = "d"
+        edges["E2"].meta["since"] = "2021"
+        assert set(ov._node_index.local) == {"b"} and set(ov._edge_index.local) == {"E2", "E3"}
+        assert ov.get_node("b") is nodes["b"] and ov.get_edge("E3") is edges["E3"]
+        expected = self._graph()
+        expected.get_node("b").content = "edited"
+        expected.get_edge("E3").to_id = "d"
+        expected.get_edge("E2").meta["since"] = "2021"
+        for focus in "abcd":
+            assert self._body(ov.render(focus=focus, radius=2)) == self._body(expected.render(focus=focus, radius=2))
+        assert g.get_node("b").content == "B" and g.get_edge("E3").to_id == "a"
+        # A copy listed before the overlay took its own is left out
+        stale = ov.nodes[2]
+        ov.get_node("c").content = "mine"
+        stale.content = "stale"
+        assert ov.get_node("c").content == "mine"
+
+    def test_edited_edge_keeps_its_place(self):
+        ov = self._graph().overlay()
+        ov.add_edge("c", "b", "new")
+        ov.get_edge("E3").content = "x"
+        assert [e.id for e in ov.get_edges_from("c")] == ["E3", "E4", "E6"]
+        assert ov.get_node("c").id == "c"
+        assert "in_edges=['c:knows']" in ov.render(focus="a", radius=1)
+
+    def test_generated_ids_continue_from_base(self):
+        g = create_graph()
+        for _ in range(3):
+            g.add_node("person")
+        g.add_edge("N1", "N2", "knows")
+        for base in (g, g.freeze()):
+            ov = base.overlay()
+            assert ov.add_node("person").id == "N4"
+            assert ov.add_edge("N1", "N3", "knows").id == "E2"
+
+    def test_duplicate_checks_see_base(self):
+        ov = self._graph().overlay()
+        with pytest.raises(DuplicateIDError):
+            ov.add_node("person", id_="a")
+        assert ov.add_edge("a", "b", "knows", on_duplicate="skip").id == "E1"
+        ov.remove_node("a")
+        assert ov.add_node("person", id_="a").id == "a"
+        with pytest.raises(NodeNotFoundError):
+            ov.remove_node("zz")
+
+    def test_discard(self):
+        g = self._graph()
+        with g.overlay() as ov:
+            self._apply(ov)
+            q = ov.get_node("q")
+        assert q._doc is None
+        assert not ov.has_node("q") and ov.has_node("d")
+        assert ov.render(focus="a", radius=2) == g.render(focus="a", radius=2)
+
+    def test_nested_and_frozen(self):
+        ov = self._graph().overlay()
+        ov.add_node("question", id_="q")
+        ov.add_edge("q", "a", "asks")
+        inner = ov.overlay()
+        inner.remove_node("q")
+        assert ov.has_node("q") and not inner.has_node("q")
+        frozen = ov.freeze()
+        assert frozen.render(focus="q", radius=1) == ov.render(focus="q", radius=1)
+
+
 class TestTierComputation:
     """Test tier computation (BFS)."""
 
@@ -305,6 +1055,397 @@ class TestGraphRender:
         assert output.endswith("# End")
 
 
+class TestMultiFocus:
+    """Test rendering around several focus nodes at once."""
+
+    def _graph(self):
+        g = create_graph()
+        for nid in ("a", "b", "c", "d", "e"):
+            g.add_node("person", nid.upper(), id_=nid)
+        g.add_edge("a", "b", "knows")
+        g.add_edge("b", "c", "knows")
+        g.add_edge("c", "d", "knows")
+        g.add_edge("d", "e", "knows")
+        return g
+
+    def test_min_distance_tiers(self):
+        g = self._graph()
+        tiers = g._compute_tiers(["a", "e"], radius=2)
+        assert tiers == {"a": 0, "e": 0, "b": 1, "d": 1, "c": 2}
+        assert g.freeze()._compute_tiers(["a", "e"], radius=2) == tiers
+
+    def test_render_once_per_block(self):
+        g = self._graph()
+        output = g.render(focus=["a", "e", "a"], radius=1)
+        assert "focus=a,e" in output
+        assert output.count("@ctx ") == 1
+        for nid in ("a", "b", "d", "e"):
+            assert output.count(f"@node {nid} ") == 1
+        assert "@node c " not in output
+        assert output.count("@edge E1 ") == 1
+        assert output.count("@edge E4 ") == 1
+
+    def test_all_seeds_in_focus_position(self):
+        g = self._graph()
+        output = g.render(focus=["a", "e"], radius=1, order="focus_last")
+        assert output.index("@node a ") > output.index("@edge E4 ")
+        assert output.index("@node e ") > output.index("@edge E4 ")
+        output = g.render(focus=["a", "e"], radius=1, order="focus_first")
+        assert output.index("@node a ") < output.index("@node b ")
+        assert output.index("@node e ") < output.index("@node d ")
+
+    def test_unknown_or_empty_focus(self):
+        g = self._graph()
+        with pytest.raises(NodeNotFoundError):
+            g.render(focus=["a", "zz"])
+        with pytest.raises(ValueError):
+            g.render(focus=[])
+
+
+class TestRenderMany:
+    """Test batch rendering of many focus nodes."""
+
+    def _graph(self):
+        g = create_graph()
+        for i in range(8):
+            g.add_node("person", f"Person {i}", id_=f"n{i}", rank=str(i))
+        for i in range(8):
+            g.add_edge(f"n{i}", f"n{(i + 1) % 8}", "next", weight=str(i))
+            g.add_edge(f"n{i}", f"n{(i + 3) % 8}", "skip")
+        return g
+
+    def test_matches_render(self):
+        focuses = ["n0", "n3", ["n1", "n5"], "n3"]
+        reference = self._graph()
+        expected = [reference.render(focus=f, radius=2) for f in focuses]
+        results = list(self._graph().render_many(focuses, radius=2))
+        assert [f for f, _ in results] == focuses
+        assert [text for _, text in results] == expected
+
+    def test_process_pool_matches_sequential(self):
+        focuses = [f"n{i}" for i in range(8)]
+        sequential = list(self._graph().render_many(focuses, order="focus_first"))
+        parallel = list(
+            self._graph().render_many(
+                focuses, order="focus_first", workers=2, chunksize=3
+            )
+        )
+        assert parallel == sequential
+
+    def test_frozen_graph(self):
+        focuses = ["n0", "n4"]
+        expected = list(self._graph().render_many(focuses))
+        assert list(self._graph().freeze().render_many(focuses)) == expected
+
+
+class TestBudgetRender:
+    """Test size-budgeted graph rendering."""
+
+    def _graph(self):
+        g = create_graph()
+        g.add_node("hub", "Hub", id_="hub")
+        for i in range(20):
+            g.add_node("leaf", "x" * (i + 1), id_=f"l{i:02d}")
+            g.add_edge("hub", f"l{i:02d}", "has", weight=str(i))
+            g.add_node("far", "far away", id_=f"f{i:02d}")
+            g.add_edge(f"l{i:02d}", f"f{i:02d}", "next")
+        return g
+
+    def test_large_budget_matches_unbudgeted(self):
+        g = self._graph()
+        full = g.render(focus="hub", radius=2, ctx_meta={"k": "v"})
+        budgeted = g.render(focus="hub", radius=2, budget=10**6)
+        assert "cut=" not in budgeted
+        assert len(budgeted.split("\n\n")) == len(full.split("\n\n"))
+
+    def test_output_within_budget(self):
+        g = self._graph()
+        for budget in (300, 700, 1500, 3000, 5000):
+            output = g.render(focus="hub", radius=2, budget=budget)
+            assert len(output) <= budget
+            assert f"budget={budget}" in output
+            assert "cut=" in output
+
+    def test_cut_records_tier(self):
+        g = self._graph()
+        output = g.render(focus="hub", radius=2, budget=1500)
+        assert "cut=1:" in output
+        assert "@node f" not in output
+
+    def test_priority_within_tier(self):
+        g = self._graph()
+        output = g.render(
+            focus="hub",
+            radius=1,
+            budget=600,
+            priority=lambda n: -len(n.content),
+        )
+        assert "@node l19 " in output
+        assert "@node l00 " not in output
+
+    def test_custom_size_fn(self):
+        g = self._graph()
+        words = lambda text: len(text.split())
+        output = g.render(focus="hub", radius=2, budget=150, size_fn=words)
+        assert words(output) <= 150
+        assert "cut=" in output
+
+    def test_seeds_always_rendered(self):
+        g = self._graph()
+        output = g.render(focus="hub", radius=2, budget=1)
+        assert "@node hub " in output
+        assert "cut=1:0/20" in output
+
+
+class TestRenderCache:
+    """Test the opt-in versioned render cache."""
+
+    def _graph(self):
+        g = create_graph()
+        for nid in ("a", "b", "c", "x", "y"):
+            g.add_node("person", nid.upper(), id_=nid)
+        g.add_edge("a", "b", "knows")
+        g.add_edge("b", "c", "knows")
+        g.add_edge("x", "y", "knows")
+        return g
+
+    def test_version_bumps(self):
+        g = self._graph()
+        v = g.version
+        g.get_node("a").content = "changed"
+        assert g.version > v
+        v = g.version
+        g.get_node("a").meta["k"] = "v"
+        assert g.version > v
+        v = g.version
+        g.get_edge("E1").rel = "likes"
+        assert g.version > v
+        v = g.version
+        g.get_node("a").tier = 3
+        assert g.version == v
+
+    def test_hit_returns_same_text(self):
+        g = self._graph()
+        cache = g.enable_render_cache()
+        first = g.render(focus="a", radius=1)
+        second = g.render(focus="a", radius=1)
+        assert first == second
+        assert cache.hits == 1
+
+    def test_targeted_invalidation(self):
+        g = self._graph()
+        cache = g.enable_render_cache()
+        g.render(focus="a", radius=1)
+        g.render(focus="x", radius=1)
+        g.get_node("y").content = "new"
+        assert len(cache) == 1
+        assert "new" in g.render(focus="x", radius=1)
+        g.render(focus="a", radius=1)
+        assert cache.hits == 1
+
+    def test_topology_invalidation(self):
+        g = self._graph()
+        g.enable_render_cache()
+        assert "@node c " not in g.render(focus="a", radius=1)
+        g.add_edge("a", "c", "knows")
+        assert "@node c " in g.render(focus="a", radius=1)
+        g.remove_node("c")
+        assert "@node c " not in g.render(focus="a", radius=1)
+
+    def test_edge_endpoint_change_reindexes(self):
+        g = self._graph()
+        g.enable_render_cache()
+        g.render(focus="a", radius=1)
+        g.get_edge("E1").to_id = "x"
+        output = g.render(focus="a", radius=1)
+        assert "@node x " in output
+        assert "@node b " not in output
+        assert [e.id for e in g.get_edges_to("x")] == ["E1"]
+
+    def test_prefix_clears_cache(self):
+        g = self._graph()
+        g.enable_render_cache()
+        g.render(focus="a")
+        g.prefix = "# Header"
+        assert g.render(focus="a").startswith("# Header")
+
+    def test_lru_eviction(self):
+        g = self._graph()
+        cache = g.enable_render_cache(maxsize=2)
+        for focus in ("a", "b", "c"):
+            g.render(focus=focus)
+        assert len(cache) == 2
+        g.render(focus="a")
+        assert cache.hits == 0
+
+
+class TestThreadSafeRender:
+    """Test that graph renders keep their state off the shared nodes."""
+
+    def _graph(self):
+        g = create_graph()
+        for i in range(12):
+            g.add_node("person", f"Person {i}", id_=f"n{i}")
+        for i in range(12):
+            g.add_edge(f"n{i}", f"n{(i + 1) % 12}", "next")
+            g.add_edge(f"n{i}", f"n{(i + 5) % 12}", "skip")
+        return g
+
+    @staticmethod
+    def _strip_ctx_id(text):
+        return re.sub(r"(@ctx|@end) C[0-9A-F]+", r"\1 C", text)
+
+    def test_render_does_not_mutate_nodes(self):
+        g = self._graph()
+        g.render(focus="n0", radius=2)
+        g.render_free(["n1", "n2"])
+        g.render()
+        node = g.get_node("n1")
+        assert node.tier is None
+        assert node.in_edges == []
+        assert node.out_edges == []
+
+    def test_budget_render_does_not_mutate_nodes(self):
+        g = self._graph()
+        g.render(focus="n0", radius=2, budget=400)
+        assert all(n.tier is None and n.in_edges == [] for n in g.nodes)
+
+    def test_assigned_values_still_render_outside_graph_render(self):
+        node = self._graph().get_node("n3")
+        node.tier = 4
+        node.in_edges = ["n2:next"]
+        assert "tier=4\nin_edges=['n2:next']" in node.render()
+
+    @pytest.mark.parametrize("frozen", [False, True])
+    def test_threads_match_serial(self, frozen):
+        g = self._graph()
+        if frozen:
+            g = g.freeze()
+        focuses = [f"n{i}" for i in range(12)] * 4
+        expected = [
+            self._strip_ctx_id(g.render(focus=f, radius=2)) for f in focuses
+        ]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda f: g.render(focus=f, radius=2), focuses))
+        assert [self._strip_ctx_id(text) for text in results] == expected
+
+    def test_threads_get_distinct_ctx_ids(self):
+        g = self._graph()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            texts = list(pool.map(lambda f: g.render(focus=f), ["n0"] * 64))
+        ids = {re.match(r"@ctx (\S+)", text).group(1) for text in texts}
+        assert len(ids) == 64
+
+    def test_threads_share_render_cache(self):
+        g = self._graph()
+        cache = g.enable_render_cache()
+        focuses = [f"n{i % 3}" for i in range(48)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda f: g.render(focus=f), focuses))
+        assert results == [g.render(focus=f) for f in focuses]
+        assert cache.hits >= 48
+
+    def test_gathered_arender_matches_serial(self):
+        g = self._graph()
+        focuses = [f"n{i}" for i in range(12)]
+        expected = [self._strip_ctx_id(g.render(focus=f)) for f in focuses]
+
+        async def gather():
+            return await asyncio.gather(*(g.arender(focus=f) for f in focuses))
+
+        results = asyncio.run(gather())
+        assert [self._strip_ctx_id(text) for text in results] == expected
+
+
+class TestStreamingRender:
+    """Test iter_render/render_to against render() output."""
+
+    def _graph(self, prefix=True, suffix=""):
+        g = create_graph()
+        if not prefix:
+            g.prefix = ""
+        g.suffix = suffix
+        for i in range(6):
+            g.add_node("person", f"Person {i}", id_=f"n{i}", rank=str(i))
+        for i in range(6):
+            g.add_edge(f"n{i}", f"n{(i + 1) % 6}", "next")
+        g.add_edge("n0", "n3", "hidden", render_edge=False)
+        g.add_edge("n2", "ghost", "dangling")
+        return g
+
+    @staticmethod
+    def _strip_ctx_id(text):
+        return re.sub(r"(@ctx|@end) C[0-9A-F]+", r"\1 C", text)
+
+    @pytest.mark.parametrize("prefix", [True, False])
+    @pytest.mark.parametrize("suffix", ["", "Answer below."])
+    def test_all_nodes(self, prefix, suffix):
+        g = self._graph(prefix, suffix)
+        assert "".join(g.iter_render()) == g.render()
+        assert "".join(g.iter_render(order="tier_asc")) == g.render(order="tier_asc")
+
+    @pytest.mark.parametrize("frozen", [False, True])
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"focus": "n0"},
+            {"focus": ["n1", "n4"], "radius": 2, "order": "focus_first"},
+            {"focus": "n0", "radius": 3, "budget": 600},
+        ],
+    )
+    def test_focused(self, frozen, kwargs):
+        g = self._graph(suffix="Done.")
+        if frozen:
+            g = g.freeze()
+        streamed = "".join(g.iter_render(**kwargs))
+        assert self._strip_ctx_id(streamed) == self._strip_ctx_id(g.render(**kwargs))
+
+    def test_frozen_all_nodes(self):
+        g = self._graph()
+        assert "".join(g.freeze().iter_render()) == g.render()
+
+    def test_focused_with_render_cache(self):
+        g = self._graph()
+        g.enable_render_cache()
+        expected = g.render(focus="n2", radius=2)
+        assert "".join(g.iter_render(focus="n2", radius=2)) == expected
+
+    def test_empty_graph(self):
+        g = create_graph()
+        assert "".join(g.iter_render()) == g.render()
+
+    def test_render_free(self):
+        g = self._graph(suffix="Done.")
+        items = ["n0", ("n1", True), "E1", ("E2", True), "missing"]
+        ctx = {"content": "View", "meta": {"k": "v"}}
+        streamed = "".join(g.iter_render_free(items, ctx=ctx))
+        assert self._strip_ctx_id(streamed) == self._strip_ctx_id(
+            g.render_free(items, ctx=ctx)
+        )
+
+    def test_render_to_streams(self):
+        g = self._graph()
+        text = io.StringIO()
+        g.render_to(text, meta_refresh=MetaRefreshMode.NONE)
+        assert text.getvalue() == g.render()
+        binary = io.BytesIO()
+        written = g.render_free_to(binary, ["n0", "n1"])
+        assert binary.getvalue() == g.render_free(["n0", "n1"]).encode("utf-8")
+        assert written == len(binary.getvalue())
+
+    def test_render_to_file(self, tmp_path):
+        g = self._graph()
+        path = tmp_path / "graph.llb"
+        with open(path, "wb") as fp:
+            g.render_to(fp)
+        assert path.read_bytes() == g.render().encode("utf-8")
+
+    def test_streaming_does_not_leak_render_state(self):
+        g = self._graph()
+        for _ in g.iter_render(focus="n0"):
+            assert g.get_node("n0").tier is None
+
+
 class TestGraphRenderAsync:
     """Test async graph rendering."""
 
@@ -363,6 +1504,293 @@ class TestSorterStrategies:
         assert n3_idx < n2_idx < n1_idx
 
 
+class TestStableLayout:
+    """Test the deterministic, prefix-stable "stable" order."""
+
+    def _graph(self, node_order=("a", "b", "c", "d", "e"), edge_order=(0, 1, 2, 3)):
+        edges = [("a", "b", "knows"), ("a", "c", "knows"), ("c", "d", "likes"), ("b", "e", "likes")]
+        g = create_graph()
+        for nid in node_order:
+            g.add_node("person", nid.upper(), id_=nid)
+        for i in edge_order:
+            g.add_edge(*edges[i], id_=f"E{i}")
+        return g
+
+    @staticmethod
+    def _headers(text):
+        return [line.split()[1] for line in text.split("\n") if line.startswith("@") and not line.startswith("@end")]
+
+    def test_layout(self):
+        text = self._graph().render(focus="a", radius=2, order="stable")
+        assert self._headers(text) == ["a", "b", "c", "E0", "E1", "d", "e", "E2", "E3", "C1"]
+
+    def test_independent_of_insertion_order(self):
+        first = self._graph().render(focus="a", radius=2, order="stable")
+        other = self._graph(("e", "d", "c", "b", "a"), (0, 1, 2, 3)).render(
+            focus="a", radius=2, order="stable"
+        )
+        assert self._headers(other) == self._headers(first)
+
+    def test_independent_of_hash_seed(self):
+        script = (
+            "from llb_doc import create_graph\n"
+            "g = create_graph()\n"
+            "for i in range(40): g.add_node('t', id_=f'n{i}')\n"
+            "for i in range(1, 40): g.add_edge('n0', f'n{i}', 'r')\n"
+            "print(g.render(focus='n0', order='stable'))\n"
+            "print(g.render(focus='n0'))\n"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2", "3")
+        }
+        assert len(outputs) == 1
+
+    def test_ids_sort_by_age(self):
+        g = create_graph()
+        g.add_node("hub", id_="hub")
+        for _ in range(17):
+            g.add_edge("hub", g.add_node("leaf").id, "has")
+        ids = [h for h in self._headers(g.render(focus="hub", order="stable")) if h.startswith("N")]
+        assert ids == [f"N{n:X}" for n in range(1, 18)]
+
+    def test_shared_prefix_after_append(self):
+        g = self._graph()
+        before = {o: g.render(focus="a", radius=2, order=o) for o in ("stable", "focus_last")}
+        g.add_node("person", "F", id_="f")
+        g.add_edge("d", "f", "likes")
+        after = {o: g.render(focus="a", radius=2, order=o) for o in ("stable", "focus_last")}
+        stable = shared_prefix(before["stable"], after["stable"])
+        assert before["stable"][:stable] == after["stable"][:stable]
+        assert after["stable"].index("@node d") < stable
+        assert stable > shared_prefix(before["focus_last"], after["focus_last"])
+
+    def test_shared_prefix(self):
+        assert shared_prefix("", "abc") == 0
+        assert shared_prefix("abc", "abc") == 3
+        assert shared_prefix("abcdef", "abcxef") == 3
+        assert shared_prefix("one two three", "one two four", size_fn=lambda t: len(t.split())) == 2
+
+
+
+class TestRenderSession:
+    """Test delta renders of GraphDocument.session()."""
+
+    def _graph(self):
+        g = create_graph()
+        for nid in "abcde":
+            g.add_node("person", nid.upper(), id_=nid)
+        g.add_edge("a", "b", "knows", id_="ab")
+        g.add_edge("a", "c", "knows", id_="ac")
+        g.add_edge("c", "d", "likes", id_="cd")
+        g.add_edge("b", "e", "likes", id_="be")
+        return g
+
+    @staticmethod
+    def _blocks(text):
+        """Map (kind, id) to block text for every block in a render."""
+        blocks = {}
+        lines = iter(text.split("\n"))
+        for line in lines:
+            kind, _, rest = line.partition(" ")
+            if kind not in ("@node", "@edge", "@ctx"):
+                continue
+            id_ = rest.split()[0]
+            body = [line]
+            if not line.endswith(" @end"):
+                for line in lines:
+                    body.append(line)
+                    if line == f"@end {id_}":
+                        break
+            blocks[(kind, id_)] = "\n".join(body)
+        return blocks
+
+    @staticmethod
+    def _ctx(text):
+        return next(v for (kind, _), v in TestRenderSession._blocks(text).items() if kind == "@ctx")
+
+    def test_first_turn_matches_render(self):
+        g = self._graph()
+        g.prefix = "P"
+        g.suffix = "Q"
+        full = g.render(focus="a", radius=2)
+        delta = g.session().render(focus="a", radius=2)
+        assert re.sub(r"C\d+", "C", delta) == re.sub(r"C\d+", "C", full)
+
+    def test_unchanged_turn_emits_only_ctx(self):
+        g = self._graph()
+        g.prefix = "P"
+        g.suffix = "Q"
+        s = g.session()
+        s.render(focus="a", radius=2)
+        text = s.render(focus="a", radius=2)
+        assert [kind for kind, _ in self._blocks(text)] == ["@ctx"]
+        assert "P" not in text and "Q" not in text
+        assert "tiers=" in text and "removed=" not in text
+        g.suffix = "Next question"
+        assert s.render(focus="a", radius=2).endswith("---\n\nNext question")
+
+    def test_changed_and_new_blocks(self):
+        g = self._graph()
+        s = g.session()
+        s.render(focus="a", radius=2)
+        g.get_node("d").content = "updated"
+        g.get_edge("ab").meta["weight"] = "2"
+        assert set(self._blocks(s.render(focus="a", radius=2))) == {
+            ("@ctx", "C2"), ("@node", "d"), ("@edge", "ab")
+        }
+        g.add_node("person", "F", id_="f")
+        g.add_edge("c", "f", "knows", id_="cf")
+        # c's out_edges change; d, a, b are untouched
+        assert set(self._blocks(s.render(focus="a", radius=2))) == {
+            ("@ctx", "C3"), ("@node", "f"), ("@node", "c"), ("@edge", "cf")
+        }
+
+    def test_removed_ids(self):
+        g = self._graph()
+        s = g.session()
+        s.render(focus="a", radius=2)
+        g.remove_node("d")
+        ctx = self._ctx(s.render(focus="a", radius=2))
+        assert "removed=d, cd" in ctx
+        g.add_node("person", "D again", id_="d")
+        g.add_edge("c", "d", "likes", id_="cd")
+        blocks = self._blocks(s.render(focus="a", radius=2))
+        assert ("@node", "d") in blocks and ("@edge", "cd") in blocks
+
+    def test_removed_block_readded_between_turns(self):
+        g = self._graph()
+        s = g.session()
+        s.render(focus="a", radius=2)
+        g.remove_edge("cd")
+        g.add_edge("c", "d", "hates", id_="cd")
+        blocks = self._blocks(s.render(focus="a", radius=2))
+        assert "hates" in blocks[("@edge", "cd")]
+
+    def test_node_added_at_dangling_endpoint(self):
+        g = self._graph()
+        g.add_edge("e", "z", "likes", id_="ez")
+        g.enable_render_cache()
+        s = g.session()
+        s.render(focus="e", radius=1)
+        g.add_node("person", "Z", id_="z")
+        blocks = self._blocks(s.render(focus="e", radius=1))
+        assert ("@node", "z") in blocks
+        assert "tier=1" in blocks[("@node", "z")]
+
+    def test_moving_focus(self):
+        g = self._graph()
+        s = g.session()
+        s.render(focus="a", radius=1)
+        text = s.render(focus="c", radius=1)
+        assert "removed=b, ab" in self._ctx(text)
+        # a and c change tier and edge lists; d is new
+        assert set(self._blocks(text)) == {
+            ("@ctx", "C2"), ("@node", "a"), ("@node", "c"), ("@node", "d"), ("@edge", "cd")
+        }
+
+    def test_replayed_deltas_match_full_render(self):
+        rng = random.Random(7)
+        g = create_graph()
+        for i in range(30):
+            g.add_node("t", f"n{i}", id_=f"n{i}")
+        for i in range(60):
+            g.add_edge(f"n{rng.randrange(30)}", f"n{rng.randrange(30)}", "r")
+        s = g.session()
+        seen = {}
+        for _ in range(40):
+            op = rng.randrange(4)
+            nodes = [n.id for n in g.nodes]
+            if op == 0:
+                g.get_node(rng.choice(nodes)).content = f"v{rng.random()}"
+            elif op == 1:
+                g.add_edge(rng.choice(nodes), rng.choice(nodes), "r")
+            elif op == 2 and g.edges:
+                g.remove_edge(rng.choice(g.edges).id)
+            elif op == 3:
+                nid = f"x{rng.randrange(10)}"
+                if nid in g._node_index:
+                    g.remove_node(nid)
+                else:
+                    g.add_node("t", nid, id_=nid)
+                    g.add_edge(rng.choice(nodes), nid, "r")
+            focus = rng.choice([n.id for n in g.nodes])
+            delta = s.render(focus=focus, radius=2)
+            seen.update(self._blocks(delta))
+            for id_ in self._ctx(delta).partition("removed=")[2].split("\n")[0].split(", "):
+                seen.pop(("@node", id_), None)
+                seen.pop(("@edge", id_), None)
+            full = {k: v for k, v in self._blocks(g.render(focus=focus, radius=2)).items() if k[0] != "@ctx"}
+            assert {k: v for k, v in seen.items() if k[0] != "@ctx"} == full
+
+    def test_parse_graph_reads_removed(self):
+        g = self._graph()
+        s = g.session()
+        s.render(focus="a", radius=2)
+        g.remove_node("e")
+        parsed = parse_graph(s.render(focus="a", radius=2))
+        assert parsed.ctx.removed == "e, be"
+
+    def test_frozen_and_overlay(self):
+        g = self._graph()
+        s = g.freeze().session()
+        s.render(focus="a", radius=2)
+        assert len(self._blocks(s.render(focus="a", radius=2))) == 1
+        with g.overlay() as ov:
+            s = ov.session()
+            s.render(focus="a", radius=2)
+            ov.get_node("b").content = "local"
+            assert set(self._blocks(s.render(focus="a", radius=2))) == {("@ctx", "C2"), ("@node", "b")}
+            ov.discard()
+            blocks = self._blocks(s.render(focus="a", radius=2))
+            assert "B" in blocks[("@node", "b")] and len(blocks) == 10
+
+    def test_reset(self):
+        g = self._graph()
+        s = g.session()
+        first = s.render(focus="a", radius=2)
+        s.reset()
+        assert re.sub(r"C\d+", "C", s.render(focus="a", radius=2)) == re.sub(r"C\d+", "C", first)
+
+    def test_revision_log_is_pruned(self):
+        g = self._graph()
+        s = g.session()
+        idle = g.session()
+        s.render(focus="a", radius=2)
+        idle.render(focus="a", radius=2)
+        g.get_node("b").content = "changed"
+        for i in range(5000):
+            g.add_node("t", id_=f"x{i}")
+            g.remove_node(f"x{i}")
+            if i % 100 == 0:
+                s.render(focus="a", radius=2)
+        # The idle session keeps the log from its last turn on
+        assert len(g._revisions) > 5000
+        assert ("@node", "b") in self._blocks(idle.render(focus="a", radius=2))
+        for i in range(20000):
+            g.add_node("t", id_=f"y{i}")
+            g.remove_node(f"y{i}")
+            if i % 100 == 0:
+                s.render(focus="a", radius=2)
+                idle.render(focus="a", radius=2)
+        assert len(g._revisions) < 2048
+        g.get_node("c").content = "changed"
+        assert {k for k, _ in self._blocks(s.render(focus="a", radius=2))} == {"@ctx", "@node"}
+        restored = pickle.loads(pickle.dumps(g))
+        assert restored._revisions is None
+        del s, idle
+        for i in range(3000):
+            g.add_node("t", id_=f"z{i}")
+            g.remove_node(f"z{i}")
+        assert g._revisions is None
+
+
 class TestDuplicateID:
     """Test duplicate ID handling."""
 
@@ -407,6 +1835,70 @@ class TestNode:
         assert node.name == "Alice"
 
 
+class TestSlottedGraphBlocks:
+    """Test the slotted Node/Edge/Ctx object model."""
+
+    def test_no_instance_dict(self):
+        g = create_graph()
+        node = g.add_node("t", id_="a")
+        edge = g.add_edge("a", "a", "self")
+        ctx = Ctx(id="C1", focus="a")
+        for block in (node, edge, ctx):
+            assert not hasattr(block, "__dict__")
+
+    def test_lazy_edge_lists(self):
+        node = Node(id="a", type="t")
+        assert node._in_edges is None
+        node.in_edges.append("b:r")
+        assert node.in_edges == ["b:r"]
+
+    def test_pickled_graph_keeps_indexes(self):
+        g = create_graph()
+        g.add_node("t", "x", id_="a", k="v")
+        g.add_node("t", id_="b")
+        g.add_edge("a", "b", "r", w="1")
+        restored = pickle.loads(pickle.dumps(g))
+        assert restored.render(focus="a") == g.render(focus="a")
+        restored.get_edge("E1").to_id = "a"
+        assert restored.get_edges_to("b") == []
+        assert restored.get_node("a").k == "v"
+
+
+class TestNodeFragmentMemo:
+    """Node tails are memoized; tier and edge lists stay live."""
+
+    def test_tier_and_edge_updates_render(self) -> None:
+        node = Node(id="N1", type="person", content="Alice", role="dev")
+        node.tier = 0
+        first = node.render()
+        node.tier = 2
+        node.in_edges.append("N2:knows")
+        output = node.render()
+        assert output != first
+        assert "tier=2" in output
+        assert "in_edges=['N2:knows']" in output
+        assert node.render_tail() is node.render_tail()
+
+    def test_edge_rel_change_invalidates(self) -> None:
+        edge = Edge(id="E1", from_id="N1", to_id="N2", rel="knows")
+        assert edge.render() == "@edge E1 N1 -> N2 knows @end"
+        edge.rel = "likes"
+        edge.to_id = "N3"
+        assert edge.render() == "@edge E1 N1 -> N3 likes @end"
+
+    def test_generator_meta_invalidates(self) -> None:
+        from llb_doc import meta_generator
+
+        @meta_generator("size")
+        def size(block):
+            return str(len(block.content))
+
+        g = create_graph(generators=[size])
+        g.add_node("person", "Alice", id_="N1")
+        g.render(meta_refresh=MetaRefreshMode.NONE)
+        assert "size=5" in g.render()
+
+
 class TestEdge:
     """Test Edge block rendering and properties."""
 
@@ -1,9 +1,32 @@
 """Tests for llb_doc library."""
 
+import asyncio
+import copy
+import io
+import pickle
+
 import pytest
 
-from llb_doc import Block, Document, ParseError, create_llb, parse_llb
+from llb_doc import (
+    ApproxTokenizer,
+    Block,
+    Document,
+    ParseError,
+    Vocabulary,
+    create_graph,
+    create_llb,
+    iter_parse,
+    meta_generator,
+    load_snapshot,
+    parse_llb,
+    parse_llb_parallel,
+    parse_many,
+)
 from llb_doc.core.document import BlockNotFoundError, DuplicateIDError, MetaRefreshMode
+from llb_doc.parser import parallel
+from llb_doc.parser.lazy import LazyBlock
+from llb_doc.parser.parser import _body_bounds, _parse_fast, _parse_lines
+from llb_doc.sorters import block_sorter
 
 
 class TestBlock:
@@ -47,6 +70,98 @@ class TestBlock:
         assert "id='b1'" in repr(block)
 
 
+class TestSlottedBlock:
+    def test_no_instance_dict(self):
+        block = Block(id="b", type="note")
+        assert not hasattr(block, "__dict__")
+
+    def test_meta_created_on_first_use(self):
+        block = Block(id="b", type="note")
+        assert block._meta is None
+        assert block.missing is None
+        assert block._meta is None
+        block.source = "jira"
+        assert block.meta == {"source": "jira"}
+        assert block.source == "jira"
+
+    def test_meta_assignment_copies_foreign_meta(self):
+        a = Block(id="a", type="note", source="x")
+        b = Block(id="b", type="note")
+        b.meta = a.meta
+        b.meta["source"] = "y"
+        assert a.source == "x"
+
+    def test_pickle_round_trip(self):
+        doc = create_llb()
+        block = doc.add_block("note", "text", lang="en", source="a")
+        block.render()
+        restored = pickle.loads(pickle.dumps(block))
+        assert restored == block
+        assert restored._doc is not None
+        restored.meta["source"] = "b"
+        assert "source=b" in restored.render()
+
+    def test_copy(self):
+        block = Block(id="b", type="note", content="x", tag="t")
+        clone = copy.copy(block)
+        assert clone == block
+        clone.content = "y"
+        assert block.content == "x"
+
+    def test_subclass_without_slots(self):
+        class Tagged(Block):
+            pass
+
+        block = Tagged(id="t", type="note")
+        block.label = "x"
+        assert block.meta == {"label": "x"}
+        assert copy.copy(block) == block
+
+
+class TestBlockFragmentMemo:
+    def test_render_is_memoized(self):
+        block = Block(id="b1", type="note", content="text", source="a")
+        assert block.render() is block.render()
+        assert block.render_brief() is block.render_brief()
+
+    def test_field_changes_invalidate(self):
+        block = Block(id="b1", type="note", content="text")
+        block.render()
+        block.content = "new text"
+        assert "new text" in block.render()
+        block.type = "memo"
+        assert block.render().startswith("@block b1 memo")
+        block.lang = "en"
+        assert block.render().startswith("@block b1 memo en")
+        del block.lang
+        assert block.render().startswith("@block b1 memo\n")
+
+    def test_meta_changes_invalidate(self):
+        block = Block(id="b1", type="note", content="text")
+        block.render_brief()
+        block.meta["source"] = "jira"
+        assert "source=jira" in block.render()
+        assert "source=jira" in block.render_brief()
+        block.author = "alice"
+        assert "author=alice" in block.render()
+        block.meta.pop("source")
+        assert "source=" not in block.render()
+        block.meta.update(priority="high")
+        assert "priority=high" in block.render_brief()
+        block.meta = {"only": "this"}
+        assert "author=" not in block.render()
+        assert "only=this" in block.render()
+
+    def test_replace_block_invalidates(self):
+        doc = create_llb()
+        b = doc.add_block("note", "old")
+        doc.render(meta_refresh=MetaRefreshMode.NONE)
+        doc.replace_block(b.id, content="new", tag="x")
+        output = doc.render(meta_refresh=MetaRefreshMode.NONE)
+        assert "new" in output
+        assert "tag=x" in output
+
+
 class TestDocument:
     def test_create_empty_document(self):
         doc = create_llb()
@@ -285,6 +400,29 @@ class TestParseError:
         assert doc["b1"].content == "content"
         assert doc.suffix == "suf1\n---\nsuf2"
 
+    def test_multiline_meta_roundtrip(self):
+        doc = create_llb()
+        doc.add_block("note", "body", summary="first\n\nthird", tag="x")
+        parsed = parse_llb(doc.render())
+        block = parsed.blocks[0]
+        assert block.summary == "first\n\nthird" and block.content == "body"
+        assert parsed.render() == doc.render()
+
+    def test_unclosed_quote_stops_at_block_end(self):
+        text = (
+            '@block B1 note\nnote="""x\n\nplain\n\n@end B1\n\n'
+            '@block B2 code\n\nx = """hi"""\n\n@end B2'
+        )
+        doc = parse_llb(text)
+        assert doc["B1"].meta == {"note": '"""x'}
+        assert doc["B1"].content == "plain"
+        assert doc["B2"].content == 'x = """hi"""'
+        assert doc.render() == text
+        assert parse_llb(text, lazy=True) == doc
+        lines_doc = Document()
+        _parse_lines(text, lines_doc)
+        assert lines_doc == doc
+
     def test_parse_error_includes_line_number(self):
         """ParseError should include line number when available."""
         invalid_text = "@block b1 test\n\ncontent\n\n@end b1\n\ninvalid line here"
@@ -377,6 +515,718 @@ class TestDocumentOperations:
             doc.reorder_blocks(["b1", "b2"])
 
 
+class TestAddBlocksFrom:
+    def test_matches_add_block(self):
+        doc = create_llb()
+        doc.add_blocks_from(
+            [
+                (None, "note", "first", {"source": "a"}),
+                {"type": "code", "content": "print(1)", "lang": "python"},
+            ]
+        )
+        doc.add_blocks_from({"id": ["x"], "type": ["note"], "tag": ["t"]})
+        expected = create_llb()
+        expected.add_block("note", "first", source="a")
+        expected.add_block("code", "print(1)", lang="python")
+        expected.add_block("note", id_="x", tag="t")
+        assert doc.render() == expected.render()
+        assert [b.id for b in doc.blocks] == ["B1", "B2", "x"]
+
+    def test_duplicate_adds_nothing(self):
+        doc = create_llb()
+        doc.add_block("note", id_="a")
+        with pytest.raises(DuplicateIDError):
+            doc.add_blocks_from([("b", "note"), ("a", "note")])
+        assert [b.id for b in doc.blocks] == ["a"]
+
+    def test_bulk_blocks_are_editable(self):
+        doc = create_llb()
+        (block,) = doc.add_blocks_from([("a", "note", "old")])
+        doc.get_block("a").content = "new"
+        assert "new" in doc.render()
+        doc.move_block("a", 0)
+        doc.remove_block("a")
+        assert len(doc) == 0 and block._doc is None
+
+
+class TestVocabulary:
+    def test_parsed_strings_are_interned(self):
+        text = "".join(
+            f"@block b{i} ticket python\nstatus=open\n\nx\n\n@end b{i}\n"
+            for i in range(3)
+        )
+        doc = parse_llb(text)
+        a, b, c = doc.blocks
+        assert a.type is b.type is c.type
+        assert a.lang is c.lang
+        key_a, key_c = next(iter(a.meta)), next(iter(c.meta))
+        assert key_a is key_c
+        assert "ticket" in doc.vocab and "status" in doc.vocab
+        assert parse_llb(doc.render()).render() == doc.render()
+
+    def test_bulk_and_assignment_are_interned(self):
+        doc = create_llb()
+        rows = [(None, "".join(["no", "te"]), "x", {"".join(["sr", "c"]): "a"})]
+        first, second = doc.add_blocks_from(rows * 2)
+        assert first.type is second.type
+        assert next(iter(first.meta)) is next(iter(second.meta))
+        first.type = "".join(["no", "te"])
+        assert first.type is second.type
+
+    def test_meta_writes_are_interned(self):
+        vocab = Vocabulary(value_keys=["status"])
+        doc = create_llb(vocab=vocab)
+        a = doc.add_block("t", **{"".join(["ow", "ner"]): "x"})
+        b = doc.add_block("t")
+        b.meta["".join(["ow", "ner"])] = "y"
+        b.meta.update({"".join(["pr", "io"]): "1"})
+        b.meta |= {"".join(["ta", "g"]): "z"}
+        b.status = "".join(["op", "en"])
+        c = doc.add_block("t", prio="2", tag="w", status="".join(["op", "en"]))
+        keys = {k: k for k in b.meta}
+        assert keys["owner"] is next(iter(a.meta))
+        for key in ("prio", "tag", "status"):
+            assert keys[key] is next(k for k in c.meta if k == key)
+        assert b.status is c.status
+        b.meta = {"".join(["ta", "g"]): "v"}
+        assert next(iter(b.meta)) is keys["tag"]
+
+    def test_intern_meta_into(self):
+        vocab = Vocabulary()
+        target = {"a": "1"}
+        assert vocab.intern_meta({"b": "2"}, target) is target
+        assert target == {"a": "1", "b": "2"} and "b" in vocab
+
+    def test_value_keys(self):
+        vocab = Vocabulary(value_keys=["status"])
+        doc = create_llb(vocab=vocab)
+        a = doc.add_block("t", status="".join(["op", "en"]), title="".join(["x", "y"]))
+        b = doc.add_block("t", status="".join(["op", "en"]), title="".join(["x", "y"]))
+        assert a.status is b.status
+        assert a.title is not b.title
+        assert "open" in vocab and "xy" not in vocab
+
+    def test_shared_and_disabled(self):
+        vocab = Vocabulary()
+        one = create_llb(vocab=vocab)
+        two = parse_llb("@block a note\nk=v\n@end a\n", vocab=vocab)
+        assert one.add_block("note").type is two.get_block("a").type
+        assert one.vocab is two.vocab is vocab
+        off = create_llb(vocab=False)
+        off.add_block("note", k="v")
+        assert off.vocab is None
+        on = create_llb()
+        on.add_block("note", k="v")
+        assert off.render() == on.render()
+
+
+class TestIterParse:
+    def _doc(self):
+        doc = create_llb()
+        doc.prefix = "# Head\n---\nmore"
+        doc.suffix = "# Tail"
+        doc.add_block("note")
+        doc.add_block("code", "x = 1\n\n---\n@end B1", lang="py", tag="a")
+        doc.add_block("note", "text", summary="l1\n\nl3")
+        return doc
+
+    def test_matches_parse_llb(self):
+        text = self._doc().render()
+        for source in (io.StringIO(text), io.BytesIO(text.encode()), text.split("\n")):
+            doc = iter_parse(source).to_document()
+            assert doc.render() == text
+            assert doc == parse_llb(text)
+
+    def test_path_source(self, tmp_path):
+        path = tmp_path / "doc.llb"
+        text = self._doc().render() + "\n"
+        path.write_text(text, encoding="utf-8")
+        assert iter_parse(path).to_document().render() == parse_llb(text).render()
+        assert iter_parse(str(path)).to_document().suffix == "# Tail\n"
+
+    def test_yields_blocks_incrementally(self):
+        stream = iter_parse(iter(self._doc().render().split("\n")))
+        first = next(stream)
+        assert (first.id, first.type, first._doc) == ("B1", "note", None)
+        assert stream.prefix == "# Head\n---\nmore" and stream.suffix == ""
+        rest = list(stream)
+        assert [b.id for b in rest] == ["B2", "B3"]
+        assert rest[1].summary == "l1\n\nl3" and stream.suffix == "# Tail"
+
+    def test_interning(self):
+        vocab = Vocabulary()
+        blocks = list(iter_parse(self._doc().render().split("\n"), vocab=vocab))
+        assert blocks[0].type is blocks[2].type
+        assert "tag" in vocab
+        doc = iter_parse(io.StringIO(self._doc().render())).to_document()
+        assert doc.vocab is not None and "note" in doc.vocab
+
+    def test_errors(self):
+        with pytest.raises(ParseError, match="Missing @end") as exc:
+            list(iter_parse(["", "@block b1 t", "", "text"]))
+        assert exc.value.line_number is None
+        with pytest.raises(ParseError, match="Expected @block") as exc:
+            list(iter_parse(["@block b1 t @end", "junk"]))
+        assert exc.value.line_number == 2
+        with pytest.raises(ParseError, match="Expected @block"):
+            list(iter_parse(["intro", "---", "not a block"]))
+        assert list(iter_parse([])) == []
+
+    QUOTED_META = [
+        '@block B1 note\nnote="""x\n\nplain\n\n@end B1\n\n'
+        '@block B2 code\n\nx = """hi"""\n\n@end B2',
+        '@block B1 t\nk="""a\nb"""\nj=1\n\nbody\n@end B1',
+        '@block B1 t\nk="""a\n@end B1\nb"""\n\n@end B1',
+        '@block B1 t\nk="""\nj="""x"""\n\nbody"""\n@end B1',
+        '@block B1 t\nk="""open\nj=2\n@end B1',
+        '@block B1 t\nk="""open\nj=2',
+        '@block B1 t\nk="""""""\n\n@end B1',
+        '@block B1 t\nk="""a\n\nb\n"""\n@end B1\n---\ntail"""',
+    ]
+
+    def test_parsers_agree_on_quoted_meta(self):
+        def outcomes(text):
+            lines_doc = Document()
+            for parse in (
+                lambda: parse_llb(text),
+                lambda: parse_llb(text, lazy=True),
+                lambda: _parse_lines(text, lines_doc) or lines_doc,
+                lambda: iter_parse(text.split("\n")).to_document(),
+                lambda: iter_parse(io.StringIO(text)).to_document(),
+            ):
+                try:
+                    doc = parse()
+                except ParseError as exc:
+                    yield str(exc)
+                else:
+                    yield [(b.id, dict(b.meta), b.content) for b in doc.blocks]
+
+        for text in self.QUOTED_META:
+            first, *rest = outcomes(text)
+            assert all(other == first for other in rest), text
+
+    def test_matches_parse_llb_on_duplicates_and_errors(self):
+        text = "@block b t\n\nx\n\n@end b\n\n@block b t\n\ny\n\n@end b"
+        assert iter_parse(text.split("\n")).to_document() == parse_llb(text)
+        for bad in ("@block a t @end\n\n@block b t\n\ntext", "x\n---\n@block a t\njunk"):
+            with pytest.raises(ParseError) as expected:
+                parse_llb(bad)
+            with pytest.raises(ParseError) as exc:
+                iter_parse(bad.split("\n")).to_document()
+            assert str(exc.value) == str(expected.value)
+
+
+class TestParseFast:
+    """The offset-based fast path gives the same documents as the line parser."""
+
+    TEXTS = [
+        "",
+        "@block b1 t @end",
+        "# Head\n---\n\n@block b1 t py\nk=v\n\ntext\n\n@end b1\n---\n# Tail",
+        '@block b1 t\ns="""a\n\nb"""\nq=""""""\nr="""x"""\n\n@end b1x\n@end b1',
+        '@block b1 t\nm="""open\n@end b1\n@block b2 t @end',
+        "@block b1 t\n\n\n\nx\n\n\n@end b1\n\n@block b2 t\n@end b2\n",
+        "a\n---\nb\n---\n@block b1 t\n1k=v\n@end b1\n---\nz",
+    ]
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_matches_line_parser(self, text):
+        fast, slow = Document(vocab=False), Document(vocab=False)
+        assert _parse_fast(text, fast)
+        _parse_lines(text, slow)
+        assert (fast.prefix, fast.suffix) == (slow.prefix, slow.suffix)
+        assert list(fast.blocks) == list(slow.blocks)
+        assert fast.render() == slow.render()
+
+    def test_round_trip(self):
+        doc = create_llb()
+        doc.prefix = "intro"
+        doc.add_block("code", "x = 1\n\n---\n@end B2", lang="py", tag="a")
+        doc.add_block("note", summary="l1\n\nl3")
+        text = doc.render()
+        assert parse_llb(text).render() == text
+
+    def test_errors_fall_back(self):
+        for text in ("@block b1 t\ntext", "junk", "@block b1 t @end\n@block b1 t @end"):
+            assert not _parse_fast(text, Document())
+        with pytest.raises(ParseError, match="Missing @end"):
+            parse_llb("@block b1 t\ntext")
+
+
+class TestParseParallel:
+    def _text(self):
+        doc = create_llb()
+        doc.prefix = "# Head\n---\nmore"
+        doc.suffix = "# Tail"
+        for i in range(40):
+            doc.add_block("note", f"row {i}\n\n@end B99", seq=str(i))
+        doc.add_block("code", summary='"""open')
+        return doc.render()
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        monkeypatch.setattr(parallel, "MIN_CHUNK", 64)
+
+    def test_matches_parse_llb(self, tmp_path):
+        text = self._text()
+        expected = parse_llb(text)
+        doc = parse_llb_parallel(text, workers=3)
+        assert doc == expected and doc.render() == text
+        assert (doc.prefix, doc.suffix) == (expected.prefix, expected.suffix)
+        assert doc.get_block("B7")._doc is doc
+        path = tmp_path / "doc.llb"
+        path.write_text(text, encoding="utf-8")
+        assert parse_llb_parallel(path, workers=3) == expected
+        assert parse_llb_parallel(str(path), workers=3) == expected
+
+    def test_split_at_headers(self):
+        text = self._text()
+        doc = create_llb()
+        start, end = _body_bounds(text, doc)
+        bounds = parallel._split_body(text, start, end, 4)
+        assert len(bounds) == 5 and bounds[0] == start and bounds[-1] == end
+        assert all(text.startswith("@block B", at) for at in bounds[1:-1])
+
+    def test_cut_inside_block(self):
+        # A cut after "@end B1" inside B2's content is detected and re-parsed
+        content = "\n".join(["x" * 40, "@end B1", "", "@block B3 t", "y" * 40])
+        text = f"@block B1 t @end\n\n@block B2 t\n\n{content}\n\n@end B2"
+        assert parse_llb_parallel(text, workers=4) == parse_llb(text)
+
+    def test_error_line_numbers(self):
+        text = self._text().replace("\n@block B21 ", "\njunk\n@block B21 ")
+        with pytest.raises(ParseError) as expected:
+            parse_llb(text)
+        with pytest.raises(ParseError) as exc:
+            parse_llb_parallel(text, workers=3)
+        assert str(exc.value) == str(expected.value)
+        assert exc.value.line_number == expected.value.line_number
+
+    def test_parse_many(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"doc{i}.llb"
+            path.write_text(f"intro {i}\n---\n@block b1 note\nk=v{i}\n@end b1")
+            paths.append(path)
+        vocab = Vocabulary()
+        docs = list(parse_many(paths, workers=2, vocab=vocab))
+        assert [d.prefix for d in docs] == ["intro 0", "intro 1", "intro 2"]
+        assert [d.get_block("b1").k for d in docs] == ["v0", "v1", "v2"]
+        assert docs[0].vocab is vocab and docs[0].get_block("b1").type is docs[2].get_block("b1").type
+        (tmp_path / "bad.llb").write_text("@block b1 t\n\njunk")
+        with pytest.raises(ParseError, match="Missing @end"):
+            list(parse_many([paths[0], tmp_path / "bad.llb"], workers=2))
+
+
+class TestLazyParse:
+    def _text(self):
+        doc = create_llb()
+        doc.prefix = "# Head"
+        doc.add_block("note", "hello\n\nworld", tag="a", summary="l1\n\nl3")
+        doc.add_block("code", "x = 1", lang="py")
+        doc.add_block("empty")
+        return doc.render()
+
+    def test_loads_on_access(self):
+        doc = parse_llb(self._text(), lazy=True)
+        block = doc.get_block("B1")
+        assert isinstance(block, LazyBlock) and block._source is not None
+        assert (block.id, block.type, doc.get_block("B2").lang) == ("B1", "note", "py")
+        assert block._source is not None
+        assert block.tag == "a" and block._source is None
+        assert block.content == "hello\n\nworld" and block.summary == "l1\n\nl3"
+        assert doc.get_block("B2")._source is not None
+
+    def test_same_document(self):
+        text = self._text()
+        doc = parse_llb(text, lazy=True)
+        assert doc == parse_llb(text)
+        assert doc.render() == text
+        assert doc.prefix == "# Head"
+        assert "tag" in doc.vocab and doc.get_block("B1").meta
+
+    def test_mutations(self):
+        text = self._text()
+        doc = parse_llb(text, lazy=True)
+        version = doc.version
+        doc.get_block("B1").content = "changed"
+        assert doc.get_block("B1").tag == "a" and doc.version > version
+        doc.get_block("B2").meta["k"] = "v"
+        assert doc.get_block("B2").content == "x = 1"
+        doc.replace_block("B3", content="filled")
+        doc.remove_block("B2")
+        expected = parse_llb(text)
+        expected.get_block("B1").content = "changed"
+        expected.replace_block("B3", content="filled")
+        expected.remove_block("B2")
+        assert doc.render() == expected.render()
+
+    def test_pickle_and_copy(self):
+        doc = parse_llb(self._text(), lazy=True)
+        assert pickle.loads(pickle.dumps(doc)) == doc
+        assert copy.deepcopy(doc).get_block("B1").content == "hello\n\nworld"
+
+    def test_eager_fallback(self):
+        assert not any(
+            isinstance(b, LazyBlock)
+            for b in parse_llb("@block b1 t\nx\n@end b1\n@block b1 t @end", lazy=True)
+        )
+        with pytest.raises(ParseError, match="Missing @end"):
+            parse_llb("@block b1 t\ntext", lazy=True)
+
+
+class TestSnapshot:
+    def test_roundtrip(self, tmp_path):
+        doc = create_llb(vocab=Vocabulary(value_keys=["tag"]))
+        doc.prefix = "# Head"
+        doc.add_block("note", "hello\n\nworld", tag="a", summary="l1\nl2")
+        doc.add_block("code", "x = 1", lang="py")
+        doc.add_block("empty")
+        doc.remove_block("B3")
+        path = tmp_path / "doc.snap"
+        doc.save_snapshot(path)
+        loaded = load_snapshot(path)
+        block = loaded.get_block("B1")
+        assert block._source is not None
+        assert block.tag == "a" and block._source is None
+        assert type(loaded) is Document and loaded == doc
+        assert loaded.render() == doc.render()
+        assert loaded.vocab.value_keys == {"tag"}
+
+    def test_loaded_document_is_mutable(self, tmp_path):
+        doc = create_llb(vocab=False)
+        doc.add_block("note", "one")
+        doc.add_block("note", "two")
+        path = tmp_path / "doc.snap"
+        doc.save_snapshot(path)
+        loaded = load_snapshot(path, mmap=False)
+        assert loaded.vocab is None
+        loaded.get_block("B1").content = "changed"
+        loaded.remove_block("B2")
+        assert loaded.add_block("note").id == "B3"
+        assert [b.content for b in loaded] == ["changed", ""]
+        assert pickle.loads(pickle.dumps(loaded)) == loaded
+
+
+class TestTombstonedOrder:
+    """Removals tombstone the order list; order semantics are unchanged."""
+
+    def test_remove_many_keeps_order(self):
+        doc = create_llb()
+        ids = [doc.add_block("t", str(i)).id for i in range(200)]
+        for id_ in ids[::2]:
+            doc.remove_block(id_)
+        assert [b.id for b in doc.blocks] == ids[1::2]
+        assert len(doc) == 100
+
+    def test_move_after_removals(self):
+        doc = create_llb()
+        ids = [doc.add_block("t", id_=f"b{i}").id for i in range(5)]
+        doc.remove_block("b1")
+        doc.move_block("b4", 0)
+        assert [b.id for b in doc] == ["b4", "b0", "b2", "b3"]
+        doc.move_block("b4", -1)
+        assert [b.id for b in doc] == ["b0", "b2", "b4", "b3"]
+        doc.move_block("b0", 99)
+        assert [b.id for b in doc] == ["b2", "b4", "b3", "b0"]
+        assert ids[0] == "b0"
+
+    def test_swap_after_removals(self):
+        doc = create_llb()
+        for i in range(4):
+            doc.add_block("t", id_=f"b{i}")
+        doc.remove_block("b0")
+        doc.swap_blocks("b1", "b3")
+        doc.compact()
+        assert [b.id for b in doc] == ["b3", "b2", "b1"]
+
+
+class TestStreamingRender:
+    def _doc(self, prefix=None, suffix=""):
+        doc = create_llb()
+        if prefix is not None:
+            doc.prefix = prefix
+        doc.suffix = suffix
+        doc.add_block("note", "first", lang="en", source="a")
+        doc.add_block("code", "print(1)\n", lang="python")
+        return doc
+
+    @pytest.mark.parametrize("prefix", [None, ""])
+    @pytest.mark.parametrize("suffix", ["", "Answer below."])
+    @pytest.mark.parametrize("with_blocks", [True, False])
+    def test_iter_render_matches_render(self, prefix, suffix, with_blocks):
+        doc = self._doc(prefix, suffix) if with_blocks else create_llb()
+        if not with_blocks:
+            if prefix is not None:
+                doc.prefix = prefix
+            doc.suffix = suffix
+        assert "".join(doc.iter_render()) == doc.render()
+
+    def test_iter_render_with_order(self):
+        @block_sorter("reverse")
+        def sort_reverse(blocks):
+            return blocks[::-1]
+
+        doc = create_llb(sorters=[sort_reverse])
+        doc.add_block("note", "first")
+        doc.add_block("note", "second")
+        expected = doc.render(order="reverse")
+        assert "".join(doc.iter_render(order="reverse")) == expected
+
+    def test_render_to_text_stream(self):
+        doc = self._doc(suffix="Done.")
+        buf = io.StringIO()
+        written = doc.render_to(buf)
+        assert buf.getvalue() == doc.render()
+        assert written == len(buf.getvalue())
+
+    def test_render_to_binary_stream(self):
+        doc = create_llb()
+        doc.add_block("note", "naïve café")
+        buf = io.BytesIO()
+        written = doc.render_to(buf)
+        assert buf.getvalue() == doc.render().encode("utf-8")
+        assert written == len(buf.getvalue())
+
+
+class TestDocumentVersion:
+    def test_mutations_bump_version(self):
+        doc = create_llb()
+        versions = [doc.version]
+        b = doc.add_block("note", "a")
+        versions.append(doc.version)
+        b.content = "b"
+        versions.append(doc.version)
+        b.meta["k"] = "v"
+        versions.append(doc.version)
+        b.author = "alice"
+        versions.append(doc.version)
+        doc.prefix = "P"
+        versions.append(doc.version)
+        doc.remove_block(b.id)
+        versions.append(doc.version)
+        assert versions == sorted(set(versions))
+
+    def test_detached_block_does_not_bump(self):
+        doc = create_llb()
+        b = doc.add_block("note", "a")
+        doc.remove_block(b.id)
+        v = doc.version
+        b.content = "changed"
+        assert doc.version == v
+
+
+class TestIncrementalRenderer:
+    def _doc(self, prefix="", suffix=""):
+        doc = create_llb()
+        doc.prefix = prefix
+        doc.suffix = suffix
+        doc.add_block("note", "first", source="a")
+        doc.add_block("code", "print(1)", lang="python")
+        return doc
+
+    @pytest.mark.parametrize("prefix", ["", "Context"])
+    @pytest.mark.parametrize("suffix", ["", "Answer below."])
+    @pytest.mark.parametrize("start_empty", [True, False])
+    def test_appends_match_render(self, prefix, suffix, start_empty):
+        doc = create_llb() if start_empty else self._doc()
+        doc.prefix = prefix
+        doc.suffix = suffix
+        r = doc.incremental()
+        assert r.render() == doc.render()
+        for turn in range(3):
+            doc.add_block("msg", f"turn {turn}", role="user")
+            doc.add_blocks_from([(None, "msg", f"reply {turn}")])
+            assert r.render() == doc.render()
+        doc.suffix = "New question."
+        assert r.render() == doc.render()
+        assert r.render() == doc.render()
+        assert (r.full_renders, r.incremental_renders) == (1, 5)
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda doc, b: setattr(doc, "prefix", "new prefix"),
+            lambda doc, b: setattr(b, "content", "edited"),
+            lambda doc, b: b.meta.update(k="v"),
+            lambda doc, b: setattr(b, "lang", "en"),
+            lambda doc, b: doc.remove_block(b.id),
+            lambda doc, b: doc.move_block(b.id, -1),
+            lambda doc, b: doc.swap_blocks(b.id, doc.blocks[-1].id),
+            lambda doc, b: doc.set_block(b.id, "note", "replaced"),
+            lambda doc, b: doc.reorder_blocks([x.id for x in doc.blocks][::-1]),
+        ],
+    )
+    def test_other_changes_fall_back_to_full_render(self, mutate):
+        doc = self._doc()
+        r = doc.incremental()
+        r.render()
+        doc.add_block("note", "appended")
+        mutate(doc, doc.blocks[0])
+        assert r.render() == doc.render()
+        assert r.full_renders == 2
+        doc.add_block("note", "after")
+        assert r.render() == doc.render()
+        assert r.incremental_renders == 1
+
+    def test_edits_to_unrendered_blocks_stay_incremental(self):
+        doc = self._doc()
+        r = doc.incremental()
+        r.render()
+        b = doc.add_block("note", "draft")
+        b.content = "final"
+        b.meta["k"] = "v"
+        with doc.block("note") as built:
+            built.content = "built"
+        assert r.render() == doc.render()
+        assert (r.full_renders, r.incremental_renders) == (1, 1)
+
+    def test_two_renderers(self):
+        doc = self._doc()
+        r1, r2 = doc.incremental(), doc.incremental()
+        r1.render()
+        doc.add_block("note", "x")
+        r2.render()
+        doc.blocks[-1].content = "edited"
+        assert r1.render() == doc.render()
+        assert r2.render() == doc.render()
+        assert r2.full_renders == 2
+
+    def test_meta_generators_run_on_appended_blocks(self):
+        calls = []
+
+        @meta_generator("summary")
+        def summarize(block):
+            calls.append(block.id)
+            return block.content.upper()
+
+        doc = create_llb(generators=[summarize])
+        doc.add_block("note", "a")
+        r = doc.incremental()
+        r.render()
+        b = doc.add_block("note", "b")
+        assert r.render() == doc.render()
+        assert b.meta["summary"] == "B"
+        assert calls == ["B1", "B2"]
+        assert r.incremental_renders == 1
+        r.render(meta_refresh=MetaRefreshMode.FORCE)
+        assert r.full_renders == 2
+
+    def test_render_without_refresh_then_with(self):
+        @meta_generator("summary")
+        def summarize(block):
+            return block.content.upper()
+
+        doc = create_llb(generators=[summarize])
+        r = doc.incremental()
+        doc.add_block("note", "a")
+        r.render(meta_refresh=MetaRefreshMode.NONE)
+        doc.add_block("note", "b")
+        assert r.render() == doc.render()
+        assert r.full_renders == 2
+
+    def test_arender(self):
+        doc = self._doc(suffix="end")
+        r = doc.incremental()
+        assert asyncio.run(r.arender()) == doc.render()
+        doc.add_block("note", "x")
+        assert asyncio.run(r.arender()) == doc.render()
+        assert r.incremental_renders == 1
+
+    def test_graph_document_rejected(self):
+        with pytest.raises(TypeError):
+            create_graph().incremental()
+
+
+class TestTokenCounts:
+    class CharTokenizer:
+        """One token per character; counts encode() calls."""
+
+        def __init__(self):
+            self.calls = []
+
+        def encode(self, text):
+            self.calls.append(text)
+            return [ord(c) for c in text]
+
+    def _doc(self):
+        doc = create_llb()
+        doc.prefix = "Context"
+        doc.suffix = "Question?"
+        doc.add_block("note", "first", id_="a", source="x")
+        doc.add_block("code", "print(1)", lang="python", id_="b")
+        return doc
+
+    def test_approx_tokenizer(self):
+        tok = ApproxTokenizer()
+        text = "The quick brown fox jumps over the lazy dog, 12345 times."
+        ids = tok.encode(text)
+        assert ids == tok.encode(text)
+        assert 10 <= len(ids) <= 20
+        assert all(0 <= i < tok.vocab_size for i in ids)
+        assert tok.encode("") == []
+
+    def test_counts_match_render(self):
+        doc = self._doc()
+        doc.tokenizer = self.CharTokenizer()
+        counts = doc.count_tokens()
+        assert counts.total == len(doc.render())
+        assert counts.blocks == {"a": len(doc["a"].render()), "b": len(doc["b"].render())}
+        assert "".join(map(chr, doc.render_tokens())) == doc.render()
+
+    def test_default_tokenizer_per_fragment(self):
+        doc = self._doc()
+        tok = doc.tokenizer
+        assert isinstance(tok, ApproxTokenizer)
+        expected = [t for fragment in doc.iter_render() for t in tok.encode(fragment)]
+        assert doc.render_tokens() == expected
+        assert doc.count_tokens().total == len(expected)
+
+    def test_tokens_cached_per_fragment(self):
+        doc = self._doc()
+        tok = doc.tokenizer = self.CharTokenizer()
+        doc.count_tokens()
+        tok.calls.clear()
+        doc.count_tokens()
+        doc.render_tokens()
+        assert tok.calls == []
+        doc["a"].content = "changed"
+        doc.add_block("note", "new", id_="c")
+        doc.count_tokens()
+        assert tok.calls == [doc["a"].render(), doc["c"].render()]
+
+    def test_order_and_tokenizer_change(self):
+        @block_sorter("reverse")
+        def sort_reverse(blocks):
+            return blocks[::-1]
+
+        doc = create_llb(sorters=[sort_reverse])
+        doc.add_block("note", "first", id_="a")
+        doc.add_block("note", "second", id_="b")
+        doc.tokenizer = self.CharTokenizer()
+        assert list(doc.count_tokens(order="reverse").blocks) == ["b", "a"]
+        tok = doc.tokenizer = ApproxTokenizer(max_piece=2)
+        assert doc.count_tokens().total == sum(len(tok.encode(f)) for f in doc.iter_render())
+
+    def test_graph_counts(self):
+        g = create_graph()
+        for nid in "abc":
+            g.add_node("person", nid.upper(), id_=nid)
+        g.add_edge("a", "b", "knows", id_="ab")
+        g.add_edge("b", "c", "knows", id_="bc")
+        tok = g.tokenizer = self.CharTokenizer()
+        counts = g.count_tokens(focus="a", radius=1)
+        assert counts.total == len(g.render(focus="a", radius=1))
+        assert set(counts.blocks) == {"C1", "a", "b", "ab"}
+        text = "".join(map(chr, g.render_tokens(focus="a", radius=2)))
+        assert text == g.render(focus="a", radius=2).replace("C4", "C3")
+        tok.calls.clear()
+        g.count_tokens(focus="a", radius=2)
+        # Only the ctx, whose ID changes every render, is tokenized again
+        assert len(tok.calls) == 1 and tok.calls[0].startswith("@ctx")
+        assert g.count_tokens().total == len(g.render())
+
+
 class TestDuplicateIDError:
     """Test DuplicateIDError in Document."""
 